@@ -1,6 +1,12 @@
 import os
+import re
 import sys
+import json
 import shutil
+import hashlib
+import sysconfig
+import tempfile
+import subprocess
 from pathlib import Path
 import logging
 
@@ -28,11 +34,191 @@ def read_cython_path():
 
     return pyproject_data.get("tool", {}).get("build", {}).get("config", {})
 
-def build_cython_extensions():
+# ================================================================
+#  Incremental builds: sources, dependencies and the hash cache
+# ================================================================
+# Hashes of the inputs of every built extension, kept next to the build output
+# so that removing build/ also forces a full rebuild.
+BUILD_BASE = "build"
+BUILD_CACHE = "extension_hashes.json"
+
+C_INCLUDE_RE = re.compile(r'^\s*#\s*include\s*[<"]([^>"]+)[>"]', re.MULTILINE)
+CYTHON_INCLUDE_RE = re.compile(r'^\s*(?:cdef\s+extern\s+from|include)\s+["\']([^"\']+)["\']', re.MULTILINE)
+CYTHON_CIMPORT_RE = re.compile(r'^\s*(?:from\s+([\w.]+)\s+cimport|cimport\s+([\w.]+))', re.MULTILINE)
+
+def find_extension_sources(ext_dir):
+    """The .pyx and hand written .c files of one extension directory.
+
+    A .c file next to a .pyx of the same name is Cython output and is skipped,
+    otherwise a stale generated file would be compiled a second time.
+    """
+    pyx_files = sorted(ext_dir.rglob("*.pyx"))
+    generated = {pyx.with_suffix(".c") for pyx in pyx_files}
+    c_files = sorted(c for c in ext_dir.rglob("*.c") if c not in generated)
+    return pyx_files + c_files
+
+def _resolve(name, search_dirs):
+    for directory in search_dirs:
+        candidate = Path(directory) / name
+        if candidate.is_file():
+            return candidate
+    return None
+
+def scan_dependencies(sources, include_dirs, package_roots):
+    """Headers, .pxd and .pxi files the sources include, directly or through other headers.
+
+    Only files found next to the including file or in `include_dirs` are tracked;
+    system headers are not. cimported modules are looked up under `package_roots`.
+    """
+    dependencies = set()
+    pending = list(sources)
+    while pending:
+        path = pending.pop()
+        try:
+            text = path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        search_dirs = [path.parent, *include_dirs]
+        names = []
+        if path.suffix in (".pyx", ".pxd", ".pxi"):
+            names += CYTHON_INCLUDE_RE.findall(text)
+            for module in (m1 or m2 for m1, m2 in CYTHON_CIMPORT_RE.findall(text)):
+                names.append(module.replace(".", "/") + ".pxd")
+            # a .pyx is compiled together with its own .pxd
+            names.append(path.with_suffix(".pxd").name)
+            search_dirs += package_roots
+        else:
+            names += C_INCLUDE_RE.findall(text)
+        for name in names:
+            found = _resolve(name, search_dirs)
+            if found is not None and found not in dependencies and found not in sources:
+                dependencies.add(found)
+                pending.append(found)
+    return dependencies
+
+def hash_file(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+def load_build_cache(build_base=BUILD_BASE):
+    try:
+        with open(Path(build_base) / BUILD_CACHE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_build_cache(cache, build_base=BUILD_BASE):
+    Path(build_base).mkdir(parents=True, exist_ok=True)
+    with open(Path(build_base) / BUILD_CACHE, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+def rebuild_reason(entry, files, settings, output):
+    """Why an extension must be rebuilt, or None when its cached build is still valid."""
+    if entry is None:
+        return "not built before"
+    if not Path(output).exists():
+        return "build output is missing"
+    if entry.get("settings") != settings:
+        return "build settings changed"
+    cached = entry.get("files", {})
+    added = sorted(set(files) - set(cached))
+    removed = sorted(set(cached) - set(files))
+    changed = sorted(name for name in files if name in cached and cached[name] != files[name])
+    reasons = []
+    if changed:
+        reasons.append(f"changed {', '.join(changed)}")
+    if added:
+        reasons.append(f"new {', '.join(added)}")
+    if removed:
+        reasons.append(f"removed {', '.join(removed)}")
+    return "; ".join(reasons) or None
+
+def build_jobs(config):
+    """Parallel jobs: BUILD_JOBS environment variable, then `build_jobs` in the config, 0 = all cores."""
+    jobs = int(os.environ.get("BUILD_JOBS", config.get("build_jobs", 0)))
+    return jobs if jobs > 0 else (os.cpu_count() or 1)
+
+# ================================================================
+#  Build profiles
+# ================================================================
+# A profile is one name or several joined with "+", e.g. "native+lto+pgo".
+# Only GCC and clang style compilers are supported beyond "portable".
+PROFILE_FLAGS = {
+    # component: (extra compile args, extra link args)
+    "portable": ([], []),
+    "native": (["-march=native", "-mtune=native"], []),
+    "lto": (["-flto"], ["-flto"]),
+    "pgo": ([], []),    # two passes, see build_cython_extensions()
+}
+# iterations of the benchmark workload that trains the PGO build
+PGO_ITERATIONS = 100000
+# workload run against a staged build, prints the extension benchmark timings in milliseconds as JSON;
+# it trains the PGO build, so it only runs compiled code
+WORKLOAD = """
+import json, logging
+from pymodule.extensions.worker import cython_benchmark
+from pymodule.extensions.cmodulea.cmodulea import c_benchmark
+logging.disable(logging.CRITICAL)
+n = {iterations}
+print(json.dumps({{"cython": cython_benchmark(n), "c": c_benchmark(n)}}))
+"""
+
+def parse_profile(profile):
+    components = [component.strip() for component in profile.split("+") if component.strip()]
+    unknown = [component for component in components if component not in PROFILE_FLAGS]
+    if unknown or not components:
+        raise ValueError(f"Unknown build profile '{profile}', combine {sorted(PROFILE_FLAGS)} with '+'")
+    if os.name == "nt" and components != ["portable"]:
+        logging.getLogger(__name__).warning(f"Build profile '{profile}' needs gcc or clang, using 'portable'")
+        return ["portable"]
+    return components
+
+def is_clang():
+    return "clang" in (sysconfig.get_config_var("CC") or "")
+
+def pgo_flags(stage, profile_dir):
+    """Compile and link arguments for the instrumented ("generate") and the optimized ("use") pass."""
+    if stage == "generate":
+        flags = [f"-fprofile-generate={profile_dir}"]
+        return flags, flags
+    if is_clang():
+        # clang writes raw profiles that must be merged first
+        merged = Path(profile_dir) / "merged.profdata"
+        subprocess.run(["llvm-profdata", "merge", f"-output={merged}", *map(str, Path(profile_dir).glob("*.profraw"))], check=True)
+        return [f"-fprofile-use={merged}", "-Wno-profile-instr-unprofiled", "-Wno-profile-instr-out-of-date"], []
+    return [f"-fprofile-use={profile_dir}", "-fprofile-correction", "-Wno-missing-profile"], []
+
+def stage_package(build_lib, package_root, destination):
+    """Copy the Python package and the freshly built extensions into `destination` so they import together."""
+    package = Path(package_root) / "pymodule"
+    shutil.copytree(package, Path(destination) / "pymodule", ignore=shutil.ignore_patterns("*.so", "*.pyd", "__pycache__"))
+    for built in Path(build_lib).rglob("*"):
+        if built.suffix in (".so", ".pyd"):
+            target = Path(destination) / built.relative_to(build_lib)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(built, target)
+
+def run_workload(build_lib, package_root, iterations):
+    """Run the benchmark workload against the build in `build_lib`; returns the timings in ms."""
+    with tempfile.TemporaryDirectory(prefix="pymodule-workload-") as staged:
+        stage_package(build_lib, package_root, staged)
+        env = dict(os.environ, PYTHONPATH=staged)
+        result = subprocess.run([sys.executable, "-c", WORKLOAD.format(iterations=iterations)],
+                                env=env, cwd=staged, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+# ================================================================
+#  Building
+# ================================================================
+def build_cython_extensions(profile=None, build_base=None, force=None):
+    """Build all extensions with the given profile (default: BUILD_PROFILE, then `build_profile`).
+
+    Returns the directory that holds the built extension modules.
+    """
     # when using setuptools, you should import setuptools before Cython,
     # otherwise, both might disagree about the class to use.
     from setuptools import Extension  # noqa: I001
     from setuptools.dist import Distribution  # noqa: I001
+    import Cython  # pyright: ignore [reportMissingImports]
     import Cython.Compiler.Options  # pyright: ignore [reportMissingImports]
     from Cython.Build import build_ext, cythonize  # pyright: ignore [reportMissingImports]
 
@@ -42,10 +228,16 @@ def build_cython_extensions():
     extensions_path = config.get("extensions_path","extensions")
     include_dirs = config.get("include_dirs", [])
     build_log = config.get("build_log", False)
+    jobs = build_jobs(config)
+    if force is None:
+        force = os.environ.get("FORCE_REBUILD", "0") == "1"
+    profile = profile or os.environ.get("BUILD_PROFILE") or config.get("build_profile", "portable")
+    components = parse_profile(profile)
+    build_base = build_base or BUILD_BASE
+    logger = logging.getLogger(__name__)
 
     if build_log:
         logging.basicConfig(level=logging.DEBUG)
-        logger = logging.getLogger(__name__)
 
         file_handler = logging.FileHandler("build.log", mode="w")
         formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
@@ -56,6 +248,7 @@ def build_cython_extensions():
 
     if build_log:
         logger.info(f"Using extensions path: {extensions_path}")
+        logger.info(f"Using build profile: {'+'.join(components)}")
 
     if os.name == "nt":  # Windows
         extra_compile_args = [
@@ -71,6 +264,10 @@ def build_cython_extensions():
             "-Wno-unreachable-code",  # TODO: This should no longer be necessary with Cython>=3.0.3
         ]
     extra_compile_args.append("-UNDEBUG")  # Cython disables asserts by default.
+    extra_link_args = []
+    for component in components:
+        extra_compile_args += PROFILE_FLAGS[component][0]
+        extra_link_args += PROFILE_FLAGS[component][1]
     # Relative to project root director
     if isinstance(include_dirs, str):
         include_dirs = [directory.strip() for directory in include_dirs.split(",")]
@@ -79,46 +276,143 @@ def build_cython_extensions():
 
     ext_dirs = []
 
-    # Dynamically find all .c files in the cyth directory
+    # Dynamically find all .c and .pyx files in the extensions directory
     root_path = Path(extensions_path)
-    extensions = []
-    patterns = ["*.c", "*.pyx"]
-    for subdir in root_path.iterdir():
+    # directory that holds the top level package, for resolving cimports
+    package_root = root_path.parent.parent
+    sources = {}
+    inputs = {}
+    for subdir in sorted(root_path.iterdir()):
         if not subdir.is_dir():
             continue
-        c_files = [file for pattern in patterns for file in subdir.rglob(pattern)]
+        c_files = find_extension_sources(subdir)
         if not c_files:
             continue
         ext_name = f"pymodule.extensions.{subdir.name}.{subdir.name}"
-        extensions.append(
+        sources[ext_name] = [str(f) for f in c_files]
+        tracked = sorted(set(c_files) | scan_dependencies(c_files, [Path(d) for d in include_dirs], [package_root]))
+        inputs[ext_name] = {path.as_posix(): hash_file(path) for path in tracked}
+
+    # Log discovered extensions
+    if build_log:
+        logger.info(f"Creating Extensions: {list(sources)}")
+        logger.info(f"collected extension directories: {ext_dirs}")
+
+    def compile_pass(compile_args, link_args, force, update_cache=True, regenerate=True, cache_key=None, check_only=False):
+        """Build the stale extensions; returns build_lib.
+
+        `cache_key` replaces the compile and link arguments in the cached settings.
+        With `check_only` nothing is built and None is returned if any extension is stale.
+        """
+        extensions = [
             Extension(
                 ext_name,
-                [str(f) for f in c_files],
+                ext_sources,
                 include_dirs=include_dirs,
-                extra_compile_args=extra_compile_args,
+                extra_compile_args=compile_args,
+                extra_link_args=link_args,
                 language="c",
             )
-        )
+            for ext_name, ext_sources in sources.items()
+        ]
+        dist = Distribution({"ext_modules": extensions})
+        cmd = build_ext(dist)
+        cmd.parallel = jobs
+        # build_lib/build_temp follow the build command's layout (build/lib.*), where poetry picks the modules up
+        dist.get_command_obj("build").build_base = build_base
+        cmd.ensure_finalized()
 
-    # Log discovered extensions
-    if build_log:
-        logger.info(f"Creating Extensions: {[ext.name for ext in extensions]}")
-        logger.info(f"collected extension directories: {ext_dirs}")
+        # Skip extensions whose sources, headers and build settings did not change
+        key = [compile_args, link_args] if cache_key is None else cache_key
+        settings = hashlib.sha256(json.dumps([sys.version, Cython.__version__, key, include_dirs]).encode()).hexdigest()
+        cache = load_build_cache(build_base)
+        stale = []
+        for extension in extensions:
+            output = cmd.get_ext_fullpath(extension.name)
+            reason = "forced" if force else rebuild_reason(cache.get(extension.name), inputs[extension.name], settings, output)
+            if reason is None:
+                logger.info(f"Up to date: {extension.name}")
+            else:
+                logger.info(f"{'Stale' if check_only else 'Rebuilding'} {extension.name}: {reason}")
+                stale.append(extension)
+        if not stale:
+            logger.info("All extensions are up to date")
+            return cmd.build_lib
+        if check_only:
+            return None
 
-    include_dirs = set()
-    for extension in extensions:
-        include_dirs.update(extension.include_dirs)
-    include_dirs = list(include_dirs)
+        if regenerate:
+            if build_log:
+                logger.info(f"Cythonizing..... ({jobs} jobs)")
+            ext_modules = cythonize(stale, include_path=include_dirs, language_level=3, annotate=True, nthreads=jobs, force=True)
+            if build_log:
+                logger.info("End of Cythonizing")
+        else:
+            # compile the C generated by the previous pass (Cython embeds the compile arguments in it)
+            for extension in stale:
+                extension.sources = [str(Path(source).with_suffix(".c")) if source.endswith(".pyx") else source
+                                     for source in extension.sources]
+            ext_modules = stale
+        # the hash check replaces the timestamp check of build_ext, which does not see header changes
+        cmd.extensions = ext_modules
+        cmd.force = True
+        cmd.run()
 
-    if build_log:
-        logger.info("Cythonizing.....")
-    ext_modules = cythonize(extensions, include_path=include_dirs, language_level=3, annotate=True)
-    if build_log:
-        logger.info("End of Cythonizing")
-    dist = Distribution({"ext_modules": ext_modules})
-    cmd = build_ext(dist)
-    cmd.ensure_finalized()
-    cmd.run()
+        for extension in stale:
+            if update_cache:
+                cache[extension.name] = {"settings": settings, "files": inputs[extension.name]}
+            else:
+                cache.pop(extension.name, None)
+        save_build_cache(cache, build_base)
+        logger.info(f"Rebuilt {len(stale)} of {len(extensions)} extensions with {jobs} parallel jobs")
+        return cmd.build_lib
+
+    if "pgo" not in components:
+        return compile_pass(extra_compile_args, extra_link_args, force)
+
+    # PGO: instrumented build, training run of the benchmark workload, optimized rebuild.
+    # The profiles follow from the sources and the training workload, so the optimized build is
+    # cached on the build arguments and the workload instead of on the profile files, which differ
+    # from run to run; when it is up to date neither pass runs.
+    iterations = int(config.get("pgo_iterations", PGO_ITERATIONS))
+    pgo_key = [extra_compile_args, extra_link_args, "pgo", WORKLOAD.format(iterations=iterations)]
+    if not force:
+        build_lib = compile_pass(extra_compile_args, extra_link_args, False, cache_key=pgo_key, check_only=True)
+        if build_lib is not None:
+            return build_lib
+    profile_dir = (Path(build_base) / "pgo-profiles").resolve()
+    shutil.rmtree(profile_dir, ignore_errors=True)
+    profile_dir.mkdir(parents=True)
+    generate_compile, generate_link = pgo_flags("generate", profile_dir)
+    logger.info("PGO pass 1: instrumented build")
+    build_lib = compile_pass(extra_compile_args + generate_compile, extra_link_args + generate_link, True, update_cache=False)
+    logger.info(f"PGO training run: benchmark workload with {iterations} iterations")
+    run_workload(build_lib, package_root, iterations)
+    use_compile, use_link = pgo_flags("use", profile_dir)
+    logger.info("PGO pass 2: optimized build")
+    # the generated C of pass 1 is reused, so source locations match the profiles; pass 1 replaced
+    # every extension with an instrumented one, so all of them are rebuilt
+    return compile_pass(extra_compile_args + use_compile, extra_link_args + use_link, True, regenerate=False, cache_key=pgo_key)
+
+def compare_profiles(profiles, iterations=PGO_ITERATIONS):
+    """Build every profile in its own build directory, run the benchmark workload and report speedups.
+
+    Every profile keeps its build cache, so only changed extensions are rebuilt; FORCE_REBUILD=1 rebuilds all.
+    """
+    logger = logging.getLogger(__name__)
+    package_root = Path(read_cython_path().get("extensions_path", "extensions")).parent.parent
+    results = {}
+    for profile in profiles:
+        build_lib = build_cython_extensions(profile, build_base=os.path.join(BUILD_BASE, f"profile-{profile}"))
+        results[profile] = run_workload(build_lib, package_root, iterations)
+    baseline = results[profiles[0]]
+    lines = [f"{'profile':<20}{'cython ms':>12}{'speedup':>9}{'c ms':>12}{'speedup':>9}"]
+    for profile, timings in results.items():
+        lines.append(f"{profile:<20}{timings['cython']:>12.2f}{baseline['cython'] / timings['cython']:>8.2f}x"
+                     f"{timings['c']:>12.2f}{baseline['c'] / timings['c']:>8.2f}x")
+    report = "\n".join(lines)
+    logger.info("Build profile comparison (speedup against %s):\n%s", profiles[0], report)
+    return results
 
 def build(setup_kwargs):
     try:
@@ -126,3 +420,18 @@ def build(setup_kwargs):
     except Exception:
         if not allowed_to_fail:
             raise
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the C and Cython extensions")
+    parser.add_argument("--profile", help="Build profile, e.g. portable, native, lto, pgo or native+lto+pgo")
+    parser.add_argument("--force", action="store_true", default=None, help="Rebuild all extensions")
+    parser.add_argument("--compare", nargs="+", metavar="PROFILE", help="Build each profile and report the benchmark speedup against the first one")
+    parser.add_argument("--iterations", type=int, default=PGO_ITERATIONS, help="Benchmark iterations for --compare")
+    args = parser.parse_args()
+    if args.compare:
+        logging.basicConfig(level=logging.INFO)
+        compare_profiles(args.compare, args.iterations)
+    else:
+        build_cython_extensions(args.profile, force=args.force)
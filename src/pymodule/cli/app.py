@@ -1,22 +1,41 @@
 # src/cli/app.py
 
+import os
+import sys
 from importlib.metadata import version as pkg_version
 
 import pymodule
 from pymodule.core.config import get_app_configuration
 from pymodule.logger import get_app_logger, setup_logging
 from pymodule.core.app_runner import run_app
+from pymodule.core.metrics import MetricsExporter
+from pymodule.core.memory_profile import memory_profile_options, enable_memory_profile, memory_phase, memory_report
+from pymodule.core.startup_report import startup_report_requested, run_with_report, enable_phase_recording, emit_phases, startup_phase, CHILD_ENV
 
 logger = get_app_logger(__name__)
 
 def main() -> None:
     """Main entry point of the CLI."""
 
+    if startup_report_requested(sys.argv[1:]):
+        sys.exit(run_with_report(sys.argv[1:]))
+    recording = bool(os.environ.get(CHILD_ENV))
+    if recording:
+        enable_phase_recording()
+    profiling, dump_dir = memory_profile_options(sys.argv[1:])
+    if profiling:
+        enable_memory_profile(dump_dir)
+
+    exporter = None
     try:
         # Step 1: Collect configuration from defaults, configuration file, and environment variables and CLI options
-        cfg = get_app_configuration()
+        with memory_phase("get_app_configuration"):
+            cfg = get_app_configuration()
         # Step 2: Setup logging according to collected configuration
-        setup_logging(cfg.config['logging']['verbose'], cfg.config['logging']['log_prefix'], cfg.config['logging']['use_color'], cfg.config['logging']['use_string_handler'])
+        with startup_phase("setup_logging"), memory_phase("setup_logging"):
+            setup_logging(cfg.config['logging']['verbose'], cfg.config['logging']['log_prefix'], cfg.config['logging']['use_color'], cfg.config['logging']['use_string_handler'])
+        if cfg.config['parameters']['metrics_file']:
+            exporter = MetricsExporter(cfg.config['parameters']['metrics_file'], cfg.config['parameters']['metrics_interval']).start()
 
         # Step 3: Show version info or run the application with collected configuration
         if cfg.config['logging']['version_option']:
@@ -26,9 +45,17 @@ def main() -> None:
             print(f"pymodule {app_version}")
         else:
             # Step 3b: Run the application with the collected configuration
-            run_app(cfg)
+            with startup_phase("run_app"), memory_phase("run_app"):
+                run_app(cfg)
     except Exception as e:
         logger.error("Application terminated: %s", str(e), exc_info=False)
+    finally:
+        if exporter is not None:
+            exporter.stop()
+        if recording:
+            emit_phases()
+        if profiling:
+            print(memory_report())
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,76 @@
+# src/cli/client.py
+
+# Thin client for the pymodule daemon. Only the standard library is imported here,
+# the application itself lives in the warm daemon process (see cli/daemon.py).
+
+import json
+import os
+import socket
+import sys
+import tempfile
+from typing import Any, Dict, List, Mapping, Optional, TextIO
+
+SOCKET_ENV = "PYMODULE_SOCKET"
+
+def default_socket_path() -> str:
+    """$PYMODULE_SOCKET, or a per-user socket in $XDG_RUNTIME_DIR (or the temp directory)."""
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"pymodule-{os.getuid()}.sock")
+
+def send_message(sock: socket.socket, message: Dict[str, Any]) -> None:
+    """Messages are single JSON objects terminated by a newline."""
+    sock.sendall(json.dumps(message).encode() + b"\n")
+
+def run_remote(argv: List[str], socket_path: Optional[str] = None, env: Optional[Mapping[str, str]] = None,
+               cwd: Optional[str] = None, stdout: TextIO = sys.stdout, stderr: TextIO = sys.stderr) -> int:
+    """Run one job in the daemon and copy its streamed output; returns the job's exit code.
+
+    :raises OSError: If the daemon is not reachable
+    """
+    request = {
+        "command": "run",
+        "argv": argv,
+        "env": dict(os.environ if env is None else env),
+        "cwd": cwd or os.getcwd(),
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path or default_socket_path())
+        send_message(sock, request)
+        with sock.makefile("r", encoding="utf-8") as replies:
+            for line in replies:
+                reply = json.loads(line)
+                if "log" in reply:
+                    stdout.write(reply["log"] + "\n")
+                elif "stdout" in reply:
+                    stdout.write(reply["stdout"])
+                elif "stderr" in reply:
+                    stderr.write(reply["stderr"])
+                elif "exit" in reply:
+                    stdout.flush()
+                    return int(reply["exit"])
+    raise ConnectionError("pymodule daemon closed the connection before the job finished")
+
+def shutdown_daemon(socket_path: Optional[str] = None) -> None:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path or default_socket_path())
+        send_message(sock, {"command": "shutdown"})
+        sock.recv(1)
+
+def main() -> None:
+    """Entry point of `pymodule-client`: same arguments as `pymodule`, executed by the daemon.
+
+    Falls back to running in-process when no daemon is listening.
+    """
+    try:
+        code = run_remote(sys.argv[1:])
+    except (FileNotFoundError, ConnectionRefusedError):
+        from pymodule.cli.app import main as app_main  # pylint: disable=import-outside-toplevel
+        app_main()
+        return
+    sys.exit(code)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+# src/cli/daemon.py
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import threading
+from importlib.metadata import version as pkg_version
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from pymodule.core.config import get_app_configuration
+from pymodule.core.app_runner import run_app
+from pymodule.core.metrics import REGISTRY
+from pymodule.logger import get_app_logger, setup_logging
+from pymodule.logger.logger_module import ColorFormatter, VERBOSITY_LEVELS
+from pymodule.cli.client import default_socket_path
+
+logger = get_app_logger(__name__)
+
+Send = Callable[[Dict[str, Any]], None]
+
+# ================================================================
+#  Per-job output forwarding
+# ================================================================
+class _ForwardingHandler(logging.Handler):
+    """Sends every formatted log record of the running job to its client."""
+
+    def __init__(self, send: Send, level: int) -> None:
+        super().__init__(level)
+        self.send = send
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.send({"log": self.format(record)})
+        except OSError:
+            pass    # client went away, the job still runs to completion
+
+class _ForwardingStream(io.TextIOBase):
+    """File-like object forwarding print() output of the running job under `key`."""
+
+    def __init__(self, send: Send, key: str) -> None:
+        self.send = send
+        self.key = key
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text:
+            try:
+                self.send({self.key: text})
+            except OSError:
+                pass
+        return len(text)
+
+# ================================================================
+#  Job execution
+# ================================================================
+_job_lock = threading.Lock()
+
+def run_job(request: Dict[str, Any], send: Send) -> int:
+    """Run one `pymodule` invocation inside the warm process and return its exit code.
+
+    Jobs are serialized: cwd, root logger and sys.stdout are process wide. Output
+    that C extensions write straight to file descriptor 1 stays on the daemon's
+    terminal.
+    """
+    with _job_lock:
+        root = logging.getLogger()
+        saved_handlers, saved_level = root.handlers[:], root.level
+        saved_cwd = os.getcwd()
+        try:
+            os.chdir(request.get("cwd") or saved_cwd)
+            with contextlib.redirect_stdout(_ForwardingStream(send, "stdout")), \
+                 contextlib.redirect_stderr(_ForwardingStream(send, "stderr")):
+                cfg = get_app_configuration(request.get("argv", []), request.get("env", {}))
+                log_cfg = cfg.config['logging']
+                level = VERBOSITY_LEVELS.get(log_cfg['verbose'], logging.INFO)
+                handler = _ForwardingHandler(send, level)
+                handler.setFormatter(ColorFormatter(prefix_enabled=log_cfg['log_prefix'], use_color=log_cfg['use_color']))
+                root.handlers = [handler]
+                root.setLevel(level)
+
+                if log_cfg['version_option']:
+                    logger.info("Version information requested")
+                    print(f"pymodule {pkg_version('pymodule')}")
+                else:
+                    run_app(cfg)
+                if cfg.config['parameters']['metrics_file']:
+                    # metrics accumulate over all jobs of the daemon
+                    REGISTRY.write(cfg.config['parameters']['metrics_file'])
+            return 0
+        except SystemExit as e:   # argparse --help and usage errors
+            return e.code if isinstance(e.code, int) else 0 if e.code is None else 1
+        except Exception as e:    # pylint: disable=broad-exception-caught
+            logger.error("Application terminated: %s", str(e), exc_info=False)
+            return 1
+        finally:
+            root.handlers = saved_handlers
+            root.setLevel(saved_level)
+            os.chdir(saved_cwd)
+
+# ================================================================
+#  Unix domain socket server
+# ================================================================
+def _parse_request(line: bytes) -> Tuple[Dict[str, Any], str]:
+    """Decode one request line into (request, command); "run" requests need an argv list of strings."""
+    request = json.loads(line)
+    if not isinstance(request, dict):
+        raise TypeError("request is not a JSON object")
+    command = request.get("command", "run")
+    if command == "run":
+        argv = request["argv"]
+        if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+            raise TypeError("argv is not a list of strings")
+    return request, command
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    server: "DaemonServer"
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        write_lock = threading.Lock()
+
+        def send(message: Dict[str, Any]) -> None:
+            with write_lock:
+                self.wfile.write(json.dumps(message).encode() + b"\n")
+
+        try:
+            request, command = _parse_request(line)
+        except (ValueError, KeyError, TypeError) as e:     # json.JSONDecodeError and UnicodeDecodeError are ValueErrors
+            logger.warning("Malformed daemon request: %s", e)
+            send({"stderr": f"Malformed daemon request: {e}\n"})
+            send({"exit": 2})
+            return
+        if command == "shutdown":
+            logger.info("Daemon shutdown requested")
+            send({"exit": 0})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        if command != "run":
+            send({"stderr": f"Unknown daemon command '{command}'\n"})
+            send({"exit": 2})
+            return
+        code = run_job(request, send)
+        self.server.jobs += 1
+        logger.debug("Job %d finished with exit code %d", self.server.jobs, code)
+        try:
+            send({"exit": code})
+        except OSError:
+            pass
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Warm `pymodule` process serving jobs from `pymodule-client` over a Unix domain socket."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Optional[str] = None) -> None:
+        self.socket_path = socket_path or default_socket_path()
+        self.jobs = 0
+        self._remove_stale_socket()
+        super().__init__(self.socket_path, _JobHandler)
+
+    def server_bind(self) -> None:
+        # the socket is created with mode 0600, other users never get a window to connect
+        old_umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(old_umask)
+
+    def _remove_stale_socket(self) -> None:
+        try:
+            info = os.lstat(self.socket_path)
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+            raise RuntimeError(f"{self.socket_path} exists and is not a socket owned by this user, not removing it")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)
+                return
+        raise RuntimeError(f"A pymodule daemon is already listening on {self.socket_path}")
+
+    def server_close(self) -> None:
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.socket_path)
+
+def main() -> None:
+    """Entry point of `pymodule-daemon`."""
+    parser = argparse.ArgumentParser(description='Serve pymodule jobs from a warm process')
+    parser.add_argument('--socket', dest='socket', type=str, default=None, help="Unix socket path, default is $PYMODULE_SOCKET or a per-user runtime socket")
+    parser.add_argument('--verbose', dest='verbose', type=int, choices=[0, 1, 2, 3, 4, 5, 6], default=4, help="Verbosity of the daemon's own log")
+    args = parser.parse_args()
+    setup_logging(args.verbose)
+
+    with DaemonServer(args.socket) as server:
+        logger.info("pymodule daemon listening on %s", server.socket_path)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    logger.info("pymodule daemon stopped after %d jobs", server.jobs)
+
+if __name__ == "__main__":
+    main()
@@ -4,3 +4,5 @@ from .core_module_a import hello_from_core_module_a, goodbye_from_core_module_a
 from .core_module_b import hello_from_core_module_b, goodbye_from_core_module_b
 from .config import Config
 from .benchmark import python_benchmark, python_fibonacci
+from .file_pipeline import process_file, process_file_parallel, run_file_pipeline
+from .metrics import MetricsRegistry, REGISTRY, timed, time_block
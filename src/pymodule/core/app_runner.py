@@ -1,39 +1,107 @@
 # app_runner.py
 
-from importlib.metadata import version as pkg_version
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence
 
 import pymodule
 from pymodule.core.config import Config
+from pymodule.core.async_runner import AppStep, StepResult, run_steps, run_steps_serially, THREAD, PROCESS
+from pymodule.core.benchmark import python_benchmark, benchmark_sweep, benchmark_report, subinterpreters_api, \
+    BENCHMARK_ITERATIONS, EXTRA_BENCHMARKS
+from pymodule.core.file_pipeline import run_file_pipeline
+from pymodule.core.metrics import timed
 from pymodule.logger import get_app_logger
-from pymodule.extensions.cmodulea.cmodulea import print_hello_cmodulea
+from pymodule.extensions.cmodulea.cmodulea import print_hello_cmodulea, c_benchmark
 from pymodule.extensions.cmoduleb.cmoduleb import print_hello_cmoduleb
 from pymodule.extensions.hello_world import hello
-from pymodule.extensions.worker import worker_func
+from pymodule.extensions.worker import worker_func, cython_benchmark, capi_benchmark
 
 logger = get_app_logger(__name__)
 
+# ================================================================
+#  The application as steps
+# ================================================================
+def _greetings() -> None:
+    pymodule.hello_from_core_module_a()
+    pymodule.goodbye_from_core_module_a()
+    pymodule.hello_from_core_module_b()
+    pymodule.goodbye_from_core_module_b()
+    pymodule.hello_from_utils()
+    pymodule.hello_from_ina236()
+    print_hello_cmodulea()
+    print_hello_cmoduleb()
+    print(f"{hello()}")
+
+def _extra_benchmarks(names: Sequence[str]) -> List[str]:
+    """The opt-in benchmarks to run, "all" is every one this Python can run.
+
+    :raises ValueError: on an unknown benchmark name
+    """
+    selected: List[str] = []
+    for name in names:
+        if name == "all":
+            available = [b for b in EXTRA_BENCHMARKS if b != "subinterpreter_scaling" or subinterpreters_api() is not None]
+            selected.extend(b for b in available if b not in selected)
+        elif name in EXTRA_BENCHMARKS:
+            if name not in selected:
+                selected.append(name)
+        else:
+            raise ValueError(f"Unknown benchmark '{name}', expected 'all' or one of: {', '.join(EXTRA_BENCHMARKS)}")
+    return selected
+
+def app_steps(cfg: Config, iterations: int = BENCHMARK_ITERATIONS) -> List[AppStep]:
+    """The steps of `run_app`, in the order the serial runner takes them.
+
+    The concurrent runner starts every step as soon as its dependencies are done, so
+    file processing and the benchmarks run side by side. The benchmarks of
+    `extra_benchmarks` and the sweep run only when asked for.
+    """
+    positionals = cfg.config['positionals']
+    parameters = cfg.config['parameters']
+    steps = [
+        AppStep("greetings", _greetings),
+        AppStep("worker", worker_func, after=("greetings",)),
+        AppStep("file_pipeline", run_file_pipeline, (positionals['input_file'], positionals['output_file'],
+                                                     parameters['chunk_size'], parameters['workers']), THREAD),
+        AppStep("python_benchmark", python_benchmark, (iterations,), PROCESS),
+        AppStep("cython_benchmark", cython_benchmark, (iterations,), PROCESS),
+        AppStep("c_benchmark", c_benchmark, (iterations,), PROCESS),
+        AppStep("capi_benchmark", capi_benchmark, (iterations,), PROCESS),
+        AppStep("benchmark_report", benchmark_report,
+                (StepResult("python_benchmark"), StepResult("cython_benchmark"), StepResult("c_benchmark"),
+                 StepResult("capi_benchmark"))),
+    ]
+    for name in _extra_benchmarks(parameters['extra_benchmarks']):
+        function, args = EXTRA_BENCHMARKS[name]
+        steps.append(AppStep(f"{name}_benchmark", function, args, PROCESS))
+    if parameters['benchmark_sweep'] or parameters['benchmark_sweep_csv']:
+        # alone after the other benchmarks, the sweep times short runs
+        steps.append(AppStep("benchmark_sweep", benchmark_sweep, (parameters['benchmark_sweep_csv'],), PROCESS,
+                             after=tuple(step.name for step in steps if step.name.endswith("benchmark"))))
+    return steps
+
+async def run_app_async(cfg: Config, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Async variant of `run_app`."""
+    logger.info("Running run_app_async")
+    try:
+        return await run_steps(app_steps(cfg), timeout=timeout)
+    finally:
+        logger.info("Exiting run_app_async")
+
 # CLI application main function with collected options & configuration
+@timed("run_app_seconds")
 def run_app(cfg:Config) -> None:
+    if cfg.config['parameters']['concurrent']:
+        asyncio.run(run_app_async(cfg, timeout=cfg.config['parameters']['timeout'] or None))
+        return
     try:
-        # Add real application code here.
+        # Add real application code here: new work goes into app_steps.
         logger.info("Running run_app")
         logger.info("config = %s",str(cfg.config))
-        pymodule.hello_from_core_module_a()
-        pymodule.goodbye_from_core_module_a()
-        pymodule.hello_from_core_module_b()
-        pymodule.goodbye_from_core_module_b()
-        pymodule.hello_from_utils()
-        pymodule.hello_from_ina236()
-        print_hello_cmodulea()
-        print_hello_cmoduleb()
-        print(f"{hello()}")
-        worker_func()
-
-        pymodule.core.benchmark.benchmark(500000)
+        run_steps_serially(app_steps(cfg))
     except ValueError as e:
         raise e
     except Exception as e:
         raise e
     finally:
         logger.info("Exiting run_app")
-
@@ -0,0 +1,154 @@
+# core/async_runner.py
+
+import asyncio
+import functools
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from pymodule.core.memory_profile import memory_phase
+from pymodule.core.metrics import REGISTRY
+from pymodule.logger import get_app_logger
+
+logger = get_app_logger(__name__)
+
+# where a step runs
+INLINE = "inline"       # on the event loop thread, for short calls
+THREAD = "thread"       # thread pool, for blocking I/O and code that releases the GIL
+PROCESS = "process"     # process pool, for CPU bound code holding the GIL
+
+class StepResult(NamedTuple):
+    """Placeholder in `AppStep.args`, replaced by the return value of the named step."""
+    step: str
+
+class AppStep(NamedTuple):
+    name: str
+    func: Callable[..., Any]
+    args: Tuple[Any, ...] = ()
+    executor: str = INLINE
+    after: Tuple[str, ...] = ()         # ordering only dependencies
+    timeout: Optional[float] = None     # seconds, None = no limit
+
+    def dependencies(self) -> Tuple[str, ...]:
+        return self.after + tuple(arg.step for arg in self.args if isinstance(arg, StepResult))
+
+def _check_steps(steps: Sequence[AppStep]) -> List[AppStep]:
+    """Reject duplicate names, unknown executors, unknown dependencies and cycles.
+
+    :return: The steps in an order that runs every step after its dependencies
+    """
+    by_name = {step.name: step for step in steps}
+    if len(by_name) != len(steps):
+        raise ValueError("Step names must be unique")
+    for step in steps:
+        if step.executor not in (INLINE, THREAD, PROCESS):
+            raise ValueError(f"Step '{step.name}': unknown executor '{step.executor}'")
+        for dep in step.dependencies():
+            if dep not in by_name:
+                raise ValueError(f"Step '{step.name}' depends on unknown step '{dep}'")
+    done: Dict[str, bool] = {}    # False while visiting, True when finished
+    order: List[AppStep] = []
+
+    def visit(name: str) -> None:
+        if done.get(name) is False:
+            raise ValueError(f"Dependency cycle through step '{name}'")
+        if name not in done:
+            done[name] = False
+            for dep in by_name[name].dependencies():
+                visit(dep)
+            done[name] = True
+            order.append(by_name[name])
+
+    for step in steps:
+        visit(step.name)
+    return order
+
+def _step_done(step: AppStep, elapsed: float) -> None:
+    REGISTRY.histogram(f"step_{step.name}_seconds", f"Run time of the application step {step.name} in seconds").observe(elapsed)
+    logger.debug("Step %s finished in %.3f ms", step.name, elapsed * 1000.0)
+
+def _stop_executors(executors: Dict[str, Executor], terminate: bool) -> None:
+    """Cancel queued work; with `terminate`, also kill process pool workers still running a step.
+
+    Running work cannot be cancelled, and the interpreter waits for the pool processes
+    at exit, so after a failure or timeout they are terminated. Thread pool work that
+    already started still finishes in the background.
+    """
+    for executor in executors.values():
+        if terminate and isinstance(executor, ProcessPoolExecutor):
+            terminate_workers = getattr(executor, "terminate_workers", None)    # Python 3.14+
+            if terminate_workers is not None:
+                terminate_workers()
+                continue
+            # before shutdown(), which forgets the processes
+            processes = list((executor._processes or {}).values())     # pylint: disable=protected-access
+            executor.shutdown(wait=False, cancel_futures=True)
+            for process in processes:
+                process.terminate()
+        else:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+def run_steps_serially(steps: Sequence[AppStep]) -> Dict[str, Any]:
+    """Run the steps one after another on the calling thread, in dependency order.
+
+    Executors and timeouts are ignored; every step is a memory profile phase.
+
+    :return: step name -> return value
+    """
+    results: Dict[str, Any] = {}
+    for step in _check_steps(steps):
+        args = [results[arg.step] if isinstance(arg, StepResult) else arg for arg in step.args]
+        with memory_phase(step.name):
+            start = time.perf_counter()
+            results[step.name] = step.func(*args)
+            _step_done(step, time.perf_counter() - start)
+    return results
+
+async def run_steps(steps: Sequence[AppStep], timeout: Optional[float] = None,
+                    max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """Run the steps as asyncio tasks, each one as soon as its dependencies are done.
+
+    Independent steps overlap: blocking ones in a thread pool, CPU bound ones in a
+    process pool. The first failing step, a step timeout or the overall `timeout`
+    cancels all remaining steps and the error is re-raised. Executor work that
+    already started cannot be interrupted; it finishes in the background and its
+    result is discarded; process pool workers are terminated so the program can exit.
+
+    :return: step name -> return value
+    """
+    _check_steps(steps)
+    loop = asyncio.get_running_loop()
+    executors: Dict[str, Executor] = {THREAD: ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="app-step")}
+    if any(step.executor == PROCESS for step in steps):
+        executors[PROCESS] = ProcessPoolExecutor(max_workers=max_workers)
+    tasks: Dict[str, "asyncio.Task[Any]"] = {}
+
+    async def run(step: AppStep) -> Any:
+        deps = step.dependencies()
+        if deps:
+            await asyncio.gather(*(tasks[dep] for dep in deps))
+        args = [tasks[arg.step].result() if isinstance(arg, StepResult) else arg for arg in step.args]
+        start = time.perf_counter()
+        if step.executor == INLINE:
+            result = step.func(*args)
+        else:
+            future = loop.run_in_executor(executors[step.executor], functools.partial(step.func, *args))
+            result = await asyncio.wait_for(future, step.timeout)
+        _step_done(step, time.perf_counter() - start)
+        return result
+
+    try:
+        async with asyncio.timeout(timeout):
+            async with asyncio.TaskGroup() as group:
+                for step in steps:
+                    tasks[step.name] = group.create_task(run(step), name=step.name)
+    except BaseExceptionGroup as eg:
+        _stop_executors(executors, terminate=True)
+        for error in eg.exceptions[1:]:
+            logger.debug("Further step failure: %r", error)
+        raise eg.exceptions[0] from None
+    except BaseException:
+        _stop_executors(executors, terminate=True)
+        raise
+    _stop_executors(executors, terminate=False)
+    return {name: task.result() for name, task in tasks.items()}
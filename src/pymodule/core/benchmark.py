@@ -1,21 +1,60 @@
 # core/benchmark.py
 
+import os
+import functools
 import time
+import random
+import importlib
+import csv
+import math
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
 from pymodule.logger import get_app_logger
-from pymodule.extensions.cmodulea.cmodulea import c_benchmark
-from pymodule.extensions.worker import cython_benchmark
+from pymodule.core.metrics import MetricsRegistry, time_block, timed
+from pymodule.extensions.cmodulea import cmodulea
+from pymodule.extensions.cmodulea.cmodulea import c_benchmark, fibonacci as c_fibonacci, fibonacci_varargs as c_fibonacci_varargs
+from pymodule.extensions.cmoduleb.cmoduleb import fibonacci as capi_fibonacci_c
+from pymodule.extensions.worker import cython_benchmark, capi_benchmark, cython_fibonacci, BatchScheduler, task_fibonacci
+from pymodule.drivers.ina236 import INA236RawSample
+from pymodule.utils import sumator, sum_values
+from pymodule.utils.reduction import SIMPLE, KAHAN, PAIRWISE
+from pymodule.drivers.ina236_compress import encode_block, decode_block
 
 logger = get_app_logger(__name__)
 
+BENCHMARK_ITERATIONS = 500000
+CODEC_BENCHMARK_RECORDS = 100000
+CODEC_BLOCK_RECORDS = 4096
+CALL_OVERHEAD_CALLS = 1000000
+SCALING_ITERATIONS = 200000
+REDUCTION_VALUES = 1000000
+METRICS_OVERHEAD_EVENTS = 200000
+SCHEDULER_JOBS = 200000
+SCHEDULER_BATCH = 1000
+SWEEP_SIZES = (1, 4, 16, 64, 256, 1024)             # fibonacci(n) per call
+SWEEP_ITERATIONS = (10, 100, 1000, 10000, 100000)   # calls per run
+SWEEP_MAX_UNITS = 1 << 23                           # skip points with more n * iterations
+
 def benchmark(n:int) -> None:
     logger.info("Benchmarks:")
-    pdiff = python_benchmark(n)
-    ydiff = cython_benchmark(n)
-    cdiff = c_benchmark(n)
+    with time_block("benchmark_python_seconds"):
+        pdiff = python_benchmark(n)
+    with time_block("benchmark_cython_seconds"):
+        ydiff = cython_benchmark(n)
+    with time_block("benchmark_c_seconds"):
+        cdiff = c_benchmark(n)
+    with time_block("benchmark_capi_seconds"):
+        adiff = capi_benchmark(n)
+    benchmark_report(pdiff, ydiff, cdiff, adiff)
 
+def benchmark_report(pdiff:float, ydiff:float, cdiff:float, adiff:Optional[float] = None) -> None:
     logger.info("Python = 100.0%")
     logger.info(f"Cython = {((ydiff / pdiff) * 100.0)}%")
     logger.info(f"C      = {((cdiff / pdiff)*100.0)}%")
+    if adiff is not None:
+        logger.info(f"Cython via C API = {((adiff / pdiff)*100.0)}%")
 
 def python_benchmark(n:int) -> float:
     start_time = time.time()
@@ -31,3 +70,396 @@ def python_fibonacci(n:int) -> int:
     for _ in range(n):
         a, b = b, a + b
     return a
+
+def codec_benchmark(records:int) -> Tuple[float, float]:
+    """Encode/decode throughput (records per second) of the compressed INA236 capture codec."""
+    rng = random.Random(0)
+    samples = [INA236RawSample(i * 1000000 + rng.randint(-2000, 2000), 2000 + rng.randint(-3, 3), 7500 + rng.randint(-1, 1),
+                               4000 + rng.randint(-6, 6), 1500 + rng.randint(-2, 2)) for i in range(records)]
+    groups = [samples[i:i + CODEC_BLOCK_RECORDS] for i in range(0, records, CODEC_BLOCK_RECORDS)]
+
+    start_time = time.perf_counter()
+    blocks = [encode_block(group) for group in groups]
+    encode_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for block, group in zip(blocks, groups):
+        decode_block(block, 0, len(group))
+    decode_time = time.perf_counter() - start_time
+
+    raw_bytes = records * 16
+    compressed_bytes = sum(len(block) for block in blocks)
+    encode_rate = records / encode_time
+    decode_rate = records / decode_time
+    logger.info(f"Codec encode: {encode_rate:,.0f} records/s ({raw_bytes / encode_time / 1e6:.1f} MB/s raw)")
+    logger.info(f"Codec decode: {decode_rate:,.0f} records/s ({raw_bytes / decode_time / 1e6:.1f} MB/s raw)")
+    logger.info(f"Codec ratio : {raw_bytes / compressed_bytes:.2f} ({compressed_bytes / records:.2f} bytes/record)")
+    return encode_rate, decode_rate
+
+def call_overhead_benchmark(calls:int) -> Dict[str, float]:
+    """Nanoseconds per call of fibonacci(0) - no compute work - for each calling convention.
+
+    The cost of the bare Python loop is measured separately and subtracted.
+    """
+    def per_call(func:Optional[Callable[[int], int]]) -> float:
+        best = float("inf")
+        for _ in range(5):
+            start_time = time.perf_counter_ns()
+            if func is None:
+                for _ in range(calls):
+                    pass
+            else:
+                for _ in range(calls):
+                    func(0)
+            best = min(best, time.perf_counter_ns() - start_time)
+        return best / calls
+
+    loop = per_call(None)
+
+    candidates = {
+        "Python": python_fibonacci,
+        "Cython": cython_fibonacci,
+        "C METH_FASTCALL": c_fibonacci,
+        "C METH_VARARGS": c_fibonacci_varargs,
+        "C through C API": capi_fibonacci_c,
+    }
+    results = {name: max(per_call(func) - loop, 0.0) for name, func in candidates.items()}
+    for name, overhead in results.items():
+        logger.info(f"Call overhead {name:<16}: {overhead:7.1f} ns/call")
+    return results
+
+def reduction_benchmark(size:int) -> Dict[str, float]:
+    """Milliseconds to sum `size` floats with sum(), a chain of three-argument sumator calls and sum_values.
+
+    Every variant is timed best of 3; the error against math.fsum is logged with it.
+    """
+    rng = random.Random(0)
+    values = [rng.uniform(-1.0, 1.0) * 10.0 ** rng.randint(-8, 8) for _ in range(size)]
+    buffer = array("d", values)
+
+    def sumator_chain() -> float:
+        pairs = iter(values)
+        total = 0.0
+        for a, b in zip(pairs, pairs):
+            total = sumator(total, a, b)     # type: ignore[arg-type]
+        return total + sum(values[size - size % 2:])
+
+    candidates: Dict[str, Callable[[], float]] = {
+        "sum() of list": lambda: sum(values),
+        "sumator chain": sumator_chain,
+        "buffer simple": lambda: sum_values(buffer, SIMPLE),
+        "buffer pairwise": lambda: sum_values(buffer, PAIRWISE),
+        "buffer kahan": lambda: sum_values(buffer, KAHAN),
+        "list pairwise": lambda: sum_values(values, PAIRWISE),
+        "iterator pairwise": lambda: sum_values(iter(values), PAIRWISE),
+    }
+    exact = math.fsum(values)
+    results = {}
+    errors = {}
+    for name, func in candidates.items():
+        best = float("inf")
+        for _ in range(3):
+            start_time = time.perf_counter()
+            total = func()
+            best = min(best, time.perf_counter() - start_time)
+        results[name] = best * 1000.0
+        errors[name] = abs(total - exact)
+    for name, elapsed in results.items():
+        logger.info(f"Reduction {name:<17}: {elapsed:9.3f} ms, {results['sum() of list'] / elapsed:6.1f}x sum(), "
+                    f"{results['sumator chain'] / elapsed:6.1f}x sumator, error {errors[name]:.3g}")
+    return results
+
+def metrics_overhead_benchmark(events:int) -> Dict[str, float]:
+    """Nanoseconds added per recorded event by each kind of metric update, best of 5."""
+    registry = MetricsRegistry()
+    counter = registry.counter("overhead_total")
+    gauge = registry.gauge("overhead")
+    histogram = registry.histogram("overhead_seconds")
+
+    def noop() -> None:
+        pass
+
+    timed_noop = timed("overhead_timed_seconds", registry=registry)(noop)
+
+    def per_event(record:Callable[[], Any]) -> float:
+        best = float("inf")
+        for _ in range(5):
+            start_time = time.perf_counter_ns()
+            for _ in range(events):
+                record()
+            best = min(best, time.perf_counter_ns() - start_time)
+        return best / events
+
+    baseline = per_event(noop)
+    candidates: Dict[str, Callable[[], Any]] = {
+        "counter.inc": counter.inc,
+        "gauge.set": lambda: gauge.set(1.0),
+        "histogram.observe": lambda: histogram.observe(0.001),
+        "@timed call": timed_noop,
+    }
+    results = {name: max(per_event(record) - baseline, 0.0) for name, record in candidates.items()}
+    for name, overhead in results.items():
+        logger.info(f"Metrics overhead {name:<17}: {overhead:7.1f} ns/event")
+    return results
+
+def scheduler_benchmark(jobs:int, job_size:int = 90, workers:Optional[int] = None) -> Dict[str, float]:
+    """Jobs per second of `jobs` Fibonacci(job_size) jobs: ThreadPoolExecutor against BatchScheduler.
+
+    The executor gets one submit and one future per job, the scheduler gets batches
+    of SCHEDULER_BATCH jobs and all jobs as one batch.
+    """
+    workers = workers or os.cpu_count() or 1
+    items = array("q", [job_size]) * jobs
+
+    def executor_run() -> None:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(task_fibonacci, item) for item in items]:
+                future.result()
+
+    def batched_run(batch:int) -> Callable[[], None]:
+        def run() -> None:
+            with BatchScheduler("fibonacci", workers) as scheduler:
+                for future in [scheduler.submit(items[start:start + batch]) for start in range(0, jobs, batch)]:
+                    future.result()
+        return run
+
+    candidates: Dict[str, Callable[[], None]] = {
+        "ThreadPoolExecutor": executor_run,
+        f"BatchScheduler {SCHEDULER_BATCH}/batch": batched_run(SCHEDULER_BATCH),
+        "BatchScheduler 1 batch": batched_run(max(jobs, 1)),
+    }
+    results = {}
+    for name, run in candidates.items():
+        start_time = time.perf_counter()
+        run()
+        results[name] = jobs / (time.perf_counter() - start_time)
+        logger.info(f"Scheduler {name:<26}: {results[name]:14.0f} jobs/s")
+    return results
+
+def subinterpreters_api() -> Any:
+    """The low level subinterpreter module of this Python (3.12+), or None."""
+    for name in ("_interpreters", "_xxsubinterpreters"):
+        try:
+            return importlib.import_module(name)
+        except ImportError:
+            continue
+    return None
+
+def _run_in_threads(calls:List[Callable[[], Any]]) -> float:
+    """Start all calls at the same moment, one thread each; returns the wall time in ms."""
+    barrier = threading.Barrier(len(calls) + 1)
+
+    def run(call:Callable[[], Any]) -> None:
+        barrier.wait()
+        call()
+
+    with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+        futures = [pool.submit(run, call) for call in calls]
+        barrier.wait()
+        start_time = time.perf_counter()
+        for future in futures:
+            future.result()
+        return (time.perf_counter() - start_time) * 1000.0
+
+def scaling_benchmark(n:int, max_workers:Optional[int] = None, mode:str = "threads") -> Dict[int, float]:
+    """Run c_benchmark(n) on 1, 2, 4 ... max_workers workers at once; returns workers -> speedup.
+
+    The speedup is the throughput against one worker, ideal is the number of workers.
+    "threads" relies on c_benchmark releasing the GIL, "subinterpreters" runs every
+    worker in its own interpreter (own GIL, Python 3.12+).
+    """
+    if mode not in ("threads", "subinterpreters"):
+        raise ValueError(f"Unknown scaling mode '{mode}'")
+    max_workers = max_workers or os.cpu_count() or 1
+    counts = sorted({min(1 << i, max_workers) for i in range(max_workers.bit_length() + 1)})
+
+    interpreters: List[Any] = []
+    api: Any = None
+    if mode == "subinterpreters":
+        api = subinterpreters_api()
+        if api is None:
+            raise RuntimeError("Subinterpreters are not available in this Python")
+        # load only cmodulea, straight from its file: the rest of pymodule is not subinterpreter safe
+        setup = ("import importlib.util\n"
+                 f"spec = importlib.util.spec_from_file_location('cmodulea', {cmodulea.__file__!r})\n"
+                 "cmodulea = importlib.util.module_from_spec(spec)\n"
+                 "spec.loader.exec_module(cmodulea)\n")
+        for _ in range(max_workers):
+            interp = api.create()
+            api.run_string(interp, setup)
+            interpreters.append(interp)
+
+    def call(worker:int) -> Callable[[], Any]:
+        if api is not None:
+            return lambda: api.run_string(interpreters[worker], f"cmodulea.c_benchmark({n})")
+        return lambda: c_benchmark(n)
+
+    results = {}
+    try:
+        base = 0.0
+        for workers in counts:
+            wall = _run_in_threads([call(worker) for worker in range(workers)])
+            base = base or wall
+            results[workers] = workers * base / wall
+            logger.info(f"Scaling ({mode}) {workers:3d} workers: {wall:10.3f} ms, speedup {results[workers]:5.2f}x, "
+                        f"efficiency {results[workers] / workers * 100.0:5.1f}%")
+    finally:
+        for interp in interpreters:
+            api.destroy(interp)
+    return results
+
+# ================================================================
+#  Input size sweep and cost model
+# ================================================================
+class SweepPoint(NamedTuple):
+    backend: str
+    n: int              # fibonacci(n) per call
+    iterations: int     # calls per run
+    seconds: float      # best of the repeats
+
+class CostModel(NamedTuple):
+    """Fitted run time: fixed + iterations * (per_call + n * per_unit), in seconds."""
+    backend: str
+    fixed: float        # per run, e.g. creating a batch
+    per_call: float     # per call, independent of n
+    per_unit: float     # per Fibonacci step
+    max_error: float    # largest relative error of the fit over the measured points
+
+    def predict(self, n:int, iterations:int) -> float:
+        return self.fixed + iterations * (self.per_call + n * self.per_unit)
+
+def _sweep_backends(scheduler:Any) -> Dict[str, Callable[[int, int], Callable[[], Any]]]:
+    """Backend name -> function of (n, iterations) returning the run to time."""
+    def calls(func:Callable[[int], Any]) -> Callable[[int, int], Callable[[], Any]]:
+        def prepare(n:int, iterations:int) -> Callable[[], Any]:
+            def run() -> None:
+                for _ in range(iterations):
+                    func(n)
+            return run
+        return prepare
+
+    def batch(n:int, iterations:int) -> Callable[[], Any]:
+        items = array("q", [n]) * iterations
+        return lambda: scheduler.map(items)
+
+    return {
+        "Python": calls(python_fibonacci),
+        "Cython": calls(cython_fibonacci),
+        "C": calls(c_fibonacci),
+        "C through C API": calls(capi_fibonacci_c),
+        "BatchScheduler": batch,
+    }
+
+def sweep_benchmark(sizes:Sequence[int] = SWEEP_SIZES, iterations:Sequence[int] = SWEEP_ITERATIONS,
+                    max_units:int = SWEEP_MAX_UNITS, repeat:int = 3) -> List[SweepPoint]:
+    """Time every backend on the grid of per-call n and calls per run, best of `repeat`.
+
+    Points with n * iterations above `max_units` are skipped, they only add run time.
+    """
+    points = []
+    with BatchScheduler("fibonacci") as scheduler:
+        for name, prepare in _sweep_backends(scheduler).items():
+            for n in sizes:
+                for count in iterations:
+                    if n * count > max_units:
+                        continue
+                    run = prepare(n, count)
+                    best = float("inf")
+                    for _ in range(repeat):
+                        start_time = time.perf_counter()
+                        run()
+                        best = min(best, time.perf_counter() - start_time)
+                    points.append(SweepPoint(name, n, count, best))
+    return points
+
+def _solve(matrix:List[List[float]], vector:List[float]) -> List[float]:
+    """Solve a small linear system by Gaussian elimination with partial pivoting."""
+    size = len(vector)
+    rows = [row[:] + [value] for row, value in zip(matrix, vector)]
+    for col in range(size):
+        pivot = max(range(col, size), key=lambda row: abs(rows[row][col]))
+        if rows[pivot][col] == 0.0:
+            raise ValueError("Sweep points do not determine the cost model, vary both n and iterations")
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for row in range(col + 1, size):
+            factor = rows[row][col] / rows[col][col]
+            for k in range(col, size + 1):
+                rows[row][k] -= factor * rows[col][k]
+    solution = [0.0] * size
+    for col in reversed(range(size)):
+        solution[col] = (rows[col][size] - sum(rows[col][k] * solution[k] for k in range(col + 1, size))) / rows[col][col]
+    return solution
+
+def fit_cost_model(points:Sequence[SweepPoint]) -> Dict[str, CostModel]:
+    """Fit fixed + iterations * (per_call + n * per_unit) per backend.
+
+    Least squares of the relative error, so the fast points weigh as much as the slow
+    ones. Negative coefficients, left by measurement noise, are clamped to 0.
+    """
+    by_backend: Dict[str, List[SweepPoint]] = {}
+    for point in points:
+        by_backend.setdefault(point.backend, []).append(point)
+    models = {}
+    for backend, measured in by_backend.items():
+        # normal equations of sum(((x . features) - t) / t)^2
+        normal = [[0.0] * 3 for _ in range(3)]
+        right = [0.0] * 3
+        for point in measured:
+            features = [1.0 / point.seconds, point.iterations / point.seconds, point.iterations * point.n / point.seconds]
+            for i in range(3):
+                right[i] += features[i]
+                for j in range(3):
+                    normal[i][j] += features[i] * features[j]
+        fixed, per_call, per_unit = (max(value, 0.0) for value in _solve(normal, right))
+        model = CostModel(backend, fixed, per_call, per_unit, 0.0)
+        error = max(abs(model.predict(point.n, point.iterations) - point.seconds) / point.seconds for point in measured)
+        models[backend] = model._replace(max_error=error)
+    return models
+
+def best_backend(models:Dict[str, CostModel], n:int, iterations:int) -> str:
+    """The backend with the lowest predicted run time for the workload."""
+    return min(models.values(), key=lambda model: model.predict(n, iterations)).backend
+
+def format_sweep_report(models:Dict[str, CostModel], sizes:Sequence[int] = SWEEP_SIZES,
+                        iterations:Sequence[int] = SWEEP_ITERATIONS) -> str:
+    lines = ["Cost model: time = fixed + iterations * (per call + n * per unit)",
+             f"  {'backend':<16} {'fixed us':>10} {'call ns':>10} {'unit ns':>10} {'max err':>8}"]
+    for model in models.values():
+        lines.append(f"  {model.backend:<16} {model.fixed * 1e6:10.2f} {model.per_call * 1e9:10.2f} "
+                     f"{model.per_unit * 1e9:10.3f} {model.max_error * 100.0:7.1f}%")
+    lines.append("Fastest backend (predicted), n across, iterations down:")
+    lines.append(f"  {'':>8} " + " ".join(f"{n:>16}" for n in sizes))
+    for count in iterations:
+        lines.append(f"  {count:>8} " + " ".join(f"{best_backend(models, n, count):>16}" for n in sizes))
+    return "\n".join(lines)
+
+def write_sweep_csv(path:str, points:Sequence[SweepPoint], models:Dict[str, CostModel]) -> None:
+    """One row per measured point with the model prediction next to it."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["backend", "n", "iterations", "seconds", "predicted_seconds"])
+        for point in points:
+            writer.writerow([point.backend, point.n, point.iterations, f"{point.seconds:.9g}",
+                             f"{models[point.backend].predict(point.n, point.iterations):.9g}"])
+
+def benchmark_sweep(csv_path:str = "", sizes:Sequence[int] = SWEEP_SIZES,
+                    iterations:Sequence[int] = SWEEP_ITERATIONS) -> Dict[str, CostModel]:
+    """Sweep all backends, fit their cost models, log the report and write the CSV if `csv_path` is set."""
+    points = sweep_benchmark(sizes, iterations)
+    models = fit_cost_model(points)
+    for line in format_sweep_report(models, sizes, iterations).splitlines():
+        logger.info(line)
+    if csv_path:
+        write_sweep_csv(csv_path, points, models)
+    return models
+
+# Opt-in benchmarks (`--benchmark NAME`, `extra_benchmarks` in [parameters]): name -> (function, arguments)
+EXTRA_BENCHMARKS: Dict[str, Tuple[Callable[..., Any], Tuple[Any, ...]]] = {
+    "codec": (codec_benchmark, (CODEC_BENCHMARK_RECORDS,)),
+    "call_overhead": (call_overhead_benchmark, (CALL_OVERHEAD_CALLS,)),
+    "reduction": (reduction_benchmark, (REDUCTION_VALUES,)),
+    "metrics_overhead": (metrics_overhead_benchmark, (METRICS_OVERHEAD_EVENTS,)),
+    "scheduler": (scheduler_benchmark, (SCHEDULER_JOBS,)),
+    "scaling": (scaling_benchmark, (SCALING_ITERATIONS,)),
+    "subinterpreter_scaling": (functools.partial(scaling_benchmark, mode="subinterpreters"), (SCALING_ITERATIONS,)),
+}
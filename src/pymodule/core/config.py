@@ -1,12 +1,16 @@
 # core/config.py
 
+import copy
 import os
 import sys
-from typing import Dict, Any, Mapping, TypedDict
+from typing import Callable, Dict, Any, List, Mapping, Optional, TypedDict
 import argparse
 from jsonschema import validate, ValidationError
 
 from pymodule.logger import get_app_logger
+from pymodule.core.startup_report import startup_phase, REPORT_OPTION
+from pymodule.core.memory_profile import PROFILE_OPTION, DUMP_OPTION
+from pymodule.core.metrics import timed
 
 logger = get_app_logger(__name__)
 
@@ -31,6 +35,15 @@ class LoggingConfig(TypedDict, total=False):
 class ParametersConfig(TypedDict, total=False):
     param1: int
     param2: int
+    workers: int
+    chunk_size: int
+    concurrent: bool
+    timeout: float
+    metrics_file: str
+    metrics_interval: float
+    extra_benchmarks: List[str]
+    benchmark_sweep: bool
+    benchmark_sweep_csv: str
 
 class PositionalsConfig(TypedDict, total=False):
     input_file: str
@@ -44,7 +57,8 @@ class ConfigDict(TypedDict):
 
 class Config:
     def __init__(self) -> None:
-        self.config: ConfigDict = self.DEFAULT_CONFIG
+        # private copy, so a long running process can build several configurations
+        self.config: ConfigDict = copy.deepcopy(self.DEFAULT_CONFIG)
 
     DEFAULT_CONFIG: ConfigDict = {
         'template': {
@@ -61,7 +75,16 @@ class Config:
         },
         'parameters': {
             'param1': 1,
-            'param2': 2
+            'param2': 2,
+            'workers': 1,
+            'chunk_size': 1048576,
+            'concurrent': False,
+            'timeout': 0,
+            'metrics_file': '',
+            'metrics_interval': 0,
+            'extra_benchmarks': [],
+            'benchmark_sweep': False,
+            'benchmark_sweep_csv': ''
         },
         'positionals': {
             'input_file': '',
@@ -105,6 +128,38 @@ class Config:
                     },
                     "param2": {
                         "type": "number"
+                    },
+                    "workers": {
+                        "type": "integer",
+                        "minimum": 0
+                    },
+                    "chunk_size": {
+                        "type": "integer",
+                        "minimum": 1
+                    },
+                    "concurrent": {
+                        "type": "boolean"
+                    },
+                    "timeout": {
+                        "type": "number",
+                        "minimum": 0
+                    },
+                    "metrics_file": {
+                        "type": "string"
+                    },
+                    "metrics_interval": {
+                        "type": "number",
+                        "minimum": 0
+                    },
+                    "extra_benchmarks": {
+                        "type": "array",
+                        "items": {"type": "string"}
+                    },
+                    "benchmark_sweep": {
+                        "type": "boolean"
+                    },
+                    "benchmark_sweep_csv": {
+                        "type": "string"
                     }
                 },
                 "additionalProperties": False
@@ -146,6 +201,7 @@ class Config:
         except Exception as e:
             raise e  # Catch-all for any other unexpected exceptions
 
+    @timed("load_config_file_seconds")
     def load_config_file(self, file_path: str="config.toml") -> Dict[str, Any]:
         # skip the configuration file if an empty name is given
         if file_path == '':
@@ -188,20 +244,22 @@ class Config:
                 if value is not None:
                     config[key] = value
 
-    def load_config_env(self) -> ConfigDict:
+    def load_config_env(self, env: Optional[Mapping[str, str]] = None) -> ConfigDict:
         """
         Load configuration from environment variables.
 
+        :param env: Environment to read instead of os.environ (e.g. forwarded by a daemon client)
         :return: Updated configuration dictionary
         """
+        getenv = (os.environ if env is None else env).get
         env_overrides = {
             "parameters": {
-                "param1": os.getenv("PYMODULE_PARAM1"),
-                "param2": os.getenv("PYMODULE_PARAM2")
+                "param1": getenv("PYMODULE_PARAM1"),
+                "param2": getenv("PYMODULE_PARAM2")
             },
             "positionals": {
-                "input_file": os.getenv("PYMODULE_INPUT_FILE"),
-                "output_file": os.getenv("PYMODULE_OUTPUT_FILE")
+                "input_file": getenv("PYMODULE_INPUT_FILE"),
+                "output_file": getenv("PYMODULE_OUTPUT_FILE")
             }
         }
         self.deep_update(config=self.config, config_file=env_overrides)
@@ -231,6 +289,24 @@ class Config:
                 self.config['parameters']['param1'] = config_cli.param1
             if config_cli.param2 is not None:
                 self.config['parameters']['param2'] = config_cli.param2
+            if hasattr(config_cli, 'workers') and config_cli.workers is not None:
+                self.config['parameters']['workers'] = config_cli.workers
+            if hasattr(config_cli, 'chunk_size') and config_cli.chunk_size is not None:
+                self.config['parameters']['chunk_size'] = config_cli.chunk_size
+            if hasattr(config_cli, 'concurrent') and config_cli.concurrent is not None:
+                self.config['parameters']['concurrent'] = config_cli.concurrent
+            if hasattr(config_cli, 'timeout') and config_cli.timeout is not None:
+                self.config['parameters']['timeout'] = config_cli.timeout
+            if hasattr(config_cli, 'metrics_file') and config_cli.metrics_file is not None:
+                self.config['parameters']['metrics_file'] = config_cli.metrics_file
+            if hasattr(config_cli, 'metrics_interval') and config_cli.metrics_interval is not None:
+                self.config['parameters']['metrics_interval'] = config_cli.metrics_interval
+            if hasattr(config_cli, 'extra_benchmarks') and config_cli.extra_benchmarks is not None:
+                self.config['parameters']['extra_benchmarks'] = config_cli.extra_benchmarks
+            if hasattr(config_cli, 'benchmark_sweep') and config_cli.benchmark_sweep is not None:
+                self.config['parameters']['benchmark_sweep'] = config_cli.benchmark_sweep
+            if hasattr(config_cli, 'benchmark_sweep_csv') and config_cli.benchmark_sweep_csv is not None:
+                self.config['parameters']['benchmark_sweep_csv'] = config_cli.benchmark_sweep_csv
 
             # positional parameters
             if hasattr(config_cli, 'input_file') and config_cli.input_file is not None:
@@ -240,8 +316,26 @@ class Config:
 
         return self.config
 
-def parse_args() -> argparse.Namespace:
-    """Parse command-line arguments, including nested options for mqtt and MS Protocol."""
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments (sys.argv when `argv` is None), including nested options for mqtt and MS Protocol."""
+    with startup_phase("build_parser"):
+        parser = build_parser()
+    with startup_phase("parse_args"):
+        return parser.parse_args(argv)
+
+def _int_at_least(minimum: int) -> Callable[[str], int]:
+    """argparse type: an integer >= `minimum`, with the same limit as the configuration schema."""
+    def parse(text: str) -> int:
+        try:
+            value = int(text)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid integer value: '{text}'") from None
+        if value < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}, got {value}")
+        return value
+    return parse
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description='My CLI App with Config File and Overrides', epilog=f'Priority: (lowest) defaults -> config file -> environment variables -> CLI options (highest)')
 
     # -------------------
@@ -269,6 +363,27 @@ def parse_args() -> argparse.Namespace:
         default=False,
         help='Show version information of the module'
     )
+    general_group.add_argument(
+        REPORT_OPTION,
+        dest='startup_report',
+        action='store_true',
+        default=False,
+        help="Run with import and startup phase timing and print a ranked report (also env PYMODULE_STARTUP_REPORT=1)"
+    )
+    general_group.add_argument(
+        PROFILE_OPTION,
+        dest='memory_profile',
+        action='store_true',
+        default=False,
+        help="Trace allocations and print per-phase memory growth, top allocation sites and peak RSS at exit (also env PYMODULE_MEMORY_PROFILE=1)"
+    )
+    general_group.add_argument(
+        DUMP_OPTION,
+        dest='memory_profile_dump',
+        type=str,
+        metavar='DIR',
+        help=f"With {PROFILE_OPTION}: also write the tracemalloc snapshots of every phase to DIR"
+    )
 
     # -------------------
     # Logging options
@@ -332,18 +447,30 @@ def parse_args() -> argparse.Namespace:
     param_group = parser.add_argument_group("Parameters")
     param_group.add_argument('--param1', dest='param1', type=int, help="Parameter1")
     param_group.add_argument('--param2', dest='param2', type=int, help="Parameter2")
+    param_group.add_argument('--workers', dest='workers', type=_int_at_least(0), help="Worker processes for input file processing, 0 = one per CPU, 1 = serial")
+    param_group.add_argument('--chunk-size', dest='chunk_size', type=_int_at_least(1), help="Bytes per chunk for input file processing")
+    concurrent_group = param_group.add_mutually_exclusive_group()
+    concurrent_group.add_argument('--concurrent', action='store_const', const=True, dest='concurrent', help="Run the application steps concurrently (asyncio runner)")
+    concurrent_group.add_argument('--no-concurrent', action='store_const', const=False, dest='concurrent', help="Run the application steps one after another")
+    param_group.add_argument('--timeout', dest='timeout', type=float, help="Time limit in seconds for the concurrent runner, 0 = none")
+    param_group.add_argument('--metrics-file', dest='metrics_file', type=str, help="Write metrics to this file at exit: JSON for *.json, otherwise Prometheus text format")
+    param_group.add_argument('--metrics-interval', dest='metrics_interval', type=float, help="Also write the metrics file every N seconds, 0 = only at exit")
+    param_group.add_argument('--benchmark', action='append', dest='extra_benchmarks', metavar='NAME', help="Also run an opt-in benchmark, repeatable: codec, call_overhead, reduction, metrics_overhead, scheduler, scaling, subinterpreter_scaling or all")
+    param_group.add_argument('--benchmark-sweep', action='store_const', const=True, dest='benchmark_sweep', help="Also sweep the benchmark backends over input sizes and log their fitted cost models")
+    param_group.add_argument('--benchmark-sweep-csv', dest='benchmark_sweep_csv', type=str, help="Write the benchmark sweep measurements to this CSV file (implies --benchmark-sweep)")
 
     positional_group = parser.add_argument_group("Parameters")
     positional_group.add_argument('input_file', type=str, nargs="?", help="Input file")
     positional_group.add_argument('output_file', type=str, nargs="?", help="Output file")
 
-    return parser.parse_args()
+    return parser
 
-def get_app_configuration() -> Config:
+def get_app_configuration(argv: Optional[List[str]] = None, env: Optional[Mapping[str, str]] = None) -> Config:
     """Get the application configuration.
 
     This function initializes the Config class, loads the configuration file,
     applies environment variable overrides, and returns the final configuration.
+    `argv` and `env` default to the ones of the current process.
 
     Returns:
         ConfigDict: The final application configuration.
@@ -353,7 +480,7 @@ def get_app_configuration() -> Config:
     config_instance = Config()
 
     # Step 2: Parse command-line arguments
-    args = parse_args()
+    args = parse_args(argv)
     if args.version_option:
         # If version option is requested, skip loading other configurations
         config_instance.config['logging']['version_option'] = True
@@ -362,17 +489,20 @@ def get_app_configuration() -> Config:
     # Step 3: Try to load configuration from configuration file
     config_file = args.config
     try:
-        config_instance.load_config_file(config_file)
+        with startup_phase("load_config_file"):
+            config_instance.load_config_file(config_file)
     except Exception as e:
         raise e
 
     # Step 4: Load config from environment variables (if set)
     try:
-        config_instance.load_config_env()
+        with startup_phase("load_config_env"):
+            config_instance.load_config_env(env)
     except Exception as e:
         raise e
 
     # Step 5: Merge default config, config.json, and command-line arguments
-    config_instance.merge_cli_options(args)
+    with startup_phase("merge_cli_options"):
+        config_instance.merge_cli_options(args)
 
     return config_instance
@@ -0,0 +1,256 @@
+# core/file_pipeline.py
+
+import io
+import mmap
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import BinaryIO, Callable, Deque, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from pymodule.core.metrics import REGISTRY
+from pymodule.logger import get_app_logger
+
+logger = get_app_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1 << 20        # bytes read per chunk
+DEFAULT_WRITE_BUFFER = 1 << 20      # bytes collected before one bulk write
+MMAP_THRESHOLD = 64 << 20           # input files at least this large are memory-mapped
+RECORD_SEPARATOR = b"\n"
+
+# A stage maps one record to a new record, or to None to drop it
+Stage = Callable[[bytes], Optional[bytes]]
+
+class PipelineStats(NamedTuple):
+    records_in: int
+    records_out: int
+    bytes_in: int
+    bytes_out: int
+
+def process_record(record: bytes) -> Optional[bytes]:
+    """Default processing stage. Add real record processing here."""
+    return record
+
+def read_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, mmap_threshold: int = MMAP_THRESHOLD) -> Iterator[bytes]:
+    """Yield the file content in chunks of at most `chunk_size` bytes.
+
+    Large files are memory-mapped and sliced, so the kernel does read-ahead and
+    no more than one chunk is copied into Python memory at a time.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size and size >= mmap_threshold:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, "madvise"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                for offset in range(0, size, chunk_size):
+                    yield mm[offset:offset + chunk_size]
+        else:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+def split_records(chunks: Iterable[bytes], separator: bytes = RECORD_SEPARATOR) -> Iterator[bytes]:
+    """Re-assemble records (terminator included) from arbitrary chunk boundaries.
+
+    The pieces of a record spanning several chunks are joined once, when its end is found.
+    """
+    step = len(separator)
+    overlap = step - 1
+    pieces: List[bytes] = []    # unterminated record so far, without `tail`
+    tail = b""                  # its last `overlap` bytes: a separator may straddle two chunks
+    for chunk in chunks:
+        data = tail + chunk if tail else chunk
+        start = 0
+        while True:
+            end = data.find(separator, start)
+            if end < 0:
+                break
+            record = data[start:end + step]
+            if pieces:
+                pieces.append(record)
+                record = b"".join(pieces)
+                pieces = []
+            yield record
+            start = end + step
+        rest = data[start:]
+        split = max(len(rest) - overlap, 0)
+        if split:
+            pieces.append(rest[:split])
+        tail = rest[split:]
+    if pieces or tail:
+        pieces.append(tail)
+        yield b"".join(pieces)
+
+def run_stages(records: Iterable[bytes], stages: Sequence[Stage]) -> Iterator[bytes]:
+    """Lazily push every record through the stages; a stage returning None drops the record."""
+    for record in records:
+        result: Optional[bytes] = record
+        for stage in stages:
+            if result is None:
+                break
+            result = stage(result)
+        if result is not None:
+            yield result
+
+def check_distinct_paths(input_file: str, output_file: str) -> None:
+    """Reject an output that is the input file: opening it for writing would truncate the input."""
+    same = os.path.samefile(input_file, output_file) if os.path.exists(output_file) and os.path.exists(input_file) \
+        else os.path.realpath(input_file) == os.path.realpath(output_file)
+    if same:
+        raise ValueError(f"Output file '{output_file}' is the input file '{input_file}'")
+
+class BufferedBulkWriter:
+    """Collects small writes and hands them to the file in large, single writes."""
+
+    def __init__(self, file: BinaryIO, buffer_size: int = DEFAULT_WRITE_BUFFER) -> None:
+        self.file = file
+        self.buffer_size = buffer_size
+        self._parts: List[bytes] = []
+        self._size = 0
+        self.bytes_written = 0
+
+    def write(self, data: bytes) -> None:
+        self._parts.append(data)
+        self._size += len(data)
+        if self._size >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._parts:
+            self.file.write(b"".join(self._parts))
+            self.bytes_written += self._size
+            self._parts = []
+            self._size = 0
+
+def process_file(input_file: str, output_file: str, stages: Optional[Sequence[Stage]] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, mmap_threshold: int = MMAP_THRESHOLD) -> PipelineStats:
+    """Stream `input_file` record by record through `stages` into `output_file` in bounded memory."""
+    check_distinct_paths(input_file, output_file)
+    if stages is None:
+        stages = [process_record]
+    records_in = records_out = bytes_in = 0
+
+    def counted(records: Iterable[bytes]) -> Iterator[bytes]:
+        nonlocal records_in, bytes_in
+        for record in records:
+            records_in += 1
+            bytes_in += len(record)
+            yield record
+
+    with open(output_file, "wb") as f:
+        writer = BufferedBulkWriter(f, max(chunk_size, DEFAULT_WRITE_BUFFER))
+        for record in run_stages(counted(split_records(read_chunks(input_file, chunk_size, mmap_threshold))), stages):
+            writer.write(record)
+            records_out += 1
+        writer.flush()
+    return PipelineStats(records_in, records_out, bytes_in, writer.bytes_written)
+
+# ================================================================
+#  Parallel processing
+# ================================================================
+def record_ranges(path: str, range_size: int, separator: bytes = RECORD_SEPARATOR) -> List[Tuple[int, int]]:
+    """Split the file into byte ranges of about `range_size` that start and end on record boundaries."""
+    if range_size <= 0:
+        raise ValueError("range_size must be positive")
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return []
+        ranges = []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < size:
+                end = mm.find(separator, start + range_size - 1)
+                end = size if end < 0 else end + len(separator)
+                ranges.append((start, end))
+                start = end
+    return ranges
+
+def _process_range(input_file: str, start: int, end: int, stages: Sequence[Stage], chunk_size: int) -> Tuple[bytes, int, int, int]:
+    """Worker side: map the input, process records in [start, end) and return the output bytes."""
+    records_in = records_out = 0
+    out = io.BytesIO()
+    with open(input_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mm, "madvise"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        chunks = (mm[offset:min(offset + chunk_size, end)] for offset in range(start, end, chunk_size))
+
+        def counted(records: Iterable[bytes]) -> Iterator[bytes]:
+            nonlocal records_in
+            for record in records:
+                records_in += 1
+                yield record
+
+        for record in run_stages(counted(split_records(chunks)), stages):
+            out.write(record)
+            records_out += 1
+    return out.getvalue(), records_in, records_out, end - start
+
+def process_file_parallel(input_file: str, output_file: str, stages: Optional[Sequence[Stage]] = None,
+                          workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> PipelineStats:
+    """Process record-aligned ranges of `input_file` in a process pool, writing results in input order.
+
+    Workers map their own slice of the input, only the range bounds are sent to
+    them. Stages must be picklable (module level functions). At most two ranges
+    per worker are in flight, so memory stays bounded by the chunk size.
+    """
+    check_distinct_paths(input_file, output_file)
+    if stages is None:
+        stages = [process_record]
+    workers = workers or os.cpu_count() or 1
+    ranges = record_ranges(input_file, chunk_size)
+    records_in = records_out = bytes_in = 0
+    pending: Deque[Future[Tuple[bytes, int, int, int]]] = deque()
+    with open(output_file, "wb") as f, ProcessPoolExecutor(max_workers=workers) as pool:
+        writer = BufferedBulkWriter(f, max(chunk_size, DEFAULT_WRITE_BUFFER))
+        next_range = iter(ranges)
+
+        def submit() -> None:
+            for start, end in next_range:
+                pending.append(pool.submit(_process_range, input_file, start, end, stages, chunk_size))
+                if len(pending) >= 2 * workers:
+                    return
+
+        submit()
+        while pending:
+            data, range_in, range_out, range_bytes = pending.popleft().result()
+            submit()
+            writer.write(data)
+            records_in += range_in
+            records_out += range_out
+            bytes_in += range_bytes
+        writer.flush()
+    logger.debug("Processed %d ranges of %s with %d workers", len(ranges), input_file, workers)
+    return PipelineStats(records_in, records_out, bytes_in, writer.bytes_written)
+
+def run_file_pipeline(input_file: str, output_file: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      workers: int = 1) -> Optional[PipelineStats]:
+    """Application step driven by the input_file/output_file positionals.
+
+    `workers` > 1 selects the process pool, 0 uses one worker per CPU.
+    """
+    if not input_file:
+        return None
+    if not output_file:
+        logger.warning("No output file given, '%s' is not processed", input_file)
+        return None
+    if not os.path.isfile(input_file):
+        logger.warning("Input file '%s' does not exist, skipping file processing", input_file)
+        return None
+    if workers < 0:
+        raise ValueError(f"workers must be 0 (one per CPU) or more, got {workers}")
+    if workers == 1:
+        stats = process_file(input_file, output_file, chunk_size=chunk_size)
+    else:
+        stats = process_file_parallel(input_file, output_file, workers=workers or None, chunk_size=chunk_size)
+    REGISTRY.counter("pipeline_records_in_total", "Records read by the file pipeline").inc(stats.records_in)
+    REGISTRY.counter("pipeline_records_out_total", "Records written by the file pipeline").inc(stats.records_out)
+    REGISTRY.counter("pipeline_bytes_in_total", "Bytes read by the file pipeline").inc(stats.bytes_in)
+    REGISTRY.counter("pipeline_bytes_out_total", "Bytes written by the file pipeline").inc(stats.bytes_out)
+    logger.info("Processed %s -> %s: %d records in, %d records out, %d bytes in, %d bytes out",
+                input_file, output_file, stats.records_in, stats.records_out, stats.bytes_in, stats.bytes_out)
+    return stats
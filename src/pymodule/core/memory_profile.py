@@ -0,0 +1,143 @@
+# core/memory_profile.py
+
+# Memory diagnostics: `pymodule --memory-profile ...` (or PYMODULE_MEMORY_PROFILE=1) traces
+# allocations with tracemalloc, takes a snapshot around every phase of main/run_app and
+# prints the per-phase growth, the top allocation sites and the peak RSS at exit.
+# `--memory-profile-dump DIR` also writes the snapshots for offline diffing:
+#     tracemalloc.Snapshot.load(b).compare_to(tracemalloc.Snapshot.load(a), "lineno")
+
+import argparse
+import contextlib
+import os
+import sys
+import tracemalloc
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+if sys.platform != "win32":
+    import resource
+
+PROFILE_OPTION = "--memory-profile"
+DUMP_OPTION = "--memory-profile-dump"
+PROFILE_ENV = "PYMODULE_MEMORY_PROFILE"
+TRACE_FRAMES = 1
+TOP_SITES = 10
+
+class PhaseMemory(NamedTuple):
+    name: str
+    depth: int                          # nesting level, 0 = outermost phase
+    before: int                         # traced bytes at the start of the phase
+    after: int                          # traced bytes at the end of the phase
+    peak: int                           # highest traced bytes during the phase
+    peak_rss: Optional[int]             # process peak RSS in bytes at the end of the phase
+    top: List[Tuple[str, int, int]]     # (site, size diff, count diff) of the largest growths
+
+class _Profile(NamedTuple):
+    phases: List[Optional[PhaseMemory]]     # in start order, None while a phase runs
+    open_peaks: List[int]                   # peak so far of every running phase, outermost first
+    dump_dir: Optional[str]
+    top: int
+
+_profile: Optional[_Profile] = None
+
+def memory_profile_options(argv: List[str]) -> Tuple[bool, Optional[str]]:
+    """(enabled, dump directory) from the command line or PYMODULE_MEMORY_PROFILE."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument(PROFILE_OPTION, action="store_true")
+    parser.add_argument(DUMP_OPTION, dest="dump_dir")
+    args, _ = parser.parse_known_args(argv)
+    enabled = args.memory_profile or args.dump_dir is not None or os.environ.get(PROFILE_ENV, "") not in ("", "0")
+    return enabled, args.dump_dir
+
+def peak_rss() -> Optional[int]:
+    """Peak resident set size of this process in bytes, None where not available."""
+    if sys.platform == "win32":
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == "darwin" else usage * 1024    # bytes on macOS, KiB elsewhere
+
+def enable_memory_profile(dump_dir: Optional[str] = None, top: int = TOP_SITES, frames: int = TRACE_FRAMES) -> None:
+    global _profile  # pylint: disable=global-statement
+    if dump_dir:
+        os.makedirs(dump_dir, exist_ok=True)
+    _profile = _Profile([], [], dump_dir, top)
+    tracemalloc.start(frames)
+
+def disable_memory_profile() -> None:
+    global _profile  # pylint: disable=global-statement
+    _profile = None
+    tracemalloc.stop()
+
+def _snapshot() -> tracemalloc.Snapshot:
+    """Snapshot without the allocations of tracemalloc and of the profiler itself."""
+    return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+                                                      tracemalloc.Filter(False, __file__)])
+
+def _site(trace: "tracemalloc.Traceback") -> str:
+    return f"{trace[0].filename}:{trace[0].lineno}"
+
+def _fold_peak(profile: _Profile, peak: int) -> None:
+    """tracemalloc has one peak counter: keep the peaks of running phases before it is reset."""
+    for level, open_peak in enumerate(profile.open_peaks):
+        profile.open_peaks[level] = max(open_peak, peak)
+
+@contextlib.contextmanager
+def memory_phase(name: str) -> Iterator[None]:
+    """Snapshot memory around the enclosed block; a no-op unless profiling is enabled.
+
+    Phases may be nested; the report lists them in start order.
+    """
+    profile = _profile
+    if profile is None:
+        yield
+        return
+    size_before, peak = tracemalloc.get_traced_memory()
+    _fold_peak(profile, peak)
+    before = _snapshot()
+    index = len(profile.phases)
+    depth = len(profile.open_peaks)
+    profile.phases.append(None)
+    profile.open_peaks.append(0)
+    tracemalloc.reset_peak()
+    try:
+        yield
+    finally:
+        size_after, peak = tracemalloc.get_traced_memory()
+        _fold_peak(profile, peak)
+        peak = profile.open_peaks.pop()
+        after = _snapshot()
+        top = [(_site(stat.traceback), stat.size_diff, stat.count_diff)
+               for stat in after.compare_to(before, "lineno")[:profile.top] if stat.size_diff]
+        profile.phases[index] = PhaseMemory(name, depth, size_before, size_after, peak, peak_rss(), top)
+        if profile.dump_dir:
+            before.dump(os.path.join(profile.dump_dir, f"{index + 1:02d}-{name}-before.tracemalloc"))
+            after.dump(os.path.join(profile.dump_dir, f"{index + 1:02d}-{name}-after.tracemalloc"))
+
+def recorded_phases() -> List[PhaseMemory]:
+    """Finished phases in start order."""
+    return [phase for phase in _profile.phases if phase is not None] if _profile else []
+
+def _mib(size: Optional[int]) -> str:
+    return "       n/a" if size is None else f"{size / (1 << 20):10.2f}"
+
+def format_memory_report(phases: List[PhaseMemory], top_sites: List[Tuple[str, int, int]]) -> str:
+    lines = ["Memory report (MiB):",
+             f"  {'delta':>10} {'after':>10} {'peak':>10} {'peak RSS':>10}  phase"]
+    for phase in phases:
+        lines.append(f"  {_mib(phase.after - phase.before)} {_mib(phase.after)} {_mib(phase.peak)} {_mib(phase.peak_rss)}  "
+                     f"{'  ' * phase.depth}{phase.name}")
+    lines.append(f"Peak RSS: {_mib(peak_rss()).strip()} MiB")
+    lines.append("Largest live allocation sites:")
+    lines += [f"  {size / 1024.0:10.1f} KiB {count:8d} blocks  {site}" for site, size, count in top_sites]
+    for phase in phases:
+        if phase.top:
+            lines.append(f"Growth in phase {phase.name}:")
+            lines += [f"  {size / 1024.0:+10.1f} KiB {count:+8d} blocks  {site}" for site, size, count in phase.top]
+    return "\n".join(lines)
+
+def memory_report() -> str:
+    """Report of the recorded phases and the current largest allocation sites."""
+    top = _profile.top if _profile else TOP_SITES
+    sites: List[Tuple[str, int, int]] = []
+    if tracemalloc.is_tracing():
+        sites = [(_site(stat.traceback), stat.size, stat.count) for stat in _snapshot().statistics("lineno")[:top]]
+    return format_memory_report(recorded_phases(), sites)
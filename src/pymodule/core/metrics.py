@@ -0,0 +1,322 @@
+# core/metrics.py
+
+# In-process metrics: counters, gauges and fixed-bucket histograms, exported as a
+# Prometheus text format file or as JSON. Counters and histograms are updated in
+# per-thread cells, so writers never take a lock; readers add the cells up.
+
+import atexit
+import functools
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from types import TracebackType
+from typing import Any, Callable, Dict, List, Optional, Sequence, Type, TypeVar, Union
+
+from pymodule.logger import get_app_logger
+
+logger = get_app_logger(__name__)
+
+# seconds, suited to function latencies from 100 us to a minute
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+NAMESPACE = "pymodule"
+
+_NAME_RE = re.compile(r"^[a-zA-Z_:][a-zA-Z0-9_:]*$")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+class _CellOwner:
+    """Lives in one thread's `local`; when the thread ends it is dropped and its cell folded."""
+
+class _Cells:
+    """A list of `size` numbers per thread; each thread only writes its own list.
+
+    Hot paths read `local.cell` directly and call `mine()` only on AttributeError.
+    The cell of a finished thread is added to `_base` and forgotten, so threads
+    that come and go do not grow the list.
+    """
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self.local = threading.local()
+        self._cells: Dict[int, List[float]] = {}
+        self._base = [0.0] * size
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def mine(self) -> List[float]:
+        cell = [0.0] * self._size
+        with self._lock:
+            key = self._next
+            self._next += 1
+            self._cells[key] = cell
+        owner = _CellOwner()
+        weakref.finalize(owner, self._fold, key).atexit = False
+        self.local.owner = owner
+        self.local.cell = cell
+        return cell
+
+    def _fold(self, key: int) -> None:
+        with self._lock:
+            cell = self._cells.pop(key)
+            self._base = [math.fsum(pair) for pair in zip(self._base, cell)]
+
+    def totals(self) -> List[float]:
+        with self._lock:
+            cells = [self._base, *self._cells.values()]
+        return [math.fsum(column) for column in zip(*cells)]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._base = [0.0] * self._size
+            for cell in self._cells.values():
+                cell[:] = [0.0] * self._size
+
+class Counter:
+    """Monotonically increasing value, e.g. processed records."""
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str = "") -> None:
+        self.name = name
+        self.help = help_text
+        self._cells = _Cells(1)
+        self._local = self._cells.local
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError(f"Counter '{self.name}' cannot decrease")
+        try:
+            self._local.cell[0] += amount
+        except AttributeError:
+            self._cells.mine()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._cells.totals()[0]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"type": self.kind, "help": self.help, "value": self.value}
+
+    def reset(self) -> None:
+        self._cells.reset()
+
+class Gauge:
+    """Value that goes up and down, e.g. queue depth; the last `set` wins."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str = "") -> None:
+        self.name = name
+        self.help = help_text
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"type": self.kind, "help": self.help, "value": self._value}
+
+    def reset(self) -> None:
+        self._value = 0.0
+
+class _Timer:
+    """Context manager observing the time spent in its block."""
+
+    def __init__(self, histogram: "Histogram") -> None:
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        self.histogram.observe(time.perf_counter() - self.start)
+
+class Histogram:
+    """Distribution of observed values over fixed buckets, e.g. latencies in seconds."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str = "", buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        if list(buckets) != sorted(set(buckets)) or not buckets:
+            raise ValueError(f"Histogram '{name}': buckets must be unique and ascending")
+        self.name = name
+        self.help = help_text
+        self.bounds = tuple(float(bound) for bound in buckets)
+        # one count per bucket, one for +Inf, then the sum of the values
+        self._cells = _Cells(len(self.bounds) + 2)
+        self._local = self._cells.local
+
+    def observe(self, value: float) -> None:
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._cells.mine()
+        cell[bisect_left(self.bounds, value)] += 1
+        cell[-1] += value
+
+    def time(self) -> _Timer:
+        """`with histogram.time(): ...` observes the run time of the block."""
+        return _Timer(self)
+
+    def snapshot(self) -> Dict[str, Any]:
+        totals = self._cells.totals()
+        cumulative = 0.0
+        buckets = {}
+        for bound, count in zip([*self.bounds, math.inf], totals):
+            cumulative += count
+            buckets["+Inf" if bound == math.inf else repr(bound)] = int(cumulative)
+        return {"type": self.kind, "help": self.help, "buckets": buckets, "count": int(cumulative), "sum": totals[-1]}
+
+    def reset(self) -> None:
+        self._cells.reset()
+
+Metric = Union[Counter, Gauge, Histogram]
+
+class MetricsRegistry:
+    """Named metrics of one process; `counter`, `gauge` and `histogram` create or return them."""
+
+    def __init__(self, namespace: str = NAMESPACE) -> None:
+        self.namespace = namespace
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls: Type[Any], name: str, *args: Any) -> Any:
+        metric = self._metrics.get(name)
+        if metric is None:
+            if not _NAME_RE.match(name):
+                raise ValueError(f"Invalid metric name '{name}'")
+            with self._lock:
+                metric = self._metrics.setdefault(name, cls(name, *args))
+        if not isinstance(metric, cls):
+            raise ValueError(f"Metric '{name}' is a {metric.kind}, not a {cls.kind}")
+        return metric
+
+    def counter(self, name: str, help_text: str = "") -> Counter:
+        return self._get(Counter, name, help_text)   # type: ignore[no-any-return]
+
+    def gauge(self, name: str, help_text: str = "") -> Gauge:
+        return self._get(Gauge, name, help_text)     # type: ignore[no-any-return]
+
+    def histogram(self, name: str, help_text: str = "", buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help_text, buckets)    # type: ignore[no-any-return]
+
+    def reset(self) -> None:
+        """Zero all metrics, keeping them registered."""
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: metric.snapshot() for name, metric in sorted(self._metrics.items())}
+
+    def to_json(self) -> str:
+        return json.dumps({"namespace": self.namespace, "timestamp": time.time(), "metrics": self.snapshot()}, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format."""
+        lines = []
+        for name, data in self.snapshot().items():
+            full_name = f"{self.namespace}_{name}" if self.namespace else name
+            if data["help"]:
+                lines.append(f"# HELP {full_name} {data['help']}")
+            lines.append(f"# TYPE {full_name} {data['type']}")
+            if data["type"] == Histogram.kind:
+                for bound, count in data["buckets"].items():
+                    lines.append(f'{full_name}_bucket{{le="{bound}"}} {count}')
+                lines.append(f"{full_name}_sum {data['sum']!r}")
+                lines.append(f"{full_name}_count {data['count']}")
+            else:
+                lines.append(f"{full_name} {data['value']!r}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Write a snapshot to `path`: JSON for *.json, otherwise Prometheus text format.
+
+        The file is replaced atomically, so scrapers never read a partial file.
+        """
+        text = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".metrics-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+REGISTRY = MetricsRegistry()
+
+def timed(name: str, help_text: str = "", registry: Optional[MetricsRegistry] = None) -> Callable[[F], F]:
+    """Decorator observing the run time of every call, in seconds, in the histogram `name`."""
+    def decorate(func: F) -> F:
+        histogram = (registry or REGISTRY).histogram(name, help_text or f"Run time of {func.__qualname__} in seconds")
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+        return wrapper  # type: ignore[return-value]
+    return decorate
+
+def time_block(name: str, registry: Optional[MetricsRegistry] = None) -> _Timer:
+    """`with time_block("x_seconds"): ...` observes the run time of the block in the histogram `name`."""
+    return (registry or REGISTRY).histogram(name).time()
+
+class MetricsExporter:
+    """Writes registry snapshots to `path` every `interval` seconds (0 = never) and at exit."""
+
+    def __init__(self, path: str, interval: float = 0.0, registry: Optional[MetricsRegistry] = None) -> None:
+        self.path = path
+        self.interval = interval
+        self.registry = registry or REGISTRY
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _write(self) -> None:
+        try:
+            self.registry.write(self.path)
+        except OSError as e:
+            logger.warning("Cannot write metrics to '%s': %s", self.path, e)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self._write()
+
+    def start(self) -> "MetricsExporter":
+        atexit.register(self.stop)
+        if self.interval > 0:
+            self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the periodic writes and write the final snapshot."""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        atexit.unregister(self.stop)
+        if self._thread is not None:
+            self._thread.join()
+        self._write()
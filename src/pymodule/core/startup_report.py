@@ -0,0 +1,134 @@
+# core/startup_report.py
+
+# Startup diagnostics: `pymodule --startup-report ...` (or PYMODULE_STARTUP_REPORT=1) re-runs
+# the command in a child interpreter started with `-X importtime`, collects the import
+# timings and the phase timings reported by the child and prints a ranked breakdown.
+
+import contextlib
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+REPORT_OPTION = "--startup-report"
+REPORT_ENV = "PYMODULE_STARTUP_REPORT"
+CHILD_ENV = "PYMODULE_STARTUP_REPORT_CHILD"
+PHASE_PREFIX = "pymodule startup phase: "
+IMPORTTIME_PREFIX = "import time:"
+TOP_IMPORTS = 15
+
+class ImportTiming(NamedTuple):
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+class PhaseTiming(NamedTuple):
+    name: str
+    elapsed_us: int
+
+# ================================================================
+#  Phase recording (child side)
+# ================================================================
+_phases: Optional[List[PhaseTiming]] = None
+
+def enable_phase_recording() -> None:
+    global _phases  # pylint: disable=global-statement
+    _phases = []
+
+@contextlib.contextmanager
+def startup_phase(name: str) -> Iterator[None]:
+    """Time the enclosed block as a startup phase; a no-op unless recording is enabled."""
+    if _phases is None:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        _phases.append(PhaseTiming(name, (time.perf_counter_ns() - start) // 1000))
+
+def emit_phases() -> None:
+    """Write the recorded phases to stderr, where the parent collects them."""
+    for phase in _phases or []:
+        sys.stderr.write(f"{PHASE_PREFIX}{phase.name} | {phase.elapsed_us}\n")
+    sys.stderr.flush()
+
+# ================================================================
+#  Parsing and report (parent side)
+# ================================================================
+def startup_report_requested(argv: List[str]) -> bool:
+    if os.environ.get(CHILD_ENV):
+        return False
+    return REPORT_OPTION in argv or os.environ.get(REPORT_ENV, "") not in ("", "0")
+
+def parse_importtime(lines: Iterable[str]) -> List[ImportTiming]:
+    """Parse `-X importtime` lines: 'import time: self [us] | cumulative | imported package'."""
+    imports = []
+    for line in lines:
+        if not line.startswith(IMPORTTIME_PREFIX):
+            continue
+        fields = line[len(IMPORTTIME_PREFIX):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue    # header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        imports.append(ImportTiming(stripped, int(fields[0]), int(fields[1]), (len(name) - len(stripped) - 1) // 2))
+    return imports
+
+def parse_phases(lines: Iterable[str]) -> List[PhaseTiming]:
+    phases = []
+    for line in lines:
+        if line.startswith(PHASE_PREFIX):
+            name, _, elapsed = line[len(PHASE_PREFIX):].rpartition("|")
+            phases.append(PhaseTiming(name.strip(), int(elapsed)))
+    return phases
+
+def group_imports(imports: Iterable[ImportTiming]) -> List[Tuple[str, int]]:
+    """Self time per top-level package, largest first.
+
+    pymodule is split by subpackage and pymodule.extensions by extension.
+    """
+    groups: Dict[str, int] = {}
+    for timing in imports:
+        parts = timing.name.split(".")
+        depth = 1 if parts[0] != "pymodule" else 3 if parts[1:2] == ["extensions"] else 2
+        key = ".".join(parts[:depth])
+        groups[key] = groups.get(key, 0) + timing.self_us
+    return sorted(groups.items(), key=lambda item: item[1], reverse=True)
+
+def format_report(imports: List[ImportTiming], phases: List[PhaseTiming], total_us: int, top: int = TOP_IMPORTS) -> str:
+    import_us = sum(timing.self_us for timing in imports)
+    phase_us = sum(phase.elapsed_us for phase in phases)
+    rows = [(f"imports ({len(imports)} modules)", import_us)] + [(f"phase {phase.name}", phase.elapsed_us) for phase in phases]
+    rows.append(("other (interpreter, exit)", max(total_us - import_us - phase_us, 0)))
+
+    def table(title: str, entries: Iterable[Tuple[str, int]]) -> List[str]:
+        out = [title]
+        for name, usec in entries:
+            share = 100.0 * usec / total_us if total_us else 0.0
+            out.append(f"  {usec / 1000.0:10.2f} ms {share:6.1f}%  {name}")
+        return out
+
+    lines = [f"Startup report: {total_us / 1000.0:.2f} ms total"]
+    lines += table("Breakdown:", sorted(rows, key=lambda row: row[1], reverse=True))
+    lines += table("Imports by package (self time):", group_imports(imports)[:top])
+    lines += table(f"Slowest {top} imports (self time):",
+                   [(timing.name, timing.self_us) for timing in sorted(imports, key=lambda t: t.self_us, reverse=True)[:top]])
+    return "\n".join(lines)
+
+def run_with_report(argv: List[str]) -> int:
+    """Run `pymodule argv` in a child interpreter with -X importtime and print the report."""
+    env = dict(os.environ, **{CHILD_ENV: "1"})
+    command = [sys.executable, "-X", "importtime", "-m", "pymodule.cli.app", *argv]
+    start = time.perf_counter_ns()
+    child = subprocess.run(command, env=env, stderr=subprocess.PIPE, text=True, check=False)
+    total_us = (time.perf_counter_ns() - start) // 1000
+
+    lines = child.stderr.splitlines()
+    for line in lines:
+        if not line.startswith((IMPORTTIME_PREFIX, PHASE_PREFIX)):
+            sys.stderr.write(line + "\n")
+    print(format_report(parse_importtime(lines), parse_phases(lines), total_us))
+    return child.returncode
@@ -1,5 +1,16 @@
 # drivers/__init__.py
 
-from .ina236 import hello_from_ina236
+from .ina236 import hello_from_ina236, INA236, INA236Sample, INA236RawSample, LinuxI2CBus, SimulatedI2CBus
+from .ina236_async import AsyncI2CBus, AsyncINA236, AsyncINA236Poller
+from .ina236_native import NativeSampler, decode_records
+from .ina236_alert import AlertDrivenAcquisition, GpioAlertLine, SimulatedAlertPin
+from .ina236_capture import CaptureWriter, CaptureReader, CaptureReplay, device_metadata
+from .ina236_compress import CompressedCaptureWriter, CompressedCaptureReader, compress_capture
+from .ina236_stats import RunningStats, EnergyIntegrator, RailStatistics, TumblingWindowAggregator, SlidingWindowAggregator, WindowSummary, tumbling_windows
 
-__all__ = ["hello_from_ina236"]
+__all__ = ["hello_from_ina236", "INA236", "INA236Sample", "INA236RawSample", "LinuxI2CBus", "SimulatedI2CBus",
+           "AsyncI2CBus", "AsyncINA236", "AsyncINA236Poller", "NativeSampler", "decode_records",
+           "RunningStats", "EnergyIntegrator", "RailStatistics", "TumblingWindowAggregator", "SlidingWindowAggregator", "WindowSummary",
+           "tumbling_windows", "CaptureWriter", "CaptureReader", "CaptureReplay", "device_metadata",
+           "AlertDrivenAcquisition", "GpioAlertLine", "SimulatedAlertPin",
+           "CompressedCaptureWriter", "CompressedCaptureReader", "compress_capture"]
@@ -1,8 +1,317 @@
 # drivers/ina236.py
 
+import os
+import time
+import threading
+from typing import Dict, NamedTuple, Optional, Protocol
+
 from pymodule.logger import get_app_logger
 
 logger = get_app_logger(__name__)
 
+# ================================================================
+#  INA236 register map and constants
+# ================================================================
+INA236_DEFAULT_ADDRESS = 0x40
+
+REG_CONFIGURATION = 0x00
+REG_SHUNT_VOLTAGE = 0x01
+REG_BUS_VOLTAGE = 0x02
+REG_POWER = 0x03
+REG_CURRENT = 0x04
+REG_CALIBRATION = 0x05
+REG_MASK_ENABLE = 0x06
+REG_ALERT_LIMIT = 0x07
+REG_MANUFACTURER_ID = 0x3E
+REG_DEVICE_ID = 0x3F
+
+MANUFACTURER_ID = 0x5449    # "TI"
+DEVICE_ID = 0xA08           # bits 15..4 of REG_DEVICE_ID
+
+CONFIG_RESET = 0x8000
+CONFIG_DEFAULT = 0x4127
+CONFIG_ADCRANGE = 0x1000
+
+# Mask/Enable register bits
+MASK_CNVR = 0x0400          # assert ALERT on conversion ready
+MASK_CVRF = 0x0008          # conversion ready flag
+
+# Operating modes (bits 2..0 of the configuration register)
+MODE_SHUTDOWN = 0x0
+MODE_SHUNT_TRIGGERED = 0x1
+MODE_BUS_TRIGGERED = 0x2
+MODE_BOTH_TRIGGERED = 0x3
+MODE_SHUNT_CONTINUOUS = 0x5
+MODE_BUS_CONTINUOUS = 0x6
+MODE_BOTH_CONTINUOUS = 0x7
+
+# Averaging (bits 11..9) and conversion time (bits 8..6 and 5..3) codes
+AVERAGES = (1, 4, 16, 64, 128, 256, 512, 1024)
+CONVERSION_TIMES_US = (140, 204, 332, 588, 1100, 2116, 4156, 8244)
+
+SHUNT_LSB = (2.5e-6, 625e-9)    # volts per bit for ADCRANGE = 0 / 1
+BUS_LSB = 1.6e-3                # volts per bit
+POWER_LSB_FACTOR = 32           # power LSB = 32 * current LSB
+CALIBRATION_CONSTANT = 0.00512
+
 def hello_from_ina236() -> None:
     logger.info("Hello from ina236")
+
+def to_signed16(value: int) -> int:
+    """Interpret a 16 bit register value as two's complement."""
+    return value - 0x10000 if value & 0x8000 else value
+
+# ================================================================
+#  I2C bus abstraction
+# ================================================================
+class I2CBus(Protocol):
+    """Minimal register-level I2C bus interface used by the driver.
+
+    Registers of the INA236 are 16 bit wide and transferred MSB first;
+    implementations return and accept the already decoded integer value.
+    """
+
+    def read_register(self, address: int, register: int) -> int: ...
+
+    def write_register(self, address: int, register: int, value: int) -> None: ...
+
+class LinuxI2CBus:
+    """I2C bus backed by the Linux i2c-dev character device (/dev/i2c-N)."""
+
+    I2C_SLAVE = 0x0703
+
+    def __init__(self, bus_number: int) -> None:
+        self.bus_number = bus_number
+        self.fd = os.open(f"/dev/i2c-{bus_number}", os.O_RDWR)
+        self._address = -1
+
+    def _select(self, address: int) -> None:
+        import fcntl  # pylint: disable=import-outside-toplevel
+        if address != self._address:
+            fcntl.ioctl(self.fd, self.I2C_SLAVE, address)
+            self._address = address
+
+    def read_register(self, address: int, register: int) -> int:
+        self._select(address)
+        os.write(self.fd, bytes([register]))
+        data = os.read(self.fd, 2)
+        return (data[0] << 8) | data[1]
+
+    def write_register(self, address: int, register: int, value: int) -> None:
+        self._select(address)
+        os.write(self.fd, bytes([register, (value >> 8) & 0xFF, value & 0xFF]))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+class SimulatedINA236:
+    """Register file of one simulated INA236 device."""
+
+    def __init__(self) -> None:
+        self.registers: Dict[int, int] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        self.registers = {
+            REG_CONFIGURATION: CONFIG_DEFAULT,
+            REG_SHUNT_VOLTAGE: 0,
+            REG_BUS_VOLTAGE: 0,
+            REG_POWER: 0,
+            REG_CURRENT: 0,
+            REG_CALIBRATION: 0,
+            REG_MASK_ENABLE: 0,
+            REG_ALERT_LIMIT: 0,
+            REG_MANUFACTURER_ID: MANUFACTURER_ID,
+            REG_DEVICE_ID: (DEVICE_ID << 4) | 0x1,
+        }
+
+    def set_raw(self, shunt: int, bus: int, current: Optional[int] = None, power: Optional[int] = None) -> None:
+        """Load a conversion result; current and power are derived the way the device does unless given."""
+        if current is None:
+            current = int(shunt * self.registers[REG_CALIBRATION] / 2048)
+            current = max(-0x8000, min(0x7FFF, current))
+        if power is None:
+            power = min(0xFFFF, abs(current) * bus // 20000)
+        self.registers[REG_SHUNT_VOLTAGE] = shunt & 0xFFFF
+        self.registers[REG_BUS_VOLTAGE] = bus & 0x7FFF
+        self.registers[REG_CURRENT] = current & 0xFFFF
+        self.registers[REG_POWER] = power
+        self.registers[REG_MASK_ENABLE] |= MASK_CVRF
+
+    def set_measurement(self, shunt_voltage: float, bus_voltage: float) -> None:
+        """Load a conversion result given in volts."""
+        shunt_lsb = SHUNT_LSB[1 if self.registers[REG_CONFIGURATION] & CONFIG_ADCRANGE else 0]
+        shunt = max(-0x8000, min(0x7FFF, round(shunt_voltage / shunt_lsb)))
+        self.set_raw(shunt, max(0, min(0x7FFF, round(bus_voltage / BUS_LSB))))
+
+    def read(self, register: int) -> int:
+        if register not in self.registers:
+            raise OSError(f"INA236: invalid register 0x{register:02X}")
+        value = self.registers[register]
+        if register == REG_MASK_ENABLE:
+            # reading Mask/Enable clears the conversion ready flag
+            self.registers[REG_MASK_ENABLE] &= ~MASK_CVRF
+        return value
+
+    def write(self, register: int, value: int) -> None:
+        if register == REG_CONFIGURATION and value & CONFIG_RESET:
+            self.reset()
+            return
+        if register in (REG_SHUNT_VOLTAGE, REG_BUS_VOLTAGE, REG_POWER, REG_CURRENT, REG_MANUFACTURER_ID, REG_DEVICE_ID):
+            raise OSError(f"INA236: register 0x{register:02X} is read-only")
+        if register not in self.registers:
+            raise OSError(f"INA236: invalid register 0x{register:02X}")
+        self.registers[register] = value & 0xFFFF
+
+class SimulatedI2CBus:
+    """In-memory I2C bus with INA236 devices and configurable artificial latency.
+
+    Each register transaction sleeps for `latency` seconds (in the calling thread)
+    to imitate bus transfer time.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.devices: Dict[int, SimulatedINA236] = {}
+        self.transactions = 0
+        self._lock = threading.Lock()
+
+    def add_device(self, address: int = INA236_DEFAULT_ADDRESS) -> SimulatedINA236:
+        device = SimulatedINA236()
+        self.devices[address] = device
+        return device
+
+    def _device(self, address: int) -> SimulatedINA236:
+        try:
+            return self.devices[address]
+        except KeyError as e:
+            raise OSError(f"I2C: no device acknowledges address 0x{address:02X}") from e
+
+    def read_register(self, address: int, register: int) -> int:
+        with self._lock:
+            self.transactions += 1
+            if self.latency > 0:
+                time.sleep(self.latency)
+            return self._device(address).read(register)
+
+    def write_register(self, address: int, register: int, value: int) -> None:
+        with self._lock:
+            self.transactions += 1
+            if self.latency > 0:
+                time.sleep(self.latency)
+            self._device(address).write(register, value)
+
+    def set_raw(self, address: int, shunt: int, bus: int, current: Optional[int] = None, power: Optional[int] = None) -> None:
+        """Atomically load a conversion result into a device, without bus latency."""
+        with self._lock:
+            self._device(address).set_raw(shunt, bus, current, power)
+
+# ================================================================
+#  Samples
+# ================================================================
+class INA236RawSample(NamedTuple):
+    timestamp_ns: int   # time.monotonic_ns() at the end of the read
+    shunt: int          # signed shunt voltage register
+    bus: int            # bus voltage register
+    current: int        # signed current register
+    power: int          # power register
+
+class INA236Sample(NamedTuple):
+    timestamp: float    # seconds, monotonic clock
+    bus_voltage: float  # V
+    shunt_voltage: float    # V
+    current: float      # A
+    power: float        # W
+
+# ================================================================
+#  Driver
+# ================================================================
+class INA236:
+    """Driver for the TI INA236 current/power monitor."""
+
+    def __init__(self, bus: I2CBus, address: int = INA236_DEFAULT_ADDRESS, shunt_ohms: float = 0.01,
+                 max_expected_amps: float = 1.0, adc_range: int = 0) -> None:
+        if adc_range not in (0, 1):
+            raise ValueError(f"INA236: adc_range must be 0 or 1, got {adc_range}")
+        if shunt_ohms <= 0 or max_expected_amps <= 0:
+            raise ValueError("INA236: shunt_ohms and max_expected_amps must be positive")
+        self.bus = bus
+        self.address = address
+        self.shunt_ohms = shunt_ohms
+        self.adc_range = adc_range
+        self.current_lsb = max_expected_amps / 32768.0
+        self.power_lsb = self.current_lsb * POWER_LSB_FACTOR
+        self.shunt_lsb = SHUNT_LSB[adc_range]
+
+    def read_register(self, register: int) -> int:
+        return self.bus.read_register(self.address, register)
+
+    def write_register(self, register: int, value: int) -> None:
+        self.bus.write_register(self.address, register, value)
+
+    def reset(self) -> None:
+        self.write_register(REG_CONFIGURATION, CONFIG_RESET)
+
+    def check_id(self) -> bool:
+        """Return True if the device at `address` identifies itself as an INA236."""
+        manufacturer = self.read_register(REG_MANUFACTURER_ID)
+        device = self.read_register(REG_DEVICE_ID) >> 4
+        return manufacturer == MANUFACTURER_ID and device == DEVICE_ID
+
+    def configure(self, averages: int = 1, bus_conversion_us: int = 1100, shunt_conversion_us: int = 1100,
+                  mode: int = MODE_BOTH_CONTINUOUS) -> None:
+        """Write the configuration register; values must be ones listed in AVERAGES / CONVERSION_TIMES_US."""
+        try:
+            avg = AVERAGES.index(averages)
+            vbusct = CONVERSION_TIMES_US.index(bus_conversion_us)
+            vshct = CONVERSION_TIMES_US.index(shunt_conversion_us)
+        except ValueError as e:
+            raise ValueError(f"INA236: unsupported averaging or conversion time: {e}") from e
+        value = (self.adc_range << 12) | (avg << 9) | (vbusct << 6) | (vshct << 3) | (mode & 0x7)
+        self.write_register(REG_CONFIGURATION, value)
+
+    def calibration_value(self) -> int:
+        """SHUNT_CAL value for the shunt resistance and expected current range."""
+        calibration = int(CALIBRATION_CONSTANT / (self.current_lsb * self.shunt_ohms))
+        if self.adc_range:
+            calibration //= 4
+        return min(calibration, 0x7FFF)
+
+    def calibrate(self) -> int:
+        """Program the calibration register from shunt resistance and expected current range."""
+        calibration = self.calibration_value()
+        self.write_register(REG_CALIBRATION, calibration)
+        return calibration
+
+    def read_shunt_voltage(self) -> float:
+        return to_signed16(self.read_register(REG_SHUNT_VOLTAGE)) * self.shunt_lsb
+
+    def read_bus_voltage(self) -> float:
+        return self.read_register(REG_BUS_VOLTAGE) * BUS_LSB
+
+    def read_current(self) -> float:
+        return to_signed16(self.read_register(REG_CURRENT)) * self.current_lsb
+
+    def read_power(self) -> float:
+        return self.read_register(REG_POWER) * self.power_lsb
+
+    def read_raw(self) -> INA236RawSample:
+        """Read all measurement registers."""
+        shunt = to_signed16(self.read_register(REG_SHUNT_VOLTAGE))
+        bus = self.read_register(REG_BUS_VOLTAGE)
+        current = to_signed16(self.read_register(REG_CURRENT))
+        power = self.read_register(REG_POWER)
+        return INA236RawSample(time.monotonic_ns(), shunt, bus, current, power)
+
+    def convert(self, raw: INA236RawSample) -> INA236Sample:
+        """Convert a raw register sample into physical units."""
+        return INA236Sample(
+            raw.timestamp_ns / 1e9,
+            raw.bus * BUS_LSB,
+            raw.shunt * self.shunt_lsb,
+            raw.current * self.current_lsb,
+            raw.power * self.power_lsb,
+        )
+
+    def read_sample(self) -> INA236Sample:
+        return self.convert(self.read_raw())
@@ -0,0 +1,221 @@
+# drivers/ina236_alert.py
+
+import asyncio
+import os
+import selectors
+import struct
+from typing import AsyncIterator, Iterator, Optional, Protocol
+
+from pymodule.logger import get_app_logger
+from pymodule.drivers.ina236 import INA236, INA236_DEFAULT_ADDRESS, INA236RawSample, SimulatedI2CBus, \
+    MASK_CNVR, MASK_CVRF, REG_MASK_ENABLE
+from pymodule.drivers.ina236_async import AsyncI2CBus
+
+logger = get_app_logger(__name__)
+
+class AlertSource(Protocol):
+    """A file descriptor that becomes readable when the ALERT pin fires."""
+
+    def fileno(self) -> int: ...
+
+    def clear(self) -> int: ...
+
+    def close(self) -> None: ...
+
+# ================================================================
+#  Linux GPIO character device (uAPI v2 line requests, Linux 5.10+)
+# ================================================================
+GPIO_V2_LINE_FLAG_INPUT = 1 << 2
+GPIO_V2_LINE_FLAG_EDGE_RISING = 1 << 4
+GPIO_V2_LINE_FLAG_EDGE_FALLING = 1 << 5
+GPIO_V2_LINES_MAX = 64
+
+# struct gpio_v2_line_request { u32 offsets[64]; char consumer[32];
+#     struct gpio_v2_line_config { u64 flags; u32 num_attrs; u32 padding[5]; attrs[10] (240 bytes, unused) };
+#     u32 num_lines; u32 event_buffer_size; u32 padding[5]; s32 fd; }
+GPIO_V2_LINE_REQUEST = struct.Struct(f"={GPIO_V2_LINES_MAX}I32sQI5I240xII5Ii")
+# struct gpio_v2_line_event { u64 timestamp_ns; u32 id; u32 offset; u32 seqno; u32 line_seqno; u32 padding[6]; }
+GPIO_V2_LINE_EVENT = struct.Struct("=QIIII24x")
+# _IOWR(0xB4, 0x07, struct gpio_v2_line_request)
+GPIO_V2_GET_LINE_IOCTL = (3 << 30) | (GPIO_V2_LINE_REQUEST.size << 16) | (0xB4 << 8) | 0x07
+
+EDGES = {
+    "rising": GPIO_V2_LINE_FLAG_EDGE_RISING,
+    "falling": GPIO_V2_LINE_FLAG_EDGE_FALLING,
+    "both": GPIO_V2_LINE_FLAG_EDGE_RISING | GPIO_V2_LINE_FLAG_EDGE_FALLING,
+}
+
+class GpioAlertLine:
+    """INA236 ALERT pin wired to a GPIO line, watched through /dev/gpiochipN edge events.
+
+    ALERT is open drain and active low, so the default is to wait for falling edges.
+    """
+
+    def __init__(self, chip: str = "/dev/gpiochip0", line: int = 0, edge: str = "falling", consumer: str = "ina236-alert") -> None:
+        import fcntl  # pylint: disable=import-outside-toplevel
+        if edge not in EDGES:
+            raise ValueError(f"Unknown edge '{edge}', expected one of {sorted(EDGES)}")
+        offsets = [line] + [0] * (GPIO_V2_LINES_MAX - 1)
+        request = bytearray(GPIO_V2_LINE_REQUEST.pack(*offsets, consumer.encode()[:31], GPIO_V2_LINE_FLAG_INPUT | EDGES[edge],
+                                                      0, *[0] * 5, 1, 0, *[0] * 5, 0))
+        chip_fd = os.open(chip, os.O_RDONLY)
+        try:
+            fcntl.ioctl(chip_fd, GPIO_V2_GET_LINE_IOCTL, request, True)
+        finally:
+            os.close(chip_fd)
+        self.fd: int = GPIO_V2_LINE_REQUEST.unpack(request)[-1]
+        os.set_blocking(self.fd, False)
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def clear(self) -> int:
+        """Consume pending edge events and return their number."""
+        events = 0
+        while True:
+            try:
+                data = os.read(self.fd, GPIO_V2_LINE_EVENT.size * 16)
+            except BlockingIOError:
+                return events
+            if not data:
+                return events
+            events += len(data) // GPIO_V2_LINE_EVENT.size
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+# ================================================================
+#  Simulated ALERT pin for tests
+# ================================================================
+class SimulatedAlertPin:
+    """eventfd backed stand-in for the ALERT line of a device on a SimulatedI2CBus.
+
+    `convert()` loads a conversion result into the simulated device and, if the
+    device has the conversion ready alert enabled, signals an edge. Falls back to
+    a pipe where eventfd is not available.
+    """
+
+    def __init__(self, bus: Optional[SimulatedI2CBus] = None, address: int = INA236_DEFAULT_ADDRESS) -> None:
+        self.bus = bus
+        self.address = address
+        self._write_fd = -1
+        if hasattr(os, "eventfd"):
+            self._fd = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+        else:
+            self._fd, self._write_fd = os.pipe()
+            os.set_blocking(self._fd, False)
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def trigger(self) -> None:
+        if self._write_fd < 0:
+            os.eventfd_write(self._fd, 1)
+        else:
+            os.write(self._write_fd, b"\x01")
+
+    def clear(self) -> int:
+        try:
+            if self._write_fd < 0:
+                return os.eventfd_read(self._fd)
+            return len(os.read(self._fd, 4096))
+        except BlockingIOError:
+            return 0
+
+    def convert(self, shunt: int, bus: int) -> None:
+        if self.bus is None:
+            raise RuntimeError("SimulatedAlertPin is not attached to a bus")
+        self.bus.set_raw(self.address, shunt, bus)
+        if self.bus.devices[self.address].registers[REG_MASK_ENABLE] & MASK_CNVR:
+            self.trigger()
+
+    def close(self) -> None:
+        os.close(self._fd)
+        if self._write_fd >= 0:
+            os.close(self._write_fd)
+
+# ================================================================
+#  Event driven acquisition
+# ================================================================
+class AlertDrivenAcquisition:
+    """Reads an INA236 only when its ALERT pin signals a completed conversion.
+
+    Instead of polling the conversion ready flag, the caller sleeps in
+    `selectors` (or the asyncio loop) on the alert file descriptor; an idle rail
+    costs no CPU and no bus traffic.
+    """
+
+    def __init__(self, device: INA236, pin: AlertSource) -> None:
+        self.device = device
+        self.pin = pin
+        self.wakeups = 0
+        self.spurious = 0
+
+    def enable(self) -> None:
+        """Route conversion ready to the ALERT pin and drop stale events."""
+        self.device.write_register(REG_MASK_ENABLE, MASK_CNVR)
+        self.device.read_register(REG_MASK_ENABLE)
+        self.pin.clear()
+
+    def disable(self) -> None:
+        self.device.write_register(REG_MASK_ENABLE, 0)
+
+    def _service(self) -> Optional[INA236RawSample]:
+        """Handle one wake-up: acknowledge the alert and read the result if it is ours."""
+        self.wakeups += 1
+        self.pin.clear()
+        # reading Mask/Enable releases ALERT and reports whether a conversion completed
+        if not self.device.read_register(REG_MASK_ENABLE) & MASK_CVRF:
+            self.spurious += 1
+            return None
+        return self.device.read_raw()
+
+    def wait_and_read(self, timeout: Optional[float] = None) -> Optional[INA236RawSample]:
+        """Block until the next alert and return the sample of its conversion.
+
+        :return: The sample, or None when the alert was spurious (no completed conversion)
+        :raises TimeoutError: If no alert arrives within `timeout` seconds
+        """
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.pin.fileno(), selectors.EVENT_READ)
+            if not selector.select(timeout):
+                raise TimeoutError(f"No INA236 alert within {timeout} s")
+        return self._service()
+
+    def samples(self, count: Optional[int] = None, timeout: Optional[float] = None) -> Iterator[INA236RawSample]:
+        """Yield `count` samples (or forever); stops early when no alert arrives within `timeout`."""
+        taken = 0
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.pin.fileno(), selectors.EVENT_READ)
+            while count is None or taken < count:
+                if not selector.select(timeout):
+                    logger.debug("INA236 alert: no conversion within %s s", timeout)
+                    return
+                sample = self._service()
+                if sample is not None:
+                    taken += 1
+                    yield sample
+
+    async def stream(self, count: Optional[int] = None, bus: Optional[AsyncI2CBus] = None) -> AsyncIterator[INA236RawSample]:
+        """asyncio variant of `samples()`; register reads go through `bus` when given."""
+        loop = asyncio.get_running_loop()
+        fd = self.pin.fileno()
+        ready = asyncio.Event()
+
+        def on_ready() -> None:
+            # the descriptor stays readable until serviced; stop watching it meanwhile
+            loop.remove_reader(fd)
+            ready.set()
+
+        try:
+            taken = 0
+            while count is None or taken < count:
+                ready.clear()
+                loop.add_reader(fd, on_ready)
+                await ready.wait()
+                sample = await bus.run(self._service) if bus is not None else self._service()
+                if sample is not None:
+                    taken += 1
+                    yield sample
+        finally:
+            loop.remove_reader(fd)
@@ -0,0 +1,131 @@
+# drivers/ina236_async.py
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Optional, TypeVar
+
+from pymodule.logger import get_app_logger
+from pymodule.drivers.ina236 import INA236, INA236_DEFAULT_ADDRESS, I2CBus, INA236RawSample, INA236Sample
+
+logger = get_app_logger(__name__)
+
+T = TypeVar("T")
+
+class AsyncI2CBus:
+    """Serializes access to one I2C bus from asyncio code.
+
+    Blocking bus transactions run in a dedicated single-thread executor, so the
+    event loop never blocks, and an asyncio lock keeps multi-register reads of one
+    device atomic with respect to other devices on the same bus. Different buses
+    have different executors and proceed concurrently.
+    """
+
+    def __init__(self, bus: I2CBus, name: str = "i2c") -> None:
+        self.bus = bus
+        self.name = name
+        self._lock = asyncio.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"ina236-{name}")
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking bus operation while holding the bus lock."""
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+class AsyncINA236:
+    """asyncio front end of one INA236 device on an AsyncI2CBus."""
+
+    def __init__(self, device: INA236, bus: AsyncI2CBus, name: str = "") -> None:
+        self.device = device
+        self.bus = bus
+        self.name = name or f"{bus.name}:0x{device.address:02X}"
+
+    async def setup(self, **configuration: Any) -> None:
+        """Configure and calibrate the device; keyword arguments go to INA236.configure()."""
+        await self.bus.run(self._setup, configuration)
+
+    def _setup(self, configuration: Dict[str, Any]) -> None:
+        self.device.configure(**configuration)
+        self.device.calibrate()
+
+    async def read_raw(self) -> INA236RawSample:
+        return await self.bus.run(self.device.read_raw)
+
+    async def read_sample(self) -> INA236Sample:
+        return self.device.convert(await self.read_raw())
+
+class AsyncINA236Poller:
+    """Polls many INA236 rails spread over several I2C buses concurrently.
+
+    Usage:
+        poller = AsyncINA236Poller()
+        poller.add_bus("bus1", LinuxI2CBus(1))
+        poller.add_device("vcore", "bus1", 0x40, shunt_ohms=0.005)
+        snapshot = await poller.snapshot()
+    """
+
+    def __init__(self) -> None:
+        self.buses: Dict[str, AsyncI2CBus] = {}
+        self.devices: Dict[str, AsyncINA236] = {}
+
+    def add_bus(self, name: str, bus: I2CBus) -> AsyncI2CBus:
+        if name in self.buses:
+            raise ValueError(f"Bus '{name}' is already registered")
+        async_bus = AsyncI2CBus(bus, name)
+        self.buses[name] = async_bus
+        return async_bus
+
+    def add_device(self, name: str, bus_name: str, address: int = INA236_DEFAULT_ADDRESS, **driver_options: Any) -> AsyncINA236:
+        """Register a rail; `driver_options` are passed to the INA236 constructor."""
+        if name in self.devices:
+            raise ValueError(f"Device '{name}' is already registered")
+        try:
+            async_bus = self.buses[bus_name]
+        except KeyError as e:
+            raise ValueError(f"Unknown bus '{bus_name}'") from e
+        device = AsyncINA236(INA236(async_bus.bus, address, **driver_options), async_bus, name)
+        self.devices[name] = device
+        return device
+
+    async def setup_all(self, **configuration: Any) -> None:
+        await asyncio.gather(*(device.setup(**configuration) for device in self.devices.values()))
+
+    async def snapshot(self, return_exceptions: bool = False) -> Dict[str, Any]:
+        """Read every registered rail once; reads on different buses overlap.
+
+        With `return_exceptions` a failing rail maps to its exception instead of
+        aborting the whole snapshot.
+        """
+        names = list(self.devices)
+        results = await asyncio.gather(*(self.devices[name].read_sample() for name in names),
+                                       return_exceptions=return_exceptions)
+        return dict(zip(names, results))
+
+    async def poll(self, interval: float, count: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield snapshots every `interval` seconds (drift free), `count` times or forever."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        taken = 0
+        while count is None or taken < count:
+            yield await self.snapshot()
+            taken += 1
+            deadline += interval
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                logger.warning("INA236 poll overrun by %.6f s", -delay)
+                deadline = loop.time()
+
+    def close(self) -> None:
+        for bus in self.buses.values():
+            bus.close()
+
+    async def __aenter__(self) -> "AsyncINA236Poller":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,319 @@
+# drivers/ina236_capture.py
+#
+# Binary capture format for INA236 sessions (all integers little endian):
+#
+#   file header   "<8sHHI"   magic b"INA236CP", format version, record size, metadata length
+#   metadata      UTF-8 JSON: device address, shunt, LSBs, calibration, user data
+#   chunk*        "<4sIqq"   magic b"CHNK", record count, first and last timestamp (ns)
+#                 count fixed-width records "<qhHhH" (timestamp_ns, shunt, bus, current, power),
+#                 the same layout the native sampler produces
+#
+# Files are only ever appended to, one complete chunk per write, so a capture
+# interrupted at any point stays readable up to its last complete record.
+# Reopening for append cuts the file after that record and rewrites the header
+# of a chunk that lost records, so new chunks follow a consistent one.
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from pymodule.logger import get_app_logger
+from pymodule.drivers.ina236 import INA236, INA236RawSample, INA236Sample, SimulatedI2CBus, BUS_LSB, \
+    CONFIG_ADCRANGE, REG_CALIBRATION, REG_CONFIGURATION
+from pymodule.drivers.ina236_native import RECORD_FORMAT
+
+logger = get_app_logger(__name__)
+
+CAPTURE_MAGIC = b"INA236CP"
+CAPTURE_VERSION = 1
+CHUNK_MAGIC = b"CHNK"
+
+FILE_HEADER = struct.Struct("<8sHHI")
+CHUNK_HEADER = struct.Struct("<4sIqq")
+RECORD = struct.Struct(RECORD_FORMAT)
+TIMESTAMP = struct.Struct("<q")
+
+def device_metadata(device: INA236, **extra: Any) -> Dict[str, Any]:
+    """Calibration and device description stored in the capture header."""
+    metadata: Dict[str, Any] = {
+        "address": device.address,
+        "shunt_ohms": device.shunt_ohms,
+        "adc_range": device.adc_range,
+        "calibration": device.calibration_value(),
+        "current_lsb": device.current_lsb,
+        "power_lsb": device.power_lsb,
+        "shunt_lsb": device.shunt_lsb,
+        "bus_lsb": BUS_LSB,
+    }
+    metadata.update(extra)
+    return metadata
+
+class ChunkInfo(NamedTuple):
+    offset: int         # file offset of the first record
+    records: int
+    first_ns: int
+    last_ns: int
+
+class CaptureWriter:
+    """Append-only writer of INA236 capture files."""
+
+    def __init__(self, path: str, metadata: Optional[Dict[str, Any]] = None, chunk_records: int = 4096, append: bool = False) -> None:
+        if chunk_records <= 0:
+            raise ValueError("chunk_records must be positive")
+        self.path = path
+        self.chunk_records = chunk_records
+        self.last_ns: Optional[int] = None
+        self._pending = bytearray()
+        self._file: BinaryIO
+
+        if append and os.path.exists(path) and os.path.getsize(path) > 0:
+            with CaptureReader(path) as reader:
+                self.metadata = reader.metadata
+                self.last_ns = reader.end_ns
+                end_offset = reader.data_end
+                last_chunk = reader.chunks[-1] if reader.chunks else None
+            self._file = open(path, "r+b")
+            self._file.truncate(end_offset)     # drop an incomplete trailing chunk or record
+            if last_chunk is not None:
+                # records may have been cut off the last chunk: its header must count only the kept ones
+                self._file.seek(last_chunk.offset - CHUNK_HEADER.size)
+                self._file.write(CHUNK_HEADER.pack(CHUNK_MAGIC, last_chunk.records, last_chunk.first_ns, last_chunk.last_ns))
+            self._file.seek(end_offset)
+        else:
+            self.metadata = dict(metadata or {})
+            encoded = json.dumps(self.metadata, sort_keys=True).encode("utf-8")
+            self._file = open(path, "wb")
+            self._file.write(FILE_HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION, RECORD.size, len(encoded)))
+            self._file.write(encoded)
+
+    def write(self, sample: INA236RawSample) -> None:
+        self._check_order(sample.timestamp_ns)
+        self._pending += RECORD.pack(*sample)
+        self.last_ns = sample.timestamp_ns
+        if len(self._pending) >= self.chunk_records * RECORD.size:
+            self._write_chunks()
+
+    def write_batch(self, batch: Any) -> None:
+        """Append a bytes-like batch of packed records, e.g. one from NativeSampler."""
+        view = memoryview(batch).cast("B")
+        if len(view) % RECORD.size:
+            raise ValueError(f"Batch length {len(view)} is not a multiple of the record size {RECORD.size}")
+        if not view:
+            return
+        timestamps = array("q")
+        timestamps.frombytes(view)
+        if sys.byteorder == "big":
+            timestamps.byteswap()
+        timestamps = timestamps[::RECORD.size // TIMESTAMP.size]
+        self._check_order(timestamps[0])
+        if list(timestamps) != sorted(timestamps):
+            raise ValueError("Capture timestamps must not decrease")
+        self._pending += view
+        self.last_ns = timestamps[-1]
+        if len(self._pending) >= self.chunk_records * RECORD.size:
+            self._write_chunks()
+
+    def _check_order(self, first_ns: int) -> None:
+        if self.last_ns is not None and first_ns < self.last_ns:
+            raise ValueError("Capture timestamps must not decrease")
+
+    def _write_chunks(self, partial: bool = False) -> None:
+        chunk_bytes = self.chunk_records * RECORD.size
+        written = 0
+        while len(self._pending) - written >= chunk_bytes or (partial and written < len(self._pending)):
+            data = memoryview(self._pending)[written:written + chunk_bytes]
+            count = len(data) // RECORD.size
+            first_ns = TIMESTAMP.unpack_from(data, 0)[0]
+            last_ns = TIMESTAMP.unpack_from(data, len(data) - RECORD.size)[0]
+            self._file.write(CHUNK_HEADER.pack(CHUNK_MAGIC, count, first_ns, last_ns) + data)
+            data.release()
+            written += count * RECORD.size
+        del self._pending[:written]
+
+    def flush(self) -> None:
+        """Write buffered records as a (possibly short) chunk and flush the file."""
+        self._write_chunks(partial=True)
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> "CaptureWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+class CaptureReader:
+    """Memory-mapped reader of INA236 capture files with random access by time.
+
+    Only chunk headers are touched when the file is opened; a time range query
+    bisects the chunk index and then the timestamps inside the boundary chunks.
+    Views returned by `views()` point into the map and must be released before
+    `close()`.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:
+            self._file.close()
+            raise ValueError(f"{path}: empty capture file") from e
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse(self) -> None:
+        if len(self._map) < FILE_HEADER.size:
+            raise ValueError(f"{self.path}: not an INA236 capture")
+        magic, version, record_size, metadata_length = FILE_HEADER.unpack_from(self._map, 0)
+        if magic != CAPTURE_MAGIC:
+            raise ValueError(f"{self.path}: not an INA236 capture")
+        if version > CAPTURE_VERSION:
+            raise ValueError(f"{self.path}: capture format version {version} is newer than supported {CAPTURE_VERSION}")
+        if record_size != RECORD.size:
+            raise ValueError(f"{self.path}: unexpected record size {record_size}")
+        self.version = version
+        offset = FILE_HEADER.size + metadata_length
+        self.metadata: Dict[str, Any] = json.loads(bytes(self._map[FILE_HEADER.size:offset]).decode("utf-8"))
+
+        self.chunks: List[ChunkInfo] = []
+        size = len(self._map)
+        while offset + CHUNK_HEADER.size <= size:
+            magic, count, first_ns, last_ns = CHUNK_HEADER.unpack_from(self._map, offset)
+            if magic != CHUNK_MAGIC:
+                raise ValueError(f"{self.path}: corrupt chunk header at offset {offset}")
+            records_offset = offset + CHUNK_HEADER.size
+            available = (size - records_offset) // RECORD.size
+            if available < count:
+                logger.warning("%s: truncated chunk at offset %d, %d of %d records readable", self.path, offset, available, count)
+                count = available
+                if count == 0:
+                    break
+                last_ns = TIMESTAMP.unpack_from(self._map, records_offset + (count - 1) * RECORD.size)[0]
+            self.chunks.append(ChunkInfo(records_offset, count, first_ns, last_ns))
+            offset = records_offset + count * RECORD.size
+        self.data_end = self.chunks[-1].offset + self.chunks[-1].records * RECORD.size if self.chunks else offset
+        self._last_ns = [chunk.last_ns for chunk in self.chunks]
+
+    def __len__(self) -> int:
+        return sum(chunk.records for chunk in self.chunks)
+
+    @property
+    def start_ns(self) -> Optional[int]:
+        return self.chunks[0].first_ns if self.chunks else None
+
+    @property
+    def end_ns(self) -> Optional[int]:
+        return self.chunks[-1].last_ns if self.chunks else None
+
+    def _lower_bound(self, chunk: ChunkInfo, timestamp_ns: int) -> int:
+        """Index of the first record in `chunk` with timestamp >= `timestamp_ns`."""
+        low, high = 0, chunk.records
+        while low < high:
+            middle = (low + high) // 2
+            if TIMESTAMP.unpack_from(self._map, chunk.offset + middle * RECORD.size)[0] < timestamp_ns:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def views(self, start_ns: Optional[int] = None, end_ns: Optional[int] = None) -> Iterator[memoryview]:
+        """Yield zero-copy views of packed records with start_ns <= timestamp < end_ns."""
+        first = 0 if start_ns is None else bisect.bisect_left(self._last_ns, start_ns)
+        for chunk in self.chunks[first:]:
+            if end_ns is not None and chunk.first_ns >= end_ns:
+                break
+            low = 0 if start_ns is None or chunk.first_ns >= start_ns else self._lower_bound(chunk, start_ns)
+            high = chunk.records if end_ns is None or chunk.last_ns < end_ns else self._lower_bound(chunk, end_ns)
+            if high > low:
+                yield memoryview(self._map)[chunk.offset + low * RECORD.size:chunk.offset + high * RECORD.size]
+
+    def records(self, start_ns: Optional[int] = None, end_ns: Optional[int] = None) -> Iterator[INA236RawSample]:
+        for view in self.views(start_ns, end_ns):
+            with view:
+                for record in RECORD.iter_unpack(view):
+                    yield INA236RawSample._make(record)
+
+    def samples(self, start_ns: Optional[int] = None, end_ns: Optional[int] = None) -> Iterator[INA236Sample]:
+        """Records converted to physical units with the calibration stored in the header."""
+        shunt_lsb = self.metadata.get("shunt_lsb", 0.0)
+        bus_lsb = self.metadata.get("bus_lsb", BUS_LSB)
+        current_lsb = self.metadata.get("current_lsb", 0.0)
+        power_lsb = self.metadata.get("power_lsb", 0.0)
+        for raw in self.records(start_ns, end_ns):
+            yield INA236Sample(raw.timestamp_ns / 1e9, raw.bus * bus_lsb, raw.shunt * shunt_lsb,
+                               raw.current * current_lsb, raw.power * power_lsb)
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "CaptureReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+class CaptureReplay:
+    """Feeds a recorded capture back through a simulated INA236 on a SimulatedI2CBus.
+
+    Each record is loaded into the device registers at its original time scaled by
+    `speed` (2.0 = twice as fast, 0 = as fast as possible), so code using the
+    regular driver on that bus sees the recorded session.
+    """
+
+    def __init__(self, reader: CaptureReader, bus: SimulatedI2CBus, address: Optional[int] = None, speed: float = 1.0) -> None:
+        if speed < 0:
+            raise ValueError("Replay speed must not be negative")
+        self.reader = reader
+        self.bus = bus
+        self.address = reader.metadata.get("address", 0x40) if address is None else address
+        self.speed = speed
+        self._stop = threading.Event()
+        if self.address not in bus.devices:
+            bus.add_device(self.address)
+        calibration = reader.metadata.get("calibration")
+        if calibration is not None:
+            bus.write_register(self.address, REG_CALIBRATION, calibration)
+        if reader.metadata.get("adc_range"):
+            configuration = bus.read_register(self.address, REG_CONFIGURATION)
+            bus.write_register(self.address, REG_CONFIGURATION, configuration | CONFIG_ADCRANGE)
+
+    def run(self, start_ns: Optional[int] = None, end_ns: Optional[int] = None,
+            on_sample: Optional[Callable[[INA236RawSample], None]] = None) -> int:
+        """Replay the range and return the number of replayed records."""
+        replayed = 0
+        origin_capture: Optional[int] = None
+        origin_wall = time.monotonic_ns()
+        for raw in self.reader.records(start_ns, end_ns):
+            if self._stop.is_set():
+                break
+            if origin_capture is None:
+                origin_capture = raw.timestamp_ns
+            if self.speed > 0:
+                delay = origin_wall + (raw.timestamp_ns - origin_capture) / self.speed - time.monotonic_ns()
+                if delay > 0:
+                    time.sleep(delay / 1e9)
+            self.bus.set_raw(self.address, raw.shunt, raw.bus, raw.current & 0xFFFF, raw.power)
+            replayed += 1
+            if on_sample is not None:
+                on_sample(raw)
+        return replayed
+
+    def stop(self) -> None:
+        self._stop.set()
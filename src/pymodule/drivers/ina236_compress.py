@@ -0,0 +1,349 @@
+# drivers/ina236_compress.py
+#
+# Compressed storage for long INA236 captures (all integers little endian):
+#
+#   file header   "<8sHI"     magic b"INA236CZ", format version, metadata length
+#   metadata      UTF-8 JSON, as in the plain capture format
+#   block*        "<4sBIqqI"  magic b"BLK0", tier, entry count, first and last timestamp (ns), payload length
+#                 tier 0:  raw records, column by column; timestamps as zigzag varint
+#                          delta-of-delta, the other channels as zigzag varint deltas
+#                 tier N:  decimated entries over `factor` raw records, fixed width TIER_ENTRY
+#   index         "<QBIqq" per block: offset, tier, entry count, first and last timestamp
+#   footer        "<8sQI"     magic b"INA236IX", index offset, block count
+#
+# Every block starts from zero state, so any block decodes on its own. A file
+# without footer (interrupted writer) is still readable by scanning block headers.
+
+import bisect
+import json
+import mmap
+import struct
+from typing import Any, BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from pymodule.logger import get_app_logger
+from pymodule.drivers.ina236 import INA236RawSample
+from pymodule.drivers.ina236_capture import CaptureReader, RECORD
+
+logger = get_app_logger(__name__)
+
+COMPRESSED_MAGIC = b"INA236CZ"
+COMPRESSED_VERSION = 1
+BLOCK_MAGIC = b"BLK0"
+FOOTER_MAGIC = b"INA236IX"
+
+FILE_HEADER = struct.Struct("<8sHI")
+BLOCK_HEADER = struct.Struct("<4sBIqqI")
+INDEX_ENTRY = struct.Struct("<QBIqq")
+FOOTER = struct.Struct("<8sQI")
+# first and last timestamp, record count, then min/max/mean of shunt, bus, current, power
+TIER_ENTRY = struct.Struct("<qqI" + "hhf" + "HHf" + "hhf" + "HHf")
+
+CHANNELS = 5    # timestamp_ns, shunt, bus, current, power
+
+class BlockInfo(NamedTuple):
+    offset: int         # file offset of the block header
+    tier: int
+    entries: int
+    first_ns: int
+    last_ns: int
+
+class ChannelSummary(NamedTuple):
+    min: int
+    max: int
+    mean: float
+
+class TierEntry(NamedTuple):
+    first_ns: int
+    last_ns: int
+    samples: int
+    shunt: ChannelSummary
+    bus: ChannelSummary
+    current: ChannelSummary
+    power: ChannelSummary
+
+# ================================================================
+#  Column codec
+# ================================================================
+def encode_varints(values: Sequence[int], out: bytearray) -> None:
+    """Append zigzag LEB128 encoding of signed integers to `out`."""
+    append = out.append
+    for value in values:
+        zigzag = value << 1 if value >= 0 else ((-value) << 1) - 1
+        while zigzag > 0x7F:
+            append((zigzag & 0x7F) | 0x80)
+            zigzag >>= 7
+        append(zigzag)
+
+def decode_varints(data: Any, offset: int, count: int) -> Tuple[List[int], int]:
+    """Decode `count` zigzag varints starting at `offset`; returns values and the end offset."""
+    values: List[int] = []
+    append = values.append
+    for _ in range(count):
+        result = shift = 0
+        while True:
+            byte = data[offset]
+            offset += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        append(result >> 1 if not result & 1 else -((result + 1) >> 1))
+    return values, offset
+
+def _deltas(values: Sequence[int]) -> List[int]:
+    previous = 0
+    deltas = []
+    for value in values:
+        deltas.append(value - previous)
+        previous = value
+    return deltas
+
+def _integrate(deltas: List[int]) -> List[int]:
+    total = 0
+    for i, delta in enumerate(deltas):
+        total += delta
+        deltas[i] = total
+    return deltas
+
+def encode_block(records: Sequence[INA236RawSample]) -> bytes:
+    """Column-wise delta/varint encoding of raw records."""
+    columns = list(zip(*records))
+    out = bytearray()
+    encode_varints(_deltas(_deltas(columns[0])), out)    # timestamps: delta of delta
+    for column in columns[1:]:
+        encode_varints(_deltas(column), out)
+    return bytes(out)
+
+def decode_block(data: Any, offset: int, count: int) -> List[INA236RawSample]:
+    columns = []
+    values, offset = decode_varints(data, offset, count)
+    columns.append(_integrate(_integrate(values)))
+    for _ in range(CHANNELS - 1):
+        values, offset = decode_varints(data, offset, count)
+        columns.append(_integrate(values))
+    return [INA236RawSample._make(record) for record in zip(*columns)]
+
+def decimate(records: Sequence[INA236RawSample]) -> TierEntry:
+    """min/max/mean summary of a group of consecutive records."""
+    columns = list(zip(*records))
+    count = len(records)
+    summaries = [ChannelSummary(min(column), max(column), sum(column) / count) for column in columns[1:]]
+    return TierEntry(records[0].timestamp_ns, records[-1].timestamp_ns, count, *summaries)
+
+def _pack_tier_entry(entry: TierEntry) -> bytes:
+    return TIER_ENTRY.pack(entry.first_ns, entry.last_ns, entry.samples,
+                           *entry.shunt, *entry.bus, *entry.current, *entry.power)
+
+def _unpack_tier_entry(fields: Tuple) -> TierEntry:
+    return TierEntry(fields[0], fields[1], fields[2], ChannelSummary(*fields[3:6]), ChannelSummary(*fields[6:9]),
+                     ChannelSummary(*fields[9:12]), ChannelSummary(*fields[12:15]))
+
+# ================================================================
+#  Writer
+# ================================================================
+class _Tier:
+    """Builds decimated entries of one tier from the stream of raw records."""
+
+    def __init__(self, level: int, factor: int) -> None:
+        self.level = level
+        self.factor = factor
+        self.group: List[INA236RawSample] = []
+        self.entries: List[TierEntry] = []
+
+class CompressedCaptureWriter:
+    """Append-only writer of compressed INA236 captures with decimation tiers.
+
+    `tiers` lists decimation factors; tier N (1-based) summarizes every
+    `tiers[N-1]` raw records as min/max/mean per channel, for cheap zoomed-out views.
+    """
+
+    def __init__(self, path: str, metadata: Optional[Dict[str, Any]] = None, block_records: int = 4096,
+                 tiers: Sequence[int] = (64, 4096)) -> None:
+        if block_records <= 0 or any(factor <= 1 for factor in tiers):
+            raise ValueError("block_records must be positive and decimation factors greater than 1")
+        self.path = path
+        self.block_records = block_records
+        self.metadata = dict(metadata or {})
+        self.metadata["tiers"] = list(tiers)
+        self.index: List[BlockInfo] = []
+        self.last_ns: Optional[int] = None
+        self._pending: List[INA236RawSample] = []
+        self._tiers = [_Tier(level + 1, factor) for level, factor in enumerate(tiers)]
+        encoded = json.dumps(self.metadata, sort_keys=True).encode("utf-8")
+        self._file: BinaryIO = open(path, "wb")
+        self._file.write(FILE_HEADER.pack(COMPRESSED_MAGIC, COMPRESSED_VERSION, len(encoded)))
+        self._file.write(encoded)
+        self._offset = FILE_HEADER.size + len(encoded)
+
+    def _write_block(self, tier: int, entries: int, first_ns: int, last_ns: int, payload: bytes) -> None:
+        self._file.write(BLOCK_HEADER.pack(BLOCK_MAGIC, tier, entries, first_ns, last_ns, len(payload)) + payload)
+        self.index.append(BlockInfo(self._offset, tier, entries, first_ns, last_ns))
+        self._offset += BLOCK_HEADER.size + len(payload)
+
+    def _flush_raw(self) -> None:
+        if self._pending:
+            self._write_block(0, len(self._pending), self._pending[0].timestamp_ns, self._pending[-1].timestamp_ns,
+                              encode_block(self._pending))
+            self._pending = []
+
+    def _flush_tier(self, tier: _Tier) -> None:
+        if tier.entries:
+            payload = b"".join(_pack_tier_entry(entry) for entry in tier.entries)
+            self._write_block(tier.level, len(tier.entries), tier.entries[0].first_ns, tier.entries[-1].last_ns, payload)
+            tier.entries = []
+
+    def write(self, sample: INA236RawSample) -> None:
+        if self.last_ns is not None and sample.timestamp_ns < self.last_ns:
+            raise ValueError("Capture timestamps must not decrease")
+        self.last_ns = sample.timestamp_ns
+        self._pending.append(sample)
+        if len(self._pending) >= self.block_records:
+            self._flush_raw()
+        for tier in self._tiers:
+            tier.group.append(sample)
+            if len(tier.group) >= tier.factor:
+                tier.entries.append(decimate(tier.group))
+                tier.group = []
+                if len(tier.entries) >= self.block_records:
+                    self._flush_tier(tier)
+
+    def write_batch(self, batch: Any) -> None:
+        """Append a bytes-like batch of packed records (native sampler / plain capture layout)."""
+        for record in RECORD.iter_unpack(batch):
+            self.write(INA236RawSample._make(record))
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._flush_raw()
+        for tier in self._tiers:
+            if tier.group:
+                tier.entries.append(decimate(tier.group))
+                tier.group = []
+            self._flush_tier(tier)
+        index_offset = self._offset
+        for block in self.index:
+            self._file.write(INDEX_ENTRY.pack(*block))
+        self._file.write(FOOTER.pack(FOOTER_MAGIC, index_offset, len(self.index)))
+        self._file.close()
+
+    def __enter__(self) -> "CompressedCaptureWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+# ================================================================
+#  Reader
+# ================================================================
+class CompressedCaptureReader:
+    """Memory-mapped reader of compressed captures; decodes only blocks overlapping a query."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:
+            self._file.close()
+            raise ValueError(f"{path}: empty compressed capture file") from e
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse(self) -> None:
+        if len(self._map) < FILE_HEADER.size:
+            raise ValueError(f"{self.path}: not a compressed INA236 capture")
+        magic, version, metadata_length = FILE_HEADER.unpack_from(self._map, 0)
+        if magic != COMPRESSED_MAGIC:
+            raise ValueError(f"{self.path}: not a compressed INA236 capture")
+        if version > COMPRESSED_VERSION:
+            raise ValueError(f"{self.path}: compressed format version {version} is newer than supported {COMPRESSED_VERSION}")
+        data_start = FILE_HEADER.size + metadata_length
+        self.metadata: Dict[str, Any] = json.loads(bytes(self._map[FILE_HEADER.size:data_start]).decode("utf-8"))
+
+        blocks = self._read_index() if len(self._map) >= data_start + FOOTER.size else None
+        if blocks is None:
+            logger.warning("%s: no block index, scanning block headers", self.path)
+            blocks = self._scan(data_start)
+        self.blocks: Dict[int, List[BlockInfo]] = {}
+        for block in blocks:
+            self.blocks.setdefault(block.tier, []).append(block)
+        self._last_ns = {tier: [block.last_ns for block in tier_blocks] for tier, tier_blocks in self.blocks.items()}
+
+    def _read_index(self) -> Optional[List[BlockInfo]]:
+        magic, index_offset, count = FOOTER.unpack_from(self._map, len(self._map) - FOOTER.size)
+        if magic != FOOTER_MAGIC:
+            return None
+        return [BlockInfo._make(INDEX_ENTRY.unpack_from(self._map, index_offset + i * INDEX_ENTRY.size)) for i in range(count)]
+
+    def _scan(self, offset: int) -> List[BlockInfo]:
+        blocks = []
+        size = len(self._map)
+        while offset + BLOCK_HEADER.size <= size:
+            magic, tier, entries, first_ns, last_ns, length = BLOCK_HEADER.unpack_from(self._map, offset)
+            if magic != BLOCK_MAGIC or offset + BLOCK_HEADER.size + length > size:
+                break
+            blocks.append(BlockInfo(offset, tier, entries, first_ns, last_ns))
+            offset += BLOCK_HEADER.size + length
+        return blocks
+
+    def __len__(self) -> int:
+        return sum(block.entries for block in self.blocks.get(0, []))
+
+    @property
+    def tiers(self) -> List[int]:
+        return list(self.metadata.get("tiers", []))
+
+    def _blocks(self, tier: int, start_ns: Optional[int], end_ns: Optional[int]) -> Iterator[BlockInfo]:
+        tier_blocks = self.blocks.get(tier, [])
+        first = 0 if start_ns is None else bisect.bisect_left(self._last_ns[tier], start_ns)
+        for block in tier_blocks[first:]:
+            if end_ns is not None and block.first_ns >= end_ns:
+                break
+            yield block
+
+    def records(self, start_ns: Optional[int] = None, end_ns: Optional[int] = None) -> Iterator[INA236RawSample]:
+        """Raw records with start_ns <= timestamp < end_ns."""
+        for block in self._blocks(0, start_ns, end_ns):
+            for record in decode_block(self._map, block.offset + BLOCK_HEADER.size, block.entries):
+                if (start_ns is None or record.timestamp_ns >= start_ns) and (end_ns is None or record.timestamp_ns < end_ns):
+                    yield record
+
+    def tier(self, factor: int, start_ns: Optional[int] = None, end_ns: Optional[int] = None) -> Iterator[TierEntry]:
+        """Decimated entries of the tier with decimation `factor` overlapping the range."""
+        try:
+            level = self.tiers.index(factor) + 1
+        except ValueError as e:
+            raise ValueError(f"No decimation tier with factor {factor}, available: {self.tiers}") from e
+        for block in self._blocks(level, start_ns, end_ns):
+            for fields in TIER_ENTRY.iter_unpack(self._map[block.offset + BLOCK_HEADER.size:
+                                                           block.offset + BLOCK_HEADER.size + block.entries * TIER_ENTRY.size]):
+                entry = _unpack_tier_entry(fields)
+                if (start_ns is None or entry.last_ns >= start_ns) and (end_ns is None or entry.first_ns < end_ns):
+                    yield entry
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "CompressedCaptureReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+def compress_capture(source: str, destination: str, block_records: int = 4096, tiers: Sequence[int] = (64, 4096)) -> Tuple[int, int]:
+    """Convert a plain capture file into the compressed format; returns (records, compressed bytes)."""
+    with CaptureReader(source) as reader:
+        with CompressedCaptureWriter(destination, reader.metadata, block_records, tiers) as writer:
+            for view in reader.views():
+                with view:
+                    writer.write_batch(view)
+        records = len(reader)
+    with open(destination, "rb") as f:
+        size = f.seek(0, 2)
+    return records, size
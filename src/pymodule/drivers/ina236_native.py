@@ -0,0 +1,123 @@
+# drivers/ina236_native.py
+
+import queue
+import struct
+import threading
+from typing import Any, Callable, Iterator, List, Optional
+
+from pymodule.logger import get_app_logger
+from pymodule.drivers.ina236 import INA236, INA236RawSample, LinuxI2CBus
+from pymodule.extensions.ina236sampler import ina236sampler
+
+logger = get_app_logger(__name__)
+
+# Fixed-width record written by the native loop: timestamp_ns, shunt, bus, current, power
+RECORD_SIZE: int = ina236sampler.RECORD_SIZE
+RECORD_FORMAT: str = ina236sampler.RECORD_FORMAT
+
+def decode_records(batch: Any) -> List[INA236RawSample]:
+    """Decode a batch of native records (any bytes-like object) into raw samples."""
+    return [INA236RawSample._make(record) for record in struct.iter_unpack(RECORD_FORMAT, batch)]
+
+class NativeSampler:
+    """Continuous INA236 acquisition on a background thread using the native loop.
+
+    The register reads, pacing and timestamping of a whole batch run in C with the
+    GIL released; Python code only sees complete batches (bytearrays of
+    `batch_size` records) through `batches()`. Without `device` the native
+    simulated source is used and `simulation` options go to `read_simulated`.
+    """
+
+    def __init__(self, device: Optional[INA236] = None, batch_size: int = 1024, period_ns: int = 0,
+                 max_pending: int = 16, **simulation: int) -> None:
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        self.batch_size = batch_size
+        self.period_ns = period_ns
+        self.dropped_batches = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self._read: Callable[[bytearray], int]
+
+        if device is not None:
+            if not isinstance(device.bus, LinuxI2CBus):
+                raise ValueError("NativeSampler needs an INA236 on a LinuxI2CBus")
+            fd, address = device.bus.fd, device.address
+            self._read = lambda buffer: ina236sampler.read_i2c(buffer, fd, address, self.batch_size, self.period_ns)
+        else:
+            self._read = lambda buffer: ina236sampler.read_simulated(buffer, self.batch_size, self.period_ns, **simulation)
+
+    def read_batch(self) -> memoryview:
+        """Acquire one batch synchronously (the calling thread releases the GIL meanwhile).
+
+        :raises OSError: On a bus error; `records` of the error is the number of samples read before it
+        """
+        buffer = bytearray(self.batch_size * RECORD_SIZE)
+        count = self._read(buffer)
+        return memoryview(buffer)[:count * RECORD_SIZE]
+
+    def _put(self, batch: memoryview) -> None:
+        try:
+            self._queue.put_nowait(batch)
+        except queue.Full:
+            self.dropped_batches += 1
+            logger.warning("INA236 native sampler: consumer too slow, batch dropped")
+
+    def _run(self) -> None:
+        buffer = bytearray(0)
+        try:
+            while not self._stop.is_set():
+                buffer = bytearray(self.batch_size * RECORD_SIZE)
+                self._put(memoryview(buffer)[:self._read(buffer) * RECORD_SIZE])
+        except OSError as e:
+            # the samples read before the bus error are still delivered, then batches() raises
+            records = getattr(e, "records", 0)
+            if records:
+                self._put(memoryview(buffer)[:records * RECORD_SIZE])
+            logger.error("INA236 native sampler: bus error after %d samples of a batch: %s", records, e)
+            self._error = e
+        except BaseException as e:  # pylint: disable=broad-exception-caught
+            self._error = e
+        finally:
+            self._queue.put(None)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise RuntimeError("NativeSampler already started")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ina236-native-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Request the acquisition thread to stop after the current batch."""
+        self._stop.set()
+
+    def join(self) -> None:
+        if self._thread is not None:
+            self._thread.join()
+
+    def batches(self) -> Iterator[memoryview]:
+        """Yield acquired batches until the sampler stops; re-raises acquisition errors."""
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                break
+            yield batch
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> "NativeSampler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+        # drain so that the acquisition thread never blocks on the sentinel
+        while self._thread is not None and self._thread.is_alive():
+            try:
+                self._queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        self.join()
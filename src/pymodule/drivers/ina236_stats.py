@@ -0,0 +1,310 @@
+# drivers/ina236_stats.py
+
+import math
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from pymodule.logger import get_app_logger
+from pymodule.drivers.ina236 import INA236Sample
+
+logger = get_app_logger(__name__)
+
+class StatsSummary(NamedTuple):
+    samples: int
+    min: float
+    max: float
+    mean: float
+    rms: float
+    stddev: float
+
+class WindowSummary(NamedTuple):
+    start: float        # timestamp of the first sample in the window, s
+    end: float          # timestamp of the last sample in the window, s
+    samples: int
+    bus_voltage: StatsSummary
+    current: StatsSummary
+    power: StatsSummary
+    energy: float       # J
+
+class RunningStats:
+    """Numerically stable running min/max/mean/variance/RMS of one quantity.
+
+    Uses Welford's update per value and Chan's formula to merge partial results,
+    so adding a whole batch costs one pass over the batch and one O(1) merge.
+    """
+
+    __slots__ = ("count", "mean", "m2", "min", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def add_batch(self, values: Iterable[float]) -> None:
+        batch = RunningStats()
+        for value in values:
+            batch.add(value)
+        self.merge(batch)
+
+    def merge(self, other: "RunningStats") -> None:
+        """Fold `other` into this accumulator (Chan et al. parallel variance)."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2, self.min, self.max = other.count, other.mean, other.m2, other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def copy(self) -> "RunningStats":
+        clone = RunningStats()
+        clone.merge(self)
+        return clone
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def rms(self) -> float:
+        # E[x^2] = mean^2 + variance, without ever summing squares directly
+        return math.sqrt(self.mean * self.mean + self.variance) if self.count else 0.0
+
+    def summary(self) -> StatsSummary:
+        if self.count == 0:
+            return StatsSummary(0, math.nan, math.nan, math.nan, math.nan, math.nan)
+        return StatsSummary(self.count, self.min, self.max, self.mean, self.rms, math.sqrt(self.variance))
+
+class EnergyIntegrator:
+    """Trapezoidal integration of power over time with Kahan compensated summation."""
+
+    __slots__ = ("energy", "_compensation", "last_time", "last_power")
+
+    def __init__(self) -> None:
+        self.energy = 0.0
+        self._compensation = 0.0
+        self.last_time: Optional[float] = None
+        self.last_power = 0.0
+
+    def accumulate(self, energy: float) -> None:
+        y = energy - self._compensation
+        t = self.energy + y
+        self._compensation = (t - self.energy) - y
+        self.energy = t
+
+    def interval(self, timestamp: float, power: float) -> float:
+        """Energy of the interval from the previous point to this one; advances the integrator."""
+        energy = 0.0
+        if self.last_time is not None:
+            energy = (power + self.last_power) * 0.5 * (timestamp - self.last_time)
+        self.last_time = timestamp
+        self.last_power = power
+        return energy
+
+    def add(self, timestamp: float, power: float) -> None:
+        self.accumulate(self.interval(timestamp, power))
+
+class RailAggregate:
+    """Mergeable statistics of one rail over a span of samples."""
+
+    __slots__ = ("start", "end", "bus_voltage", "current", "power", "energy")
+
+    def __init__(self) -> None:
+        self.start = math.nan
+        self.end = math.nan
+        self.bus_voltage = RunningStats()
+        self.current = RunningStats()
+        self.power = RunningStats()
+        self.energy = 0.0
+
+    def add(self, sample: INA236Sample, energy: float = 0.0) -> None:
+        if self.bus_voltage.count == 0:
+            self.start = sample.timestamp
+        self.end = sample.timestamp
+        self.bus_voltage.add(sample.bus_voltage)
+        self.current.add(sample.current)
+        self.power.add(sample.power)
+        self.energy += energy
+
+    def merge(self, other: "RailAggregate") -> None:
+        """Fold `other`, which must cover a later span, into this aggregate."""
+        if other.bus_voltage.count == 0:
+            self.energy += other.energy
+            return
+        if self.bus_voltage.count == 0:
+            self.start = other.start
+        self.end = other.end
+        self.bus_voltage.merge(other.bus_voltage)
+        self.current.merge(other.current)
+        self.power.merge(other.power)
+        self.energy += other.energy
+
+    def copy(self) -> "RailAggregate":
+        clone = RailAggregate()
+        clone.merge(self)
+        return clone
+
+    def summary(self) -> WindowSummary:
+        return WindowSummary(self.start, self.end, self.bus_voltage.count, self.bus_voltage.summary(),
+                             self.current.summary(), self.power.summary(), self.energy)
+
+class RailStatistics:
+    """Whole-capture running statistics and integrated energy of one rail."""
+
+    def __init__(self) -> None:
+        self.aggregate = RailAggregate()
+        self.integrator = EnergyIntegrator()
+
+    def add(self, sample: INA236Sample) -> None:
+        self.integrator.add(sample.timestamp, sample.power)
+        self.aggregate.add(sample)
+
+    def add_batch(self, samples: Iterable[INA236Sample]) -> None:
+        for sample in samples:
+            self.add(sample)
+
+    @property
+    def energy(self) -> float:
+        return self.integrator.energy
+
+    def summary(self) -> WindowSummary:
+        return self.aggregate.summary()._replace(energy=self.integrator.energy)
+
+class TumblingWindowAggregator:
+    """Fixed, non-overlapping windows of `duration` seconds aligned to the first sample.
+
+    `add` returns the summary of a window as soon as a sample falls past its end.
+    Energy of an interval that straddles a window boundary is split at the
+    boundary using linearly interpolated power; when windows without samples are
+    skipped, the energy of the gap goes to the window of the next sample.
+    """
+
+    def __init__(self, duration: float) -> None:
+        if duration <= 0:
+            raise ValueError("Window duration must be positive")
+        self.duration = duration
+        self.window_start: Optional[float] = None
+        self.current = RailAggregate()
+        self.integrator = EnergyIntegrator()
+
+    def add(self, sample: INA236Sample) -> Optional[WindowSummary]:
+        completed: Optional[WindowSummary] = None
+        if self.window_start is None:
+            self.window_start = sample.timestamp
+        window_end = self.window_start + self.duration
+        last_time, last_power = self.integrator.last_time, self.integrator.last_power
+        energy = self.integrator.interval(sample.timestamp, sample.power)
+
+        if sample.timestamp >= window_end:
+            if last_time is not None and sample.timestamp > last_time and last_time < window_end:
+                boundary_power = last_power + (sample.power - last_power) * (window_end - last_time) / (sample.timestamp - last_time)
+                before = (last_power + boundary_power) * 0.5 * (window_end - last_time)
+                self.current.energy += before
+                energy -= before
+            completed = self.current.summary()
+            advance = math.floor((sample.timestamp - self.window_start) / self.duration)
+            self.window_start += advance * self.duration
+            self.current = RailAggregate()
+
+        self.current.add(sample, energy)
+        return completed
+
+    def add_batch(self, samples: Iterable[INA236Sample]) -> List[WindowSummary]:
+        return [summary for summary in map(self.add, samples) if summary is not None]
+
+    def flush(self) -> Optional[WindowSummary]:
+        """Summary of the incomplete current window, if it holds samples."""
+        if self.current.bus_voltage.count == 0:
+            return None
+        summary = self.current.summary()
+        self.current = RailAggregate()
+        return summary
+
+class SlidingWindowAggregator:
+    """Statistics over the samples of the last `duration` seconds.
+
+    Implemented as a two-stack queue of mergeable aggregates: every operation is
+    amortized O(1) and nothing is ever subtracted from an accumulator, so long
+    runs do not accumulate cancellation error. The window energy is the sum of
+    the trapezoid intervals ending at the samples inside the window.
+    """
+
+    def __init__(self, duration: float) -> None:
+        if duration <= 0:
+            raise ValueError("Window duration must be positive")
+        self.duration = duration
+        self.integrator = EnergyIntegrator()
+        # front stack: (timestamp, aggregate of this element and everything newer in the front stack)
+        self._front: List[Tuple[float, RailAggregate]] = []
+        # back stack: single-sample aggregates in arrival order, plus their running aggregate
+        self._back: List[Tuple[float, RailAggregate]] = []
+        self._back_aggregate = RailAggregate()
+
+    def __len__(self) -> int:
+        return len(self._front) + len(self._back)
+
+    def _flip(self) -> None:
+        suffix = RailAggregate()
+        while self._back:
+            timestamp, element = self._back.pop()
+            merged = element.copy()
+            merged.merge(suffix)
+            suffix = merged
+            self._front.append((timestamp, suffix))
+        self._back_aggregate = RailAggregate()
+
+    def _evict(self, horizon: float) -> None:
+        while True:
+            if not self._front:
+                if not self._back or self._back[0][0] > horizon:
+                    return
+                self._flip()
+            if self._front[-1][0] > horizon:
+                return
+            self._front.pop()
+
+    def add(self, sample: INA236Sample) -> WindowSummary:
+        element = RailAggregate()
+        element.add(sample, self.integrator.interval(sample.timestamp, sample.power))
+        self._back.append((sample.timestamp, element))
+        self._back_aggregate.merge(element)
+        self._evict(sample.timestamp - self.duration)
+        return self.summary()
+
+    def add_batch(self, samples: Iterable[INA236Sample]) -> Optional[WindowSummary]:
+        summary = None
+        for sample in samples:
+            summary = self.add(sample)
+        return summary
+
+    def summary(self) -> WindowSummary:
+        total = self._front[-1][1].copy() if self._front else RailAggregate()
+        total.merge(self._back_aggregate)
+        return total.summary()
+
+def tumbling_windows(samples: Iterable[INA236Sample], duration: float) -> Iterator[WindowSummary]:
+    """Stream window summaries of an arbitrarily long sample stream in constant memory."""
+    aggregator = TumblingWindowAggregator(duration)
+    for sample in samples:
+        summary = aggregator.add(sample)
+        if summary is not None:
+            yield summary
+    last = aggregator.flush()
+    if last is not None:
+        yield last
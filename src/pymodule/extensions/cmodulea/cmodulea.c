@@ -34,15 +34,18 @@ static PyObject* print_hello_cmodulea(PyObject* self, PyObject* args) {
 static int c_fibonacci(int n);
 
 // The C function for benchmarking that accepts an integer and returns void
-static PyObject* c_benchmark(PyObject* self, PyObject* args) {
+static PyObject* c_benchmark(PyObject* self, PyObject* const* args, Py_ssize_t nargs) {
     int n;
     long long result = 0;
 
     // Parse the input argument to get the integer n
-    if (!PyArg_ParseTuple(args, "i", &n)) {
+    if (Pymodule_ParseIntArg(args, nargs, "c_benchmark", &n) < 0) {
         return NULL;
     }
 
+    double time_taken;
+    // pure C work: other threads (and interpreters) run in parallel meanwhile
+    Py_BEGIN_ALLOW_THREADS
 #ifdef _WIN32
     // Query the frequency of the performance counter
     LARGE_INTEGER frequency;
@@ -62,8 +65,7 @@ static PyObject* c_benchmark(PyObject* self, PyObject* args) {
     QueryPerformanceCounter(&end_time);
 
     // Calculate the time taken in microseconds
-    double time_taken = (end_time.QuadPart - start_time.QuadPart) * 1000.0 / frequency.QuadPart;
-    double dtt = time_taken;
+    time_taken = (end_time.QuadPart - start_time.QuadPart) * 1000.0 / frequency.QuadPart;
 #else
     // Linux-specific timing
     struct timespec start_time, end_time;
@@ -77,15 +79,15 @@ static PyObject* c_benchmark(PyObject* self, PyObject* args) {
     clock_gettime(CLOCK_MONOTONIC, &end_time);
 
     // Calculate the time taken in milliseconds
-    double time_taken = (end_time.tv_sec - start_time.tv_sec) * 1000.0 +
-                        (end_time.tv_nsec - start_time.tv_nsec) / 1000000.0;
-    double dtt = time_taken;
+    time_taken = (end_time.tv_sec - start_time.tv_sec) * 1000.0 +
+                 (end_time.tv_nsec - start_time.tv_nsec) / 1000000.0;
 #endif
+    Py_END_ALLOW_THREADS
     // Print the time it took (in microseconds)
     printf("C function executed in %.6f milliseconds, %lld\n", time_taken,result);
 
     // Return the result as a Python long object
-    return PyFloat_FromDouble(dtt);
+    return PyFloat_FromDouble(time_taken);
 }
 
 static int c_fibonacci(int n) {
@@ -98,23 +100,112 @@ static int c_fibonacci(int n) {
     return a;
 }
 
+// ================================================================
+//  C API exported to other extensions (see pymodule.h)
+// ================================================================
+static uint64_t capi_fibonacci(int n) {
+    uint64_t a = 0, b = 1, temp;
+    for (int i = 0; i < n; i++) {
+        temp = a;
+        a = b;
+        b = temp + b;
+    }
+    return a;
+}
+
+static uint64_t capi_fibonacci_sum(int n, Py_ssize_t iterations) {
+    uint64_t result = 0;
+    for (Py_ssize_t i = 0; i < iterations; i++) {
+        result += capi_fibonacci(n);
+    }
+    return result;
+}
+
+static double capi_monotonic_ms(void) {
+#ifdef _WIN32
+    LARGE_INTEGER frequency, counter;
+    QueryPerformanceFrequency(&frequency);
+    QueryPerformanceCounter(&counter);
+    return counter.QuadPart * 1000.0 / frequency.QuadPart;
+#else
+    struct timespec now;
+    clock_gettime(CLOCK_MONOTONIC, &now);
+    return now.tv_sec * 1000.0 + now.tv_nsec / 1000000.0;
+#endif
+}
+
+static const PymoduleCAPI cmodulea_capi = {
+    PYMODULE_CAPI_VERSION,
+    capi_fibonacci,
+    capi_fibonacci_sum,
+    capi_monotonic_ms,
+};
+
+// n-th Fibonacci number modulo 2**64; cheap for small n, used to measure call overhead
+static PyObject* fibonacci(PyObject* self, PyObject* const* args, Py_ssize_t nargs) {
+    int n;
+    if (Pymodule_ParseIntArg(args, nargs, "fibonacci", &n) < 0) {
+        return NULL;
+    }
+    return PyLong_FromUnsignedLongLong(capi_fibonacci(n));
+}
+
+// Same as fibonacci() with the METH_VARARGS convention, as reference for the call overhead benchmark
+static PyObject* fibonacci_varargs(PyObject* self, PyObject* args) {
+    int n;
+    if (!PyArg_ParseTuple(args, "i", &n)) {
+        return NULL;
+    }
+    return PyLong_FromUnsignedLongLong(capi_fibonacci(n));
+}
+
 // Method table for the module
 static PyMethodDef CModuleMethods[] = {
     {"print_hello_cmodulea", print_hello_cmodulea, METH_NOARGS, "Prints a hello message from C"},
-    {"c_benchmark", c_benchmark, METH_VARARGS, "Run a benchmark with an integer input"},
+    {"c_benchmark", (PyCFunction)(void(*)(void))c_benchmark, METH_FASTCALL, "Run a benchmark with an integer input"},
+    {"fibonacci", (PyCFunction)(void(*)(void))fibonacci, METH_FASTCALL, "n-th Fibonacci number modulo 2**64"},
+    {"fibonacci_varargs", fibonacci_varargs, METH_VARARGS, "fibonacci() through METH_VARARGS, for call overhead comparison"},
     {NULL, NULL, 0, NULL}  // Sentinel value
 };
 
-// Module definition
+// Module execution: runs once per interpreter that imports the module
+static int cmodulea_exec(PyObject *module) {
+    // the table itself is immutable static data, shared by all interpreters
+    PyObject *capsule = PyCapsule_New((void *)&cmodulea_capi, PYMODULE_CAPI_NAME, NULL);
+    if (capsule == NULL) {
+        return -1;
+    }
+    if (PyModule_AddObject(module, "_C_API", capsule) < 0) {
+        Py_DECREF(capsule);
+        return -1;
+    }
+    return 0;
+}
+
+static PyModuleDef_Slot cmodulea_slots[] = {
+    {Py_mod_exec, cmodulea_exec},
+#if PY_VERSION_HEX >= 0x030C0000
+    // no static mutable state: safe in subinterpreters with their own GIL
+    {Py_mod_multiple_interpreters, Py_MOD_PER_INTERPRETER_GIL_SUPPORTED},
+#endif
+#if PY_VERSION_HEX >= 0x030D0000
+    // does not rely on the GIL: free-threaded builds keep it disabled
+    {Py_mod_gil, Py_MOD_GIL_NOT_USED},
+#endif
+    {0, NULL}
+};
+
+// Module definition (multi-phase initialization)
 static struct PyModuleDef cmodulemodulea = {
     PyModuleDef_HEAD_INIT,
     "cmodulea",   // Module name
     "A simple example module",  // Module docstring
-    -1,          // Size of per-interpreter state of the module
-    CModuleMethods  // Method table
+    0,           // Size of per-interpreter state of the module (no state needed)
+    CModuleMethods,  // Method table
+    cmodulea_slots
 };
 
 // Module initialization function
 PyMODINIT_FUNC PyInit_cmodulea(void) {
-    return PyModule_Create(&cmodulemodulea);
+    return PyModuleDef_Init(&cmodulemodulea);
 }
@@ -1,27 +1,89 @@
 #include <Python.h>
 
+#include <pymodule.h>
+
+// Per-interpreter module state
+typedef struct {
+    // C API of cmodulea, imported when the module is executed
+    const PymoduleCAPI *capi;
+} cmoduleb_state;
+
+static inline const PymoduleCAPI *get_capi(PyObject *module) {
+    return ((cmoduleb_state *)PyModule_GetState(module))->capi;
+}
+
 // Function to print a message
 static PyObject* print_hello_cmoduleb(PyObject* self, PyObject* args) {
     printf("Hello to Python world from C world! I am CModule B!\n");
     Py_RETURN_NONE;
 }
 
+// Fibonacci kernel of cmodulea, called directly through the C API
+static PyObject* fibonacci(PyObject* self, PyObject* const* args, Py_ssize_t nargs) {
+    int n;
+    if (Pymodule_ParseIntArg(args, nargs, "fibonacci", &n) < 0) {
+        return NULL;
+    }
+    return PyLong_FromUnsignedLongLong(get_capi(self)->fibonacci(n));
+}
+
+// n evaluations of fibonacci(300) through the C API; returns the time in milliseconds
+static PyObject* capi_benchmark(PyObject* self, PyObject* const* args, Py_ssize_t nargs) {
+    int n;
+    if (Pymodule_ParseIntArg(args, nargs, "capi_benchmark", &n) < 0) {
+        return NULL;
+    }
+    const PymoduleCAPI *capi = get_capi(self);
+    uint64_t result = 0;
+    double diff;
+    Py_BEGIN_ALLOW_THREADS
+    double start = capi->monotonic_ms();
+    for (int i = 0; i < n; i++) {
+        result += capi->fibonacci(300);
+    }
+    diff = capi->monotonic_ms() - start;
+    Py_END_ALLOW_THREADS
+    printf("C through C API executed in %.6f milliseconds, %llu\n", diff, (unsigned long long)result);
+    return PyFloat_FromDouble(diff);
+}
+
 // Method table for the module
 static PyMethodDef CmodulebMethods[] = {
     {"print_hello_cmoduleb", print_hello_cmoduleb, METH_NOARGS, "Prints a hello message from C"},
+    {"fibonacci", (PyCFunction)(void(*)(void))fibonacci, METH_FASTCALL, "n-th Fibonacci number modulo 2**64, computed by cmodulea"},
+    {"capi_benchmark", (PyCFunction)(void(*)(void))capi_benchmark, METH_FASTCALL, "Run the benchmark through the cmodulea C API"},
     {NULL, NULL, 0, NULL}  // Sentinel value
 };
 
-// Module definition
+// Module execution: runs once per interpreter that imports the module
+static int cmoduleb_exec(PyObject *module) {
+    cmoduleb_state *state = (cmoduleb_state *)PyModule_GetState(module);
+    state->capi = Pymodule_ImportCAPI();
+    return state->capi == NULL ? -1 : 0;
+}
+
+static PyModuleDef_Slot cmoduleb_slots[] = {
+    {Py_mod_exec, cmoduleb_exec},
+#if PY_VERSION_HEX >= 0x030C0000
+    {Py_mod_multiple_interpreters, Py_MOD_PER_INTERPRETER_GIL_SUPPORTED},
+#endif
+#if PY_VERSION_HEX >= 0x030D0000
+    {Py_mod_gil, Py_MOD_GIL_NOT_USED},
+#endif
+    {0, NULL}
+};
+
+// Module definition (multi-phase initialization)
 static struct PyModuleDef cmodulecmoduleb = {
     PyModuleDef_HEAD_INIT,
     "cmoduleb",   // Module name
     "A simple example module",  // Module docstring
-    -1,          // Size of per-interpreter state of the module
-    CmodulebMethods  // Method table
+    sizeof(cmoduleb_state),  // Size of per-interpreter state of the module
+    CmodulebMethods,  // Method table
+    cmoduleb_slots
 };
 
 // Module initialization function
 PyMODINIT_FUNC PyInit_cmoduleb(void) {
-    return PyModule_Create(&cmodulecmoduleb);
+    return PyModuleDef_Init(&cmodulecmoduleb);
 }
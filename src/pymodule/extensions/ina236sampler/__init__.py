@@ -0,0 +1 @@
+from .ina236sampler import *
@@ -0,0 +1,298 @@
+// ina236sampler/ina236sampler.c
+//
+// GIL-free acquisition loop for the INA236 driver. The register reads, pacing
+// and timestamping run with the GIL released and write fixed-width records
+// straight into a caller supplied writable buffer (bytearray, mmap, array...).
+// Python sees the data only once per call, i.e. once per batch.
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include <pymodule.h>
+#include <stdint.h>
+#include <string.h>
+#include <errno.h>
+#include <time.h>
+
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <unistd.h>
+#endif
+
+#ifdef __linux__
+#include <sys/ioctl.h>
+#include <linux/i2c.h>
+#include <linux/i2c-dev.h>
+#endif
+
+// INA236 measurement registers
+#define REG_SHUNT_VOLTAGE 0x01
+#define REG_BUS_VOLTAGE   0x02
+#define REG_POWER         0x03
+#define REG_CURRENT       0x04
+
+// One acquired sample; layout matches struct format "<qhHhH" (16 bytes)
+#pragma pack(push, 1)
+typedef struct {
+    int64_t timestamp_ns;
+    int16_t shunt;
+    uint16_t bus;
+    int16_t current;
+    uint16_t power;
+} sample_record_t;
+#pragma pack(pop)
+
+#define RECORD_SIZE ((Py_ssize_t)sizeof(sample_record_t))
+#define RECORD_FORMAT "<qhHhH"
+
+// ---------------------------------------------------------------
+// Monotonic clock in nanoseconds (same clock as time.monotonic_ns())
+// ---------------------------------------------------------------
+static int64_t monotonic_ns(void) {
+#ifdef _WIN32
+    LARGE_INTEGER frequency, counter;
+    QueryPerformanceFrequency(&frequency);
+    QueryPerformanceCounter(&counter);
+    return (int64_t)((double)counter.QuadPart * 1e9 / (double)frequency.QuadPart);
+#else
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (int64_t)ts.tv_sec * 1000000000LL + ts.tv_nsec;
+#endif
+}
+
+static void sleep_ns(int64_t ns) {
+    if (ns <= 0) {
+        return;
+    }
+#ifdef _WIN32
+    Sleep((DWORD)(ns / 1000000));
+#else
+    struct timespec ts;
+    ts.tv_sec = (time_t)(ns / 1000000000LL);
+    ts.tv_nsec = (long)(ns % 1000000000LL);
+    while (nanosleep(&ts, &ts) != 0 && errno == EINTR) {
+    }
+#endif
+}
+
+// Sleep until an absolute monotonic deadline; used for drift free pacing.
+static void sleep_until_ns(int64_t deadline) {
+#ifdef __linux__
+    struct timespec ts;
+    ts.tv_sec = (time_t)(deadline / 1000000000LL);
+    ts.tv_nsec = (long)(deadline % 1000000000LL);
+    while (clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, &ts, NULL) == EINTR) {
+    }
+#else
+    sleep_ns(deadline - monotonic_ns());
+#endif
+}
+
+// Get a writable, contiguous view and check its capacity for `count` records.
+static int get_record_buffer(PyObject* obj, Py_buffer* view, Py_ssize_t count) {
+    if (PyObject_GetBuffer(obj, view, PyBUF_WRITABLE | PyBUF_C_CONTIGUOUS) < 0) {
+        return -1;
+    }
+    if (count < 0 || count > view->len / RECORD_SIZE) {
+        PyErr_Format(PyExc_ValueError, "buffer of %zd bytes cannot hold %zd records of %zd bytes",
+                     view->len, count, RECORD_SIZE);
+        PyBuffer_Release(view);
+        return -1;
+    }
+    return 0;
+}
+
+// Raise OSError(error) carrying the number of records completed before it in `records`.
+static PyObject* raise_bus_error(int error, Py_ssize_t done) {
+    errno = error;
+    PyErr_SetFromErrno(PyExc_OSError);
+    PyObject *type, *value, *traceback;
+    PyErr_Fetch(&type, &value, &traceback);
+    PyErr_NormalizeException(&type, &value, &traceback);
+    PyObject* records = PyLong_FromSsize_t(done);
+    if (records == NULL || PyObject_SetAttrString(value, "records", records) < 0) {
+        Py_XDECREF(records);
+        Py_XDECREF(type);
+        Py_XDECREF(value);
+        Py_XDECREF(traceback);
+        return NULL;
+    }
+    Py_DECREF(records);
+    PyErr_Restore(type, value, traceback);
+    return NULL;
+}
+
+// ---------------------------------------------------------------
+// Linux i2c-dev source
+// ---------------------------------------------------------------
+#ifdef __linux__
+static int i2c_read_register(int fd, uint16_t address, uint8_t reg, uint16_t* value) {
+    uint8_t data[2];
+    struct i2c_msg messages[2] = {
+        { .addr = address, .flags = 0, .len = 1, .buf = &reg },
+        { .addr = address, .flags = I2C_M_RD, .len = 2, .buf = data },
+    };
+    struct i2c_rdwr_ioctl_data transfer = { .msgs = messages, .nmsgs = 2 };
+
+    if (ioctl(fd, I2C_RDWR, &transfer) < 0) {
+        return -1;
+    }
+    *value = (uint16_t)((data[0] << 8) | data[1]);
+    return 0;
+}
+#endif
+
+static PyObject* read_i2c(PyObject* self, PyObject* args, PyObject* kwargs) {
+    static char* keywords[] = {"buffer", "fd", "address", "count", "period_ns", NULL};
+    PyObject* buffer_obj;
+    int fd, address;
+    Py_ssize_t count;
+    long long period_ns = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "Oiin|L", keywords, &buffer_obj, &fd, &address, &count, &period_ns)) {
+        return NULL;
+    }
+#ifdef __linux__
+    Py_buffer view;
+    if (get_record_buffer(buffer_obj, &view, count) < 0) {
+        return NULL;
+    }
+
+    sample_record_t* records = (sample_record_t*)view.buf;
+    Py_ssize_t done = 0;
+    int error = 0;
+
+    Py_BEGIN_ALLOW_THREADS
+    int64_t deadline = monotonic_ns();
+    for (; done < count; done++) {
+        uint16_t shunt, bus, current, power;
+        if (i2c_read_register(fd, (uint16_t)address, REG_SHUNT_VOLTAGE, &shunt) < 0 ||
+            i2c_read_register(fd, (uint16_t)address, REG_BUS_VOLTAGE, &bus) < 0 ||
+            i2c_read_register(fd, (uint16_t)address, REG_CURRENT, &current) < 0 ||
+            i2c_read_register(fd, (uint16_t)address, REG_POWER, &power) < 0) {
+            error = errno;
+            break;
+        }
+        sample_record_t* record = &records[done];
+        record->timestamp_ns = monotonic_ns();
+        record->shunt = (int16_t)shunt;
+        record->bus = bus;
+        record->current = (int16_t)current;
+        record->power = power;
+        if (period_ns > 0) {
+            deadline += period_ns;
+            sleep_until_ns(deadline);
+        }
+    }
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&view);
+    if (error != 0) {
+        return raise_bus_error(error, done);
+    }
+    return PyLong_FromSsize_t(done);
+#else
+    (void)buffer_obj; (void)fd; (void)address; (void)count; (void)period_ns;
+    PyErr_SetString(PyExc_NotImplementedError, "i2c-dev acquisition is available on Linux only");
+    return NULL;
+#endif
+}
+
+// ---------------------------------------------------------------
+// Simulated source: emulates bus latency and a rippling rail
+// ---------------------------------------------------------------
+static PyObject* read_simulated(PyObject* self, PyObject* args, PyObject* kwargs) {
+    static char* keywords[] = {"buffer", "count", "period_ns", "latency_ns", "shunt", "bus", "calibration", "ripple",
+                               "fail_after", NULL};
+    PyObject* buffer_obj;
+    Py_ssize_t count;
+    long long period_ns = 0, latency_ns = 0;
+    int shunt = 2000, bus = 7500, calibration = 2048, ripple = 0;
+    Py_ssize_t fail_after = -1;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "On|LLiiiin", keywords, &buffer_obj, &count, &period_ns, &latency_ns,
+                                     &shunt, &bus, &calibration, &ripple, &fail_after)) {
+        return NULL;
+    }
+    Py_buffer view;
+    if (get_record_buffer(buffer_obj, &view, count) < 0) {
+        return NULL;
+    }
+
+    sample_record_t* records = (sample_record_t*)view.buf;
+    Py_ssize_t i = 0;
+
+    Py_BEGIN_ALLOW_THREADS
+    int64_t deadline = monotonic_ns();
+    for (; i < count && i != fail_after; i++) {
+        // four register transactions per sample, as on the real bus
+        sleep_ns(4 * latency_ns);
+        int32_t value = shunt;
+        if (ripple > 0) {
+            int32_t phase = (int32_t)(i % (4 * ripple));
+            value += (phase < 2 * ripple ? phase : 4 * ripple - phase) - ripple;
+        }
+        if (value > INT16_MAX) value = INT16_MAX;
+        if (value < INT16_MIN) value = INT16_MIN;
+        int32_t current = (int32_t)(((int64_t)value * calibration) / 2048);
+        if (current > INT16_MAX) current = INT16_MAX;
+        if (current < INT16_MIN) current = INT16_MIN;
+        int64_t power = ((int64_t)(current < 0 ? -current : current) * (bus & 0x7FFF)) / 20000;
+
+        sample_record_t* record = &records[i];
+        record->timestamp_ns = monotonic_ns();
+        record->shunt = (int16_t)value;
+        record->bus = (uint16_t)(bus & 0x7FFF);
+        record->current = (int16_t)current;
+        record->power = (uint16_t)(power > 0xFFFF ? 0xFFFF : power);
+        if (period_ns > 0) {
+            deadline += period_ns;
+            sleep_until_ns(deadline);
+        }
+    }
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&view);
+    if (i < count) {
+        return raise_bus_error(EIO, i);     // simulated bus error after `fail_after` samples
+    }
+    return PyLong_FromSsize_t(count);
+}
+
+// Method table for the module
+static PyMethodDef Ina236SamplerMethods[] = {
+    {"read_i2c", (PyCFunction)(void(*)(void))read_i2c, METH_VARARGS | METH_KEYWORDS,
+     "read_i2c(buffer, fd, address, count, period_ns=0) -> int\n"
+     "Acquire `count` samples from an INA236 through an open i2c-dev file descriptor without the GIL.\n"
+     "A bus error raises OSError; its `records` attribute is the number of samples stored before it."},
+    {"read_simulated", (PyCFunction)(void(*)(void))read_simulated, METH_VARARGS | METH_KEYWORDS,
+     "read_simulated(buffer, count, period_ns=0, latency_ns=0, shunt=2000, bus=7500, calibration=2048, ripple=0,\n"
+     "               fail_after=-1) -> int\n"
+     "Acquire `count` simulated samples without the GIL; `fail_after` >= 0 simulates a bus error (EIO) after that many."},
+    {NULL, NULL, 0, NULL}  // Sentinel value
+};
+
+// Module definition
+static struct PyModuleDef ina236samplermodule = {
+    PyModuleDef_HEAD_INIT,
+    "ina236sampler",   // Module name
+    "GIL-released INA236 acquisition loop",  // Module docstring
+    -1,          // Size of per-interpreter state of the module
+    Ina236SamplerMethods  // Method table
+};
+
+// Module initialization function
+PyMODINIT_FUNC PyInit_ina236sampler(void) {
+    PyObject* m = PyModule_Create(&ina236samplermodule);
+    if (m == NULL) {
+        return NULL;
+    }
+    if (PyModule_AddIntConstant(m, "RECORD_SIZE", (long)RECORD_SIZE) < 0 ||
+        PyModule_AddStringConstant(m, "RECORD_FORMAT", RECORD_FORMAT) < 0) {
+        Py_DECREF(m);
+        return NULL;
+    }
+    return m;
+}
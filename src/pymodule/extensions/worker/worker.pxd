@@ -0,0 +1,43 @@
+# src/pymodule/extensions/worker/worker.pxd
+
+# Numeric kernels of the worker extension, for other Cython modules:
+#     from pymodule.extensions.worker.worker cimport numeric, sum_float_kernel
+# Kernels take C-contiguous typed memoryviews, run without the GIL and do no
+# bounds or length checks: the caller passes buffers of matching length.
+
+from libc.stdint cimport int32_t, int64_t, uint64_t
+
+ctypedef fused integral:
+    int32_t
+    int64_t
+
+ctypedef fused real:
+    float
+    double
+
+ctypedef fused numeric:
+    int32_t
+    int64_t
+    float
+    double
+
+# Sum with 64-bit wrap around
+cdef int64_t sum_int_kernel(const integral[::1] values) noexcept nogil
+# Exact sum of at most 2**31 values, as high * 2**32 + low
+cdef void sum_int_exact_kernel(const integral[::1] values, int64_t *high, uint64_t *low) noexcept nogil
+# Sum accumulated in double
+cdef double sum_float_kernel(const real[::1] values) noexcept nogil
+# Compensated (Kahan-Babuska/Neumaier) sum accumulated in double
+cdef double sum_kahan_kernel(const real[::1] values) noexcept nogil
+# Pairwise sum accumulated in double: rounding error grows with log(n) instead of n
+cdef double sum_pairwise_kernel(const real[::1] values) noexcept nogil
+# Dot product accumulated in double
+cdef double dot_kernel(const numeric[::1] a, const numeric[::1] b) noexcept nogil
+# values[i] *= factor
+cdef void scale_kernel(numeric[::1] values, numeric factor) noexcept nogil
+# out[i] = a[i] + b[i]; out may be a or b
+cdef void add_kernel(const numeric[::1] a, const numeric[::1] b, numeric[::1] out) noexcept nogil
+# out[i] = values[0] + ... + values[i]; out may be values
+cdef void prefix_sum_kernel(const numeric[::1] values, numeric[::1] out) noexcept nogil
+# Smallest and largest value of a non-empty buffer
+cdef void min_max_kernel(const numeric[::1] values, numeric *low, numeric *high) noexcept nogil
@@ -1,10 +1,23 @@
 # src/pymodule/cyth/worker.pyx
 
+import os
+import queue
+import threading
 import time
+from array import array
+from concurrent.futures import Future
+cimport cython
+from libc.math cimport fabs
+from libc.limits cimport INT_MAX
+from libc.stdint cimport int64_t, uint64_t
 from pymodule.logger import get_app_logger
+from pymodule_capi cimport PymoduleCAPI, Pymodule_ImportCAPI
 
 logger = get_app_logger(__name__)
 
+# C API of cmodulea: its kernels are called as plain C functions
+cdef const PymoduleCAPI *capi = Pymodule_ImportCAPI()
+
 def worker_func():
     logger.info("Worker")
     for i in range(5):
@@ -13,22 +26,421 @@ def worker_func():
 
 def cython_benchmark(int n):
     cdef int i
+    cdef unsigned int result = 0
     start_time = time.time()
 
-    # Perform the sum of squares calculation in a Cythonized loop
-    result = 0
+    # Call the C level kernel directly, without a Python call per iteration
     for i in range(n):
-        cython_fibonacci(300)
+        result += _fibonacci(300)
 
     end_time = time.time()
     diff = ((end_time - start_time) * 1000.0)
-    logger.info(f"Cython function executed in {diff:03.6f} milliseconds")
+    logger.info(f"Cython function executed in {diff:03.6f} milliseconds, {result}")
     return diff
 
-def cython_fibonacci(int n):
-    cdef int a = 0, b = 1, temp, i
+cdef inline unsigned int _fibonacci(int n) noexcept nogil:
+    # unsigned arithmetic: wraps around instead of overflowing
+    cdef unsigned int a = 0, b = 1, temp
+    cdef int i
     for i in range(n):
         temp = a
         a = b
         b = temp + b
     return a
+
+def cython_fibonacci(int n):
+    return <int>_fibonacci(n)
+
+def capi_fibonacci(int n):
+    """n-th Fibonacci number modulo 2**64, computed by cmodulea through its C API."""
+    return capi.fibonacci(n)
+
+def capi_benchmark(int n):
+    cdef uint64_t result
+    cdef double start, diff
+    with nogil:
+        start = capi.monotonic_ms()
+        result = capi.fibonacci_sum(300, n)
+        diff = capi.monotonic_ms() - start
+    logger.info(f"Cython through C API executed in {diff:03.6f} milliseconds")
+    return diff
+
+# ================================================================
+#  Numeric kernels, declared in worker.pxd
+# ================================================================
+cdef enum:
+    PAIRWISE_BLOCK = 128            # leaves of the pairwise sum are summed in a plain loop
+    EXACT_SUM_BLOCK = 1 << 30       # values per sum_int_exact_kernel call, must stay <= 2**31
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef int64_t sum_int_kernel(const integral[::1] values) noexcept nogil:
+    # unsigned accumulator: wraps around instead of overflowing
+    cdef uint64_t total = 0
+    cdef Py_ssize_t i
+    for i in range(values.shape[0]):
+        total += <uint64_t>values[i]
+    return <int64_t>total
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void sum_int_exact_kernel(const integral[::1] values, int64_t *high, uint64_t *low) noexcept nogil:
+    # split every value into its upper (signed) and lower (unsigned) 32 bits,
+    # neither half-sum can overflow for up to 2**31 values
+    cdef int64_t high_total = 0, value
+    cdef uint64_t low_total = 0
+    cdef Py_ssize_t i
+    for i in range(values.shape[0]):
+        value = values[i]
+        high_total += value >> 32
+        low_total += <uint64_t>value & 0xFFFFFFFFu
+    high[0] = high_total
+    low[0] = low_total
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double sum_float_kernel(const real[::1] values) noexcept nogil:
+    cdef double total = 0.0
+    cdef Py_ssize_t i
+    for i in range(values.shape[0]):
+        total += values[i]
+    return total
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double sum_kahan_kernel(const real[::1] values) noexcept nogil:
+    cdef double total = 0.0, compensation = 0.0, value, t
+    cdef Py_ssize_t i
+    for i in range(values.shape[0]):
+        value = values[i]
+        t = total + value
+        if fabs(total) >= fabs(value):
+            compensation += (total - t) + value
+        else:
+            compensation += (value - t) + total
+        total = t
+    return total + compensation
+
+cdef double _pairwise_sum(const real *values, Py_ssize_t n) noexcept nogil:
+    cdef double total
+    cdef Py_ssize_t i, half
+    if n <= PAIRWISE_BLOCK:
+        total = 0.0
+        for i in range(n):
+            total += values[i]
+        return total
+    half = n // 2
+    return _pairwise_sum(values, half) + _pairwise_sum(values + half, n - half)
+
+cdef double sum_pairwise_kernel(const real[::1] values) noexcept nogil:
+    if values.shape[0] == 0:
+        return 0.0
+    return _pairwise_sum(&values[0], values.shape[0])
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double dot_kernel(const numeric[::1] a, const numeric[::1] b) noexcept nogil:
+    cdef double total = 0.0
+    cdef Py_ssize_t i
+    for i in range(a.shape[0]):
+        total += <double>a[i] * <double>b[i]
+    return total
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void scale_kernel(numeric[::1] values, numeric factor) noexcept nogil:
+    cdef Py_ssize_t i
+    for i in range(values.shape[0]):
+        values[i] = values[i] * factor
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void add_kernel(const numeric[::1] a, const numeric[::1] b, numeric[::1] out) noexcept nogil:
+    cdef Py_ssize_t i
+    for i in range(out.shape[0]):
+        out[i] = a[i] + b[i]
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void prefix_sum_kernel(const numeric[::1] values, numeric[::1] out) noexcept nogil:
+    cdef numeric total = 0
+    cdef Py_ssize_t i
+    for i in range(out.shape[0]):
+        total = total + values[i]
+        out[i] = total
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void min_max_kernel(const numeric[::1] values, numeric *low, numeric *high) noexcept nogil:
+    cdef numeric lo = values[0], hi = values[0], value
+    cdef Py_ssize_t i
+    for i in range(1, values.shape[0]):
+        value = values[i]
+        if value < lo:
+            lo = value
+        elif value > hi:
+            hi = value
+    low[0] = lo
+    high[0] = hi
+
+# ================================================================
+#  Python wrappers: any C-contiguous int32/int64/float32/float64 buffer
+#  (array.array, memoryview, numpy array); the GIL is released
+# ================================================================
+cdef _check_lengths(Py_ssize_t a, Py_ssize_t b):
+    if a != b:
+        raise ValueError(f"Buffers have different lengths: {a} and {b}")
+
+def array_sum(const numeric[::1] values):
+    """Sum of the values; integers wrap around at 64 bits, floats are summed in double."""
+    cdef int64_t int_total
+    cdef double float_total
+    if numeric is float or numeric is double:
+        with nogil:
+            float_total = sum_float_kernel(values)
+        return float_total
+    else:
+        with nogil:
+            int_total = sum_int_kernel(values)
+        return int_total
+
+def array_sum_exact(const integral[::1] values):
+    """Exact sum of an integer buffer, as a Python int."""
+    cdef int64_t high
+    cdef uint64_t low
+    cdef Py_ssize_t start, end, n = values.shape[0]
+    total = 0
+    for start in range(0, n, EXACT_SUM_BLOCK):
+        end = min(start + EXACT_SUM_BLOCK, n)
+        with nogil:
+            sum_int_exact_kernel(values[start:end], &high, &low)
+        total += (<object>high << 32) + <object>low
+    return total
+
+def array_sum_kahan(const real[::1] values):
+    """Compensated sum of a float buffer, nearly independent of the number of values."""
+    cdef double total
+    with nogil:
+        total = sum_kahan_kernel(values)
+    return total
+
+def array_sum_pairwise(const real[::1] values):
+    """Pairwise sum of a float buffer, about as fast as the plain sum."""
+    cdef double total
+    with nogil:
+        total = sum_pairwise_kernel(values)
+    return total
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def array_fill_float(double[::1] out, list values):
+    """out[i] = float(values[i]) for a list no longer than `out`; returns the number of values."""
+    cdef Py_ssize_t i, n = len(values)
+    if n > out.shape[0]:
+        raise ValueError(f"{n} values do not fit into a buffer of {out.shape[0]}")
+    for i in range(n):
+        out[i] = values[i]
+    return n
+
+def array_dot(const numeric[::1] a, const numeric[::1] b):
+    """Dot product of two buffers of the same type, accumulated in double."""
+    cdef double total
+    _check_lengths(a.shape[0], b.shape[0])
+    with nogil:
+        total = dot_kernel(a, b)
+    return total
+
+def array_scale(numeric[::1] values, numeric factor):
+    """Multiply the values in place by `factor`."""
+    with nogil:
+        scale_kernel(values, factor)
+
+def array_add(const numeric[::1] a, const numeric[::1] b, numeric[::1] out):
+    """out = a + b element by element; `out` may be `a` or `b`."""
+    _check_lengths(a.shape[0], b.shape[0])
+    _check_lengths(a.shape[0], out.shape[0])
+    with nogil:
+        add_kernel(a, b, out)
+
+def array_prefix_sum(const numeric[::1] values, numeric[::1] out):
+    """Running totals of `values` into `out`; `out` may be `values`."""
+    _check_lengths(values.shape[0], out.shape[0])
+    with nogil:
+        prefix_sum_kernel(values, out)
+
+def array_min_max(const numeric[::1] values):
+    """(smallest, largest) value of a non-empty buffer."""
+    cdef numeric low, high
+    if values.shape[0] == 0:
+        raise ValueError("array_min_max() of an empty buffer")
+    with nogil:
+        min_max_kernel(values, &low, &high)
+    return low, high
+
+# ================================================================
+#  Batch task scheduler
+# ================================================================
+ctypedef uint64_t (*task_kernel)(int64_t) noexcept nogil
+
+cdef uint64_t _task_fibonacci(int64_t n) noexcept nogil:
+    # n-th Fibonacci number modulo 2**64 from cmodulea's C API; submit keeps n <= INT_MAX
+    return capi.fibonacci(<int>n if n > 0 else 0)
+
+cdef uint64_t _task_collatz(int64_t n) noexcept nogil:
+    # steps of the Collatz sequence from n down to 1
+    cdef uint64_t value = <uint64_t>n, steps = 0
+    if n <= 0:
+        return 0
+    while value != 1:
+        value = value // 2 if value % 2 == 0 else 3 * value + 1
+        steps += 1
+    return steps
+
+cdef task_kernel _task_kernel(str name) except NULL:
+    if name == "fibonacci":
+        return _task_fibonacci
+    if name == "collatz":
+        return _task_collatz
+    raise ValueError(f"Unknown task kernel '{name}', expected one of {TASK_KERNELS}")
+
+TASK_KERNELS = ("fibonacci", "collatz")
+
+def task_fibonacci(int n):
+    """Single job of the "fibonacci" kernel: n-th Fibonacci number modulo 2**64."""
+    return _task_fibonacci(n)
+
+def task_collatz(int64_t n):
+    """Single job of the "collatz" kernel: Collatz steps from n to 1."""
+    return _task_collatz(n)
+
+cdef class _Batch:
+    cdef task_kernel kernel
+    cdef const int64_t[::1] args
+    cdef uint64_t[::1] results
+    cdef object output          # array('Q') returned by the future
+    cdef object future
+    cdef Py_ssize_t size
+    cdef Py_ssize_t remaining   # items not computed yet, guarded by the scheduler lock
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void run(self, Py_ssize_t start, Py_ssize_t end) noexcept:
+        cdef Py_ssize_t i
+        with nogil:
+            for i in range(start, end):
+                self.results[i] = self.kernel(self.args[i])
+
+cdef class BatchScheduler:
+    """Runs batches of homogeneous jobs on a fixed pool of threads, without one Python call per job.
+
+    Every batch is one `submit` of the job arguments (int64); the worker threads take
+    it chunk by chunk and run the C kernel over each chunk with the GIL released. The
+    returned Future resolves to an array('Q') with one result per job, in order.
+    At most `max_pending` jobs are queued: `submit` blocks (up to `timeout`) until
+    earlier batches are done; a single batch larger than the limit is accepted when
+    nothing else is pending.
+    """
+    cdef task_kernel kernel
+    cdef readonly str kernel_name
+    cdef readonly int workers
+    cdef readonly Py_ssize_t max_pending
+    cdef readonly Py_ssize_t chunk_size
+    cdef readonly Py_ssize_t pending
+    cdef object _queue
+    cdef object _space          # condition on `pending`, also guards _Batch.remaining
+    cdef list _threads
+    cdef bint _shutdown
+
+    def __init__(self, str kernel="fibonacci", int workers=0, Py_ssize_t max_pending=1 << 20, Py_ssize_t chunk_size=1024):
+        if workers < 0 or max_pending <= 0 or chunk_size <= 0:
+            raise ValueError("workers must be >= 0, max_pending and chunk_size > 0")
+        self.kernel = _task_kernel(kernel)
+        self.kernel_name = kernel
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.chunk_size = chunk_size
+        self.pending = 0
+        self._queue = queue.SimpleQueue()
+        self._space = threading.Condition()
+        self._shutdown = False
+        self._threads = [threading.Thread(target=self._work, name=f"batch-scheduler-{i}", daemon=True)
+                         for i in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def _work(self):
+        cdef _Batch batch
+        cdef Py_ssize_t start, end
+        while True:
+            task = self._queue.get()
+            if task is None:
+                return
+            batch, start, end = task
+            batch.run(start, end)
+            with self._space:
+                batch.remaining -= end - start
+                if batch.remaining:
+                    continue
+                self.pending -= batch.size
+                self._space.notify_all()
+            batch.future.set_result(batch.output)
+
+    def submit(self, items, timeout=None):
+        """Queue one batch of job arguments (buffer or iterable of ints); returns a Future.
+
+        :raises TimeoutError: If there is no room for the batch within `timeout` seconds
+        :raises RuntimeError: After `shutdown`
+        """
+        cdef _Batch batch = _Batch()
+        cdef Py_ssize_t start
+        cdef int64_t low, high
+        batch.args = items if isinstance(items, array) and items.typecode == "q" else array("q", items)
+        batch.size = batch.args.shape[0]
+        if self.kernel == _task_fibonacci and batch.size:
+            min_max_kernel(batch.args, &low, &high)
+            if high > INT_MAX:
+                raise OverflowError(f"fibonacci job argument {high} is larger than {INT_MAX}")
+        batch.output = array("Q", bytes(8 * batch.size))
+        batch.results = batch.output
+        batch.kernel = self.kernel
+        batch.remaining = batch.size
+        batch.future = Future()
+        batch.future.set_running_or_notify_cancel()
+        if batch.size == 0:
+            batch.future.set_result(batch.output)
+            return batch.future
+        with self._space:
+            if not self._space.wait_for(lambda: self._shutdown or self.pending == 0
+                                        or self.pending + batch.size <= self.max_pending, timeout):
+                raise TimeoutError(f"no room for {batch.size} jobs within {timeout} s ({self.pending} pending)")
+            # also when shutdown came while waiting for room: the workers are stopping
+            if self._shutdown:
+                raise RuntimeError("cannot submit after shutdown")
+            self.pending += batch.size
+            # queued under the lock, so shutdown's stop markers always come after accepted batches
+            for start in range(0, batch.size, self.chunk_size):
+                self._queue.put((batch, start, min(start + self.chunk_size, batch.size)))
+        return batch.future
+
+    def map(self, items):
+        """Run one batch and wait for its results."""
+        return self.submit(items).result()
+
+    def shutdown(self, bint wait=True):
+        """Stop the worker threads after the queued batches are done; blocked `submit` calls raise RuntimeError."""
+        with self._space:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            self._space.notify_all()
+            for _ in self._threads:
+                self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.shutdown()
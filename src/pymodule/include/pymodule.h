@@ -1,5 +1,84 @@
 // src/pymodule/pymodule.h
 // C header file for pymodule extensions
 
+#ifndef PYMODULE_H
+#define PYMODULE_H
 
-// End of pymodule.h
\ No newline at end of file
+#include <Python.h>
+#include <stdint.h>
+#include <limits.h>
+
+// ================================================================
+//  METH_FASTCALL argument helpers
+// ================================================================
+// Hand written fast paths for the common signatures: no argument tuple is
+// built and no format string is parsed.
+
+// f(n: int) with exactly one positional int argument
+static inline int Pymodule_ParseIntArg(PyObject *const *args, Py_ssize_t nargs, const char *fname, int *out)
+{
+    if (nargs != 1) {
+        PyErr_Format(PyExc_TypeError, "%s() takes exactly one argument (%zd given)", fname, nargs);
+        return -1;
+    }
+    long value = PyLong_AsLong(args[0]);
+    if (value == -1 && PyErr_Occurred()) {
+        return -1;
+    }
+    if (value < INT_MIN || value > INT_MAX) {
+        PyErr_Format(PyExc_OverflowError, "%s(): argument out of range for a C int", fname);
+        return -1;
+    }
+    *out = (int)value;
+    return 0;
+}
+
+// ================================================================
+//  C API of cmodulea, exported as a PyCapsule
+// ================================================================
+// Other extensions call the kernels of cmodulea through this table instead of
+// through Python objects. Fields are only ever appended; check `version`
+// before using a field added after version 1.
+
+#define PYMODULE_CAPI_MODULE "pymodule.extensions.cmodulea.cmodulea"
+#define PYMODULE_CAPI_NAME PYMODULE_CAPI_MODULE "._C_API"
+#define PYMODULE_CAPI_VERSION 1
+
+typedef struct {
+    int version;
+    // n-th Fibonacci number, modulo 2**64
+    uint64_t (*fibonacci)(int n);
+    // sum of `iterations` evaluations of fibonacci(n), modulo 2**64
+    uint64_t (*fibonacci_sum)(int n, Py_ssize_t iterations);
+    // monotonic clock in milliseconds
+    double (*monotonic_ms)(void);
+} PymoduleCAPI;
+
+// Import the table (imports cmodulea if needed). Returns NULL with an exception set on failure.
+static inline const PymoduleCAPI *Pymodule_ImportCAPI(void)
+{
+    // not PyCapsule_Import: it walks package attributes, which are not set yet
+    // while the pymodule package itself is still being imported
+    PyObject *module = PyImport_ImportModule(PYMODULE_CAPI_MODULE);
+    if (module == NULL) {
+        return NULL;
+    }
+    PyObject *capsule = PyObject_GetAttrString(module, "_C_API");
+    Py_DECREF(module);
+    if (capsule == NULL) {
+        return NULL;
+    }
+    const PymoduleCAPI *api = (const PymoduleCAPI *)PyCapsule_GetPointer(capsule, PYMODULE_CAPI_NAME);
+    // cmodulea keeps the table alive as long as it is loaded, and extension modules are never unloaded
+    Py_DECREF(capsule);
+    if (api != NULL && api->version < PYMODULE_CAPI_VERSION) {
+        PyErr_Format(PyExc_ImportError, "%s: C API version %d, at least %d required",
+                     PYMODULE_CAPI_NAME, api->version, PYMODULE_CAPI_VERSION);
+        return NULL;
+    }
+    return api;
+}
+
+#endif // PYMODULE_H
+
+// End of pymodule.h
@@ -0,0 +1,15 @@
+# src/pymodule/include/pymodule_capi.pxd
+# Cython declarations of the C API table in pymodule.h
+
+from libc.stdint cimport uint64_t
+
+cdef extern from "pymodule.h":
+    const int PYMODULE_CAPI_VERSION
+
+    ctypedef struct PymoduleCAPI:
+        int version
+        uint64_t (*fibonacci)(int n) noexcept nogil
+        uint64_t (*fibonacci_sum)(int n, Py_ssize_t iterations) noexcept nogil
+        double (*monotonic_ms)() noexcept nogil
+
+    const PymoduleCAPI *Pymodule_ImportCAPI() except NULL
@@ -134,6 +134,19 @@ class StringHandler(logging.Handler):
 
 string_handler_instance = None  # global to reuse
 
+# ================================================================
+#  Map verbosity → logging level
+# ================================================================
+VERBOSITY_LEVELS = {
+    0: logging.CRITICAL,
+    1: logging.ERROR,
+    2: logging.WARNING,
+    3: QUIET_LEVEL,
+    4: logging.INFO,
+    5: VERBOSE_LEVEL,
+    6: logging.DEBUG,
+}
+
 # ================================================================
 #  Main setup function (no duplicate handlers)
 # ================================================================
@@ -146,20 +159,7 @@ def setup_logging(verbosity: int = 3,
     and optional string handler.
     """
 
-    # -----------------------------------------
-    # Map verbosity → logging level
-    # -----------------------------------------
-    LEVELS = {
-        0: logging.CRITICAL,
-        1: logging.ERROR,
-        2: logging.WARNING,
-        3: QUIET_LEVEL,
-        4: logging.INFO,
-        5: VERBOSE_LEVEL,
-        6: logging.DEBUG,
-    }
-
-    level = LEVELS.get(verbosity, logging.INFO)
+    level = VERBOSITY_LEVELS.get(verbosity, logging.INFO)
 
     root = logging.getLogger()
     root.setLevel(level)
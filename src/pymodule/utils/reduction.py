@@ -0,0 +1,116 @@
+# utils/reduction.py
+
+# Bulk version of `sumator`: sums of large numeric buffers and streams.
+
+import math
+from array import array
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from pymodule.extensions.worker import array_sum, array_sum_exact, array_sum_kahan, array_sum_pairwise, array_fill_float
+
+# float summation methods
+SIMPLE = "simple"       # one running double, error grows with the number of values
+KAHAN = "kahan"         # compensated, nearly exact, about 4x the work of SIMPLE
+PAIRWISE = "pairwise"   # error grows with log(n), as fast as SIMPLE
+
+DEFAULT_CHUNK_SIZE = 65536  # values taken from an iterator at a time
+
+Number = Union[int, float]
+
+_FLOAT_KERNELS: Dict[str, Callable[[Any], float]] = {
+    SIMPLE: array_sum,
+    KAHAN: array_sum_kahan,
+    PAIRWISE: array_sum_pairwise,
+}
+_INT_FORMATS = frozenset("ilq")     # signed formats the kernels take when 4 or 8 bytes wide
+_FLOAT_FORMATS = frozenset("fd")
+
+def _flat_view(values: Any) -> memoryview:
+    """One-dimensional, C-contiguous view of a buffer; non-contiguous buffers are copied."""
+    view = memoryview(values)
+    if view.ndim == 1 and view.c_contiguous:
+        return view
+    item_format: Any = view.format
+    try:
+        if view.c_contiguous:
+            return view.cast("B").cast(item_format)
+        return memoryview(view.tobytes()).cast(item_format)
+    except ValueError as e:
+        raise TypeError(f"Unsupported buffer format '{view.format}'") from e
+
+def _chunks(values: Iterable[Any], chunk_size: int) -> Iterator[List[Any]]:
+    iterator = iter(values)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def _buffer_sum(view: memoryview, method: str, chunk_size: int) -> Number:
+    if view.format in _FLOAT_FORMATS:
+        return _FLOAT_KERNELS[method](view)
+    if view.format in _INT_FORMATS and view.itemsize in (4, 8):
+        return int(array_sum_exact(view))
+    # other item types (8/16 bit, unsigned 64 bit, bool): sliced into lists
+    try:
+        return _iterable_sum((view[start:start + chunk_size].tolist() for start in range(0, len(view), chunk_size)),
+                             method, chunk_size, pre_chunked=True)
+    except NotImplementedError as e:
+        raise TypeError(f"Unsupported buffer format '{view.format}'") from e
+
+def _iterable_sum(values: Iterable[Any], method: str, chunk_size: int, pre_chunked: bool = False) -> Number:
+    """Sum chunk by chunk: int chunks exactly with sum(), float chunks with the float kernel of `method`."""
+    kernel = _FLOAT_KERNELS[method]
+    buffer: Optional[memoryview] = None
+    int_total: Number = 0
+    float_parts: List[float] = []
+
+    def float_sum(chunk: List[Any]) -> float:
+        nonlocal buffer
+        if buffer is None or len(buffer) < len(chunk):
+            buffer = memoryview(array("d", [0.0]) * max(len(chunk), chunk_size))
+        return kernel(buffer[:array_fill_float(buffer, chunk)])
+
+    for chunk in values if pre_chunked else _chunks(values, chunk_size):
+        if type(chunk[0]) is float and method != SIMPLE:    # pylint: disable=unidiomatic-typecheck
+            try:
+                float_parts.append(float_sum(chunk))
+                continue
+            except TypeError:
+                pass    # not all numbers
+        part = sum(chunk)
+        if isinstance(part, float) and method != SIMPLE:
+            # ints mixed with floats: sum the chunk again with compensation
+            part = float_sum(chunk)
+        if isinstance(part, float):
+            float_parts.append(part)
+        else:
+            int_total += part
+    if not float_parts:
+        return int_total
+    if method == SIMPLE:
+        return int_total + sum(float_parts)
+    return math.fsum(float_parts + [int_total])
+
+def sum_values(values: Any, method: str = PAIRWISE, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Number:
+    """Sum of a buffer (array.array, memoryview, numpy array, ...) or an iterable of numbers.
+
+    int32/int64/float32/float64 buffers are summed by the compiled kernels of the worker
+    extension without the GIL; integer sums are exact. Iterables are consumed `chunk_size`
+    values at a time, so iterators of any length run in bounded memory; lists are summed
+    in one piece. `method` selects the float summation: SIMPLE, KAHAN or PAIRWISE.
+    """
+    if method not in _FLOAT_KERNELS:
+        raise ValueError(f"Unknown summation method '{method}'")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    try:
+        view = _flat_view(values)
+    except TypeError:
+        if isinstance(values, (str, bytes)) or not isinstance(values, Iterable):
+            raise TypeError(f"Cannot sum a '{type(values).__name__}'") from None
+        if isinstance(values, list):
+            return _iterable_sum([values] if values else [], method, chunk_size, pre_chunked=True)
+        return _iterable_sum(values, method, chunk_size)
+    return _buffer_sum(view, method, chunk_size)
@@ -0,0 +1,99 @@
+# test_daemon.py
+
+import io
+import json
+import logging
+import os
+import socket
+import stat
+import threading
+
+import pytest
+
+from pymodule.cli import daemon
+from pymodule.cli.client import run_remote, shutdown_daemon
+from pymodule.cli.daemon import DaemonServer
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    jobs = []
+
+    def fake_run_app(cfg):
+        jobs.append(cfg.config)
+        logging.getLogger("pymodule.test").info("job param1=%s", cfg.config['parameters']['param1'])
+        print("hello from job")
+        if cfg.config['parameters']['param2'] == 13:
+            raise RuntimeError("unlucky")
+
+    monkeypatch.setattr(daemon, "run_app", fake_run_app)
+    srv = DaemonServer(str(tmp_path / "d.sock"))
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    srv.jobs_seen = jobs
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+    thread.join()
+
+class TestDaemon:
+    def run(self, server, argv, env=None):
+        out, err = io.StringIO(), io.StringIO()
+        code = run_remote(argv, server.socket_path, env=env or {}, stdout=out, stderr=err)
+        return code, out.getvalue(), err.getvalue()
+
+    def test_job_streams_output(self, server):
+        code, out, _ = self.run(server, ["--no-config", "--verbose", "4", "--no-log-prefix", "--no-use-color", "--param1", "7"])
+        assert code == 0
+        assert "job param1=7\n" in out
+        assert "hello from job" in out
+
+    def test_env_is_forwarded_and_jobs_are_isolated(self, server):
+        self.run(server, ["--no-config", "--param1", "5"], env={"PYMODULE_INPUT_FILE": "in.txt"})
+        self.run(server, ["--no-config"])
+        first, second = server.jobs_seen
+        assert first['parameters']['param1'] == 5 and first['positionals']['input_file'] == "in.txt"
+        assert second['parameters']['param1'] == 1 and second['positionals']['input_file'] == ""
+
+    def test_errors(self, server):
+        code, out, _ = self.run(server, ["--no-config", "--param2", "13", "--no-log-prefix", "--no-use-color"])
+        assert code == 1 and "Application terminated: unlucky" in out
+        code, _, err = self.run(server, ["--no-such-option"])
+        assert code == 2 and "usage:" in err
+
+    def test_shutdown(self, tmp_path):
+        srv = DaemonServer(str(tmp_path / "s.sock"))
+        thread = threading.Thread(target=srv.serve_forever, daemon=True)
+        thread.start()
+        shutdown_daemon(srv.socket_path)
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+        srv.server_close()
+
+    @pytest.mark.parametrize("line", [b"not json\n", b"[1, 2]\n", b'{"command": "run"}\n', b'{"argv": "--help"}\n',
+                                      b"\xff\xfe\n"])
+    def test_malformed_request(self, server, line):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(server.socket_path)
+            sock.sendall(line)
+            replies = [json.loads(reply) for reply in sock.makefile("rb")]
+        assert "Malformed daemon request" in replies[0]["stderr"]
+        assert replies[-1] == {"exit": 2}
+        assert self.run(server, ["--no-config"])[0] == 0     # the daemon keeps serving
+
+    def test_socket_is_private(self, server):
+        assert stat.S_IMODE(os.stat(server.socket_path).st_mode) == 0o600
+
+    def test_does_not_remove_foreign_files(self, tmp_path):
+        path = tmp_path / "d.sock"
+        path.write_text("not a socket")
+        with pytest.raises(RuntimeError, match="not a socket"):
+            DaemonServer(str(path))
+        assert path.read_text() == "not a socket"
+
+    def test_removes_stale_socket(self, tmp_path):
+        path = str(tmp_path / "d.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        srv = DaemonServer(path)
+        srv.server_close()
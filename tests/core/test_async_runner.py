@@ -0,0 +1,172 @@
+# test_async_runner.py
+
+import asyncio
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+
+from pymodule.core.async_runner import AppStep, StepResult, run_steps, run_steps_serially, INLINE, THREAD, PROCESS
+from pymodule.core.app_runner import app_steps
+from pymodule.core.benchmark import EXTRA_BENCHMARKS, subinterpreters_api
+from pymodule.core.config import Config
+
+def square(x):
+    return x * x
+
+def add(a, b):
+    return a + b
+
+def sleeper(seconds, barrier=None):
+    if barrier is not None:
+        barrier.wait(timeout=5)
+    time.sleep(seconds)
+    return seconds
+
+class TestRunSteps:
+    def test_dependencies_and_results(self):
+        steps = [
+            AppStep("a", square, (3,), PROCESS),
+            AppStep("b", square, (4,), THREAD),
+            AppStep("sum", add, (StepResult("a"), StepResult("b"))),
+        ]
+        assert asyncio.run(run_steps(steps)) == {"a": 9, "b": 16, "sum": 25}
+
+    def test_independent_steps_overlap(self):
+        barrier = threading.Barrier(3)
+        steps = [AppStep(f"s{i}", sleeper, (0.1, barrier), THREAD) for i in range(3)]
+        start = time.perf_counter()
+        asyncio.run(run_steps(steps, max_workers=3))
+        # the barrier only opens when all three run at the same time
+        assert time.perf_counter() - start < 0.3
+
+    def test_after_orders_steps(self):
+        order = []
+        steps = [
+            AppStep("second", order.append, ("second",), after=("first",)),
+            AppStep("first", lambda: order.append("first") or time.sleep(0.05), executor=THREAD),
+        ]
+        asyncio.run(run_steps(steps))
+        assert order == ["first", "second"]
+
+    def test_step_timeout_cancels_others(self):
+        started = []
+        steps = [
+            AppStep("slow", sleeper, (1.0,), THREAD, timeout=0.05),
+            AppStep("waiting", started.append, ("ran",), after=("never",)),
+            AppStep("never", sleeper, (0.5,), THREAD),
+        ]
+        start = time.perf_counter()
+        with pytest.raises(TimeoutError):
+            asyncio.run(run_steps(steps))
+        assert time.perf_counter() - start < 0.4
+        assert started == []
+
+    def test_overall_timeout(self):
+        with pytest.raises(TimeoutError):
+            asyncio.run(run_steps([AppStep("slow", sleeper, (1.0,), THREAD)], timeout=0.05))
+
+    def test_failure_is_reraised(self):
+        def fail():
+            raise ValueError("broken")
+        with pytest.raises(ValueError, match="broken"):
+            asyncio.run(run_steps([AppStep("fail", fail), AppStep("slow", sleeper, (0.2,), THREAD)]))
+
+    def test_cancellation(self):
+        async def main():
+            task = asyncio.create_task(run_steps([AppStep("slow", sleeper, (1.0,), THREAD)]))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await task
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(main())
+
+    @pytest.mark.parametrize("steps, message", [
+        ([AppStep("a", square), AppStep("a", square)], "unique"),
+        ([AppStep("a", square, executor="gpu")], "executor"),
+        ([AppStep("a", square, after=("b",))], "unknown step"),
+        ([AppStep("a", square, after=("b",)), AppStep("b", square, after=("a",))], "cycle"),
+    ])
+    def test_invalid_steps(self, steps, message):
+        with pytest.raises(ValueError, match=message):
+            asyncio.run(run_steps(steps))
+
+    def test_timeout_stops_process_steps(self):
+        # the interpreter must not wait at exit for a process step that is still running
+        script = textwrap.dedent("""
+            import asyncio, time
+            from pymodule.core.async_runner import AppStep, run_steps, PROCESS
+            try:
+                asyncio.run(run_steps([AppStep("slow", time.sleep, (60,), PROCESS)], timeout=0.5))
+            except TimeoutError:
+                print("timeout")
+        """)
+        start = time.perf_counter()
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        child = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=50, check=False, env=env)
+        assert child.stdout.strip() == "timeout"
+        assert time.perf_counter() - start < 30
+
+class TestRunStepsSerially:
+    def test_dependency_order_and_results(self):
+        order = []
+        def record(name, value=None):
+            order.append(name)
+            return value
+        steps = [
+            AppStep("sum", add, (StepResult("a"), StepResult("b"))),
+            AppStep("a", record, ("a", 3), PROCESS),
+            AppStep("b", record, ("b", 4), THREAD, after=("a",)),
+        ]
+        assert run_steps_serially(steps) == {"a": 3, "b": 4, "sum": 7}
+        assert order == ["a", "b"]
+
+    def test_invalid_steps(self):
+        with pytest.raises(ValueError, match="cycle"):
+            run_steps_serially([AppStep("a", square, after=("b",)), AppStep("b", square, after=("a",))])
+
+class TestAppSteps:
+    def test_app_steps(self):
+        steps = app_steps(Config(), iterations=10)
+        names = [step.name for step in steps]
+        assert "benchmark_report" in names and "file_pipeline" in names
+        report = steps[names.index("benchmark_report")]
+        assert report.dependencies() == ("python_benchmark", "cython_benchmark", "c_benchmark", "capi_benchmark")
+        assert steps[names.index("greetings")].executor == INLINE
+        assert "benchmark_sweep" not in names
+        assert not [name for name in names if name.endswith("_benchmark") and name not in
+                    ("python_benchmark", "cython_benchmark", "c_benchmark", "capi_benchmark")]
+
+    def test_app_steps_extra_benchmarks(self):
+        cfg = Config()
+        cfg.config['parameters']['extra_benchmarks'] = ["scheduler", "codec", "scheduler"]
+        names = [step.name for step in app_steps(cfg, iterations=10)]
+        assert names[-2:] == ["scheduler_benchmark", "codec_benchmark"]
+
+    def test_app_steps_all_benchmarks(self):
+        cfg = Config()
+        cfg.config['parameters']['extra_benchmarks'] = ["all"]
+        names = [step.name for step in app_steps(cfg, iterations=10)]
+        for name in EXTRA_BENCHMARKS:
+            if name != "subinterpreter_scaling":
+                assert f"{name}_benchmark" in names
+        assert ("subinterpreter_scaling_benchmark" in names) == (subinterpreters_api() is not None)
+
+    def test_app_steps_unknown_benchmark(self):
+        cfg = Config()
+        cfg.config['parameters']['extra_benchmarks'] = ["nonexistent"]
+        with pytest.raises(ValueError, match="Unknown benchmark 'nonexistent'"):
+            app_steps(cfg)
+
+    def test_app_steps_sweep(self):
+        cfg = Config()
+        cfg.config['parameters']['extra_benchmarks'] = ["scaling"]
+        cfg.config['parameters']['benchmark_sweep_csv'] = "sweep.csv"
+        steps = app_steps(cfg, iterations=10)
+        sweep = steps[-1]
+        assert sweep.name == "benchmark_sweep" and sweep.args == ("sweep.csv",)
+        assert "python_benchmark" in sweep.after and "scaling_benchmark" in sweep.after
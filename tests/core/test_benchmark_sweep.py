@@ -0,0 +1,58 @@
+# test_benchmark_sweep.py
+
+import csv
+
+import pytest
+
+from pymodule.core.benchmark import SweepPoint, CostModel, sweep_benchmark, fit_cost_model, best_backend, \
+    format_sweep_report, write_sweep_csv, benchmark_sweep
+
+def synthetic_points(backend, fixed, per_call, per_unit):
+    return [SweepPoint(backend, n, count, fixed + count * (per_call + n * per_unit))
+            for n in (1, 10, 100) for count in (10, 100, 1000)]
+
+class TestCostModel:
+    def test_fit_recovers_coefficients(self):
+        models = fit_cost_model(synthetic_points("slow", 1e-6, 300e-9, 50e-9) + synthetic_points("batch", 30e-6, 5e-9, 1e-9))
+        assert models["slow"].fixed == pytest.approx(1e-6)
+        assert models["slow"].per_call == pytest.approx(300e-9)
+        assert models["slow"].per_unit == pytest.approx(50e-9)
+        assert models["batch"].fixed == pytest.approx(30e-6)
+        assert models["slow"].max_error < 1e-9
+
+    def test_predict_and_best_backend(self):
+        models = {"calls": CostModel("calls", 0.0, 50e-9, 1e-9, 0.0), "batch": CostModel("batch", 30e-6, 5e-9, 1e-9, 0.0)}
+        assert models["calls"].predict(10, 100) == pytest.approx(100 * 60e-9)
+        assert best_backend(models, 10, 10) == "calls"          # the fixed cost dominates
+        assert best_backend(models, 10, 100000) == "batch"      # the per call cost dominates
+
+    def test_fit_needs_varied_points(self):
+        with pytest.raises(ValueError, match="cost model"):
+            fit_cost_model([SweepPoint("a", 1, 10, 1e-6)] * 3)
+
+class TestSweep:
+    def test_sweep_grid(self):
+        points = sweep_benchmark(sizes=(1, 8), iterations=(10, 100), max_units=100, repeat=1)
+        backends = {point.backend for point in points}
+        assert backends == {"Python", "Cython", "C", "C through C API", "BatchScheduler"}
+        assert all(point.n * point.iterations <= 100 and point.seconds > 0 for point in points)
+        assert len(points) == 3 * len(backends)     # (8, 100) is skipped
+
+    def test_report_and_csv(self, tmp_path):
+        points = synthetic_points("calls", 0.0, 50e-9, 1e-9) + synthetic_points("batch", 30e-6, 5e-9, 1e-9)
+        models = fit_cost_model(points)
+        report = format_sweep_report(models, sizes=(1, 10), iterations=(10, 100000))
+        assert "calls" in report.splitlines()[-2] and "batch" in report.splitlines()[-1]
+
+        path = tmp_path / "sweep.csv"
+        write_sweep_csv(str(path), points, models)
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == len(points)
+        assert float(rows[0]["predicted_seconds"]) == pytest.approx(float(rows[0]["seconds"]))
+
+    def test_benchmark_sweep(self, tmp_path):
+        path = tmp_path / "sweep.csv"
+        models = benchmark_sweep(str(path), sizes=(1, 16), iterations=(10, 100, 1000))
+        assert set(models) == {"Python", "Cython", "C", "C through C API", "BatchScheduler"}
+        assert path.read_text(encoding="utf-8").startswith("backend,n,iterations,seconds,predicted_seconds")
@@ -167,3 +167,18 @@ class TestConfig:
 
         }
         assert merged_config == expected_config  # No changes without CLI args
+
+    @pytest.mark.parametrize("option, value", [("--workers", "-1"), ("--workers", "two"), ("--chunk-size", "0")])
+    def test_rejects_out_of_range_options(self, option, value, capsys):
+        with pytest.raises(SystemExit):
+            core.config.parse_args([option, value])
+        assert option in capsys.readouterr().err
+
+    def test_accepts_zero_workers(self):
+        assert core.config.parse_args(["--workers", "0", "--chunk-size", "1"]).workers == 0
+
+    def test_extra_benchmarks_option(self, config_instance):
+        assert core.config.parse_args([]).extra_benchmarks is None
+        args = core.config.parse_args(["--benchmark", "codec", "--benchmark", "scaling"])
+        config_instance.merge_cli_options(args)
+        assert config_instance.config['parameters']['extra_benchmarks'] == ["codec", "scaling"]
@@ -0,0 +1,133 @@
+# test_file_pipeline.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pymodule.core import file_pipeline
+from pymodule.core.file_pipeline import process_file, process_file_parallel, record_ranges, run_file_pipeline, split_records, read_chunks
+
+@pytest.fixture
+def input_file(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_bytes(b"".join(b"record %d\n" % i for i in range(1000)) + b"tail without newline")
+    return path
+
+class TestFilePipeline:
+    @pytest.mark.parametrize("chunk_size", [1, 7, 4096, 1 << 20])
+    def test_split_records_across_chunks(self, input_file, chunk_size):
+        records = list(split_records(read_chunks(str(input_file), chunk_size)))
+        assert len(records) == 1001
+        assert records[5] == b"record 5\n"
+        assert b"".join(records) == input_file.read_bytes()
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5])
+    def test_split_records_multibyte_separator(self, chunk_size):
+        data = b"a\r\nbb\r\n\r\nccc\r"
+        chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+        assert list(split_records(chunks, b"\r\n")) == [b"a\r\n", b"bb\r\n", b"\r\n", b"ccc\r"]
+
+    def test_split_long_record(self):
+        chunks = [b"x" * 10] * 1000 + [b"\nend"]
+        records = list(split_records(chunks))
+        assert records == [b"x" * 10000 + b"\n", b"end"]
+
+    @pytest.mark.parametrize("mmap_threshold", [0, 1 << 30])
+    def test_identity_copy(self, input_file, tmp_path, mmap_threshold):
+        output = tmp_path / "output.txt"
+        stats = process_file(str(input_file), str(output), chunk_size=100, mmap_threshold=mmap_threshold)
+        assert output.read_bytes() == input_file.read_bytes()
+        assert stats.records_in == stats.records_out == 1001
+        assert stats.bytes_in == stats.bytes_out == input_file.stat().st_size
+
+    def test_stages(self, input_file, tmp_path):
+        output = tmp_path / "output.txt"
+        drop_odd = lambda r: None if r.rstrip().endswith((b"1", b"3", b"5", b"7", b"9")) else r
+        stats = process_file(str(input_file), str(output), stages=[drop_odd, bytes.upper], chunk_size=64)
+        lines = output.read_bytes().splitlines()
+        assert lines[:2] == [b"RECORD 0", b"RECORD 2"]
+        assert stats.records_out == 501
+
+    def test_bulk_writes(self, input_file, tmp_path, monkeypatch):
+        monkeypatch.setattr(file_pipeline, "DEFAULT_WRITE_BUFFER", 1000)
+        writes = []
+        original = file_pipeline.BufferedBulkWriter.flush
+        def spy(self):
+            writes.append(self._size)
+            original(self)
+        monkeypatch.setattr(file_pipeline.BufferedBulkWriter, "flush", spy)
+        process_file(str(input_file), str(tmp_path / "out.txt"), chunk_size=100)
+        assert all(size >= 1000 for size in writes[:-2])
+
+    def test_run_file_pipeline_skips(self, tmp_path):
+        assert run_file_pipeline("", "") is None
+        assert run_file_pipeline(str(tmp_path / "missing.txt"), str(tmp_path / "out.txt")) is None
+        assert not (tmp_path / "out.txt").exists()
+
+    @pytest.mark.parametrize("alias", ["same", "link", "relative"])
+    def test_rejects_output_equal_to_input(self, input_file, tmp_path, monkeypatch, alias):
+        content = input_file.read_bytes()
+        output = str(input_file)
+        if alias == "link":
+            output = str(tmp_path / "link.txt")
+            (tmp_path / "link.txt").symlink_to(input_file)
+        elif alias == "relative":
+            monkeypatch.chdir(tmp_path)
+            output = input_file.name
+        with pytest.raises(ValueError, match="is the input file"):
+            run_file_pipeline(str(input_file), output)
+        with pytest.raises(ValueError, match="is the input file"):
+            process_file_parallel(str(input_file), output, workers=2)
+        assert input_file.read_bytes() == content
+
+    def test_invalid_chunk_size(self, input_file):
+        with pytest.raises(ValueError):
+            list(read_chunks(str(input_file), 0))
+
+def upper_even(record):
+    return None if int(record.split()[1]) % 2 else record.upper()
+
+class TestParallelFilePipeline:
+    @pytest.fixture
+    def lines_file(self, tmp_path):
+        path = tmp_path / "lines.txt"
+        path.write_bytes(b"".join(b"record %d\n" % i for i in range(5000)))
+        return path
+
+    def test_record_ranges(self, lines_file):
+        data = lines_file.read_bytes()
+        ranges = record_ranges(str(lines_file), 1000)
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start and data[end - 1:end] == b"\n"
+
+    @pytest.mark.parametrize("workers", [2, 3])
+    def test_parallel_matches_serial(self, lines_file, tmp_path, workers):
+        serial = tmp_path / "serial.txt"
+        parallel = tmp_path / "parallel.txt"
+        expected = process_file(str(lines_file), str(serial), stages=[upper_even])
+        stats = process_file_parallel(str(lines_file), str(parallel), stages=[upper_even], workers=workers, chunk_size=4096)
+        assert parallel.read_bytes() == serial.read_bytes()
+        assert stats == expected
+
+    def test_parallel_uses_chunk_size(self, lines_file, tmp_path, monkeypatch):
+        chunk_sizes = []
+        original = file_pipeline._process_range
+        def spy(input_file, start, end, stages, chunk_size):
+            chunk_sizes.append(chunk_size)
+            return original(input_file, start, end, stages, chunk_size)
+        monkeypatch.setattr(file_pipeline, "ProcessPoolExecutor", ThreadPoolExecutor)
+        monkeypatch.setattr(file_pipeline, "_process_range", spy)
+        process_file_parallel(str(lines_file), str(tmp_path / "out.txt"), workers=2, chunk_size=4096)
+        assert chunk_sizes and set(chunk_sizes) == {4096}
+        assert (tmp_path / "out.txt").read_bytes() == lines_file.read_bytes()
+
+    def test_negative_workers(self, lines_file, tmp_path):
+        with pytest.raises(ValueError, match="workers"):
+            run_file_pipeline(str(lines_file), str(tmp_path / "out.txt"), workers=-1)
+
+    def test_parallel_empty_file(self, tmp_path):
+        empty = tmp_path / "empty.txt"
+        empty.write_bytes(b"")
+        stats = process_file_parallel(str(empty), str(tmp_path / "out.txt"), workers=2)
+        assert stats.records_in == 0 and (tmp_path / "out.txt").read_bytes() == b""
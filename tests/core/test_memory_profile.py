@@ -0,0 +1,80 @@
+# test_memory_profile.py
+
+import tracemalloc
+
+import pytest
+
+from pymodule.core import memory_profile
+from pymodule.core.memory_profile import memory_profile_options, enable_memory_profile, disable_memory_profile, \
+    memory_phase, recorded_phases, memory_report, peak_rss
+
+@pytest.fixture
+def profiling():
+    enable_memory_profile(top=5)
+    yield
+    disable_memory_profile()
+
+class TestMemoryProfileOptions:
+    def test_options(self, monkeypatch):
+        monkeypatch.delenv(memory_profile.PROFILE_ENV, raising=False)
+        assert memory_profile_options(["in.txt"]) == (False, None)
+        assert memory_profile_options(["--memory-profile", "in.txt"]) == (True, None)
+        assert memory_profile_options(["--memory-profile-dump", "snaps", "--verbose", "4"]) == (True, "snaps")
+        monkeypatch.setenv(memory_profile.PROFILE_ENV, "1")
+        assert memory_profile_options([]) == (True, None)
+
+class TestMemoryPhases:
+    def test_disabled_is_a_no_op(self):
+        with memory_phase("idle"):
+            pass
+        assert recorded_phases() == []
+
+    def test_phase_growth_and_peak(self, profiling):
+        with memory_phase("allocate"):
+            kept = [bytes(1000) for _ in range(1000)]
+            temporary = bytes(4 << 20)
+            del temporary
+        phase, = recorded_phases()
+        assert phase.name == "allocate"
+        assert phase.after - phase.before >= 1000 * 1000
+        assert phase.peak - phase.before >= 4 << 20
+        assert phase.top and "test_memory_profile.py:" in phase.top[0][0]
+        assert len(kept) == 1000
+
+    def test_nested_phases_keep_the_outer_peak(self, profiling):
+        with memory_phase("outer"):
+            temporary = bytes(8 << 20)
+            del temporary
+            with memory_phase("inner"):
+                pass
+        outer, inner = recorded_phases()
+        assert (outer.name, outer.depth, inner.name, inner.depth) == ("outer", 0, "inner", 1)
+        assert outer.peak - outer.before >= 8 << 20
+        assert inner.peak - inner.before < 8 << 20
+
+    def test_dump_snapshots(self, tmp_path):
+        enable_memory_profile(dump_dir=str(tmp_path))
+        try:
+            with memory_phase("load"):
+                pass
+        finally:
+            disable_memory_profile()
+        names = sorted(path.name for path in tmp_path.iterdir())
+        assert names == ["01-load-after.tracemalloc", "01-load-before.tracemalloc"]
+        before = tracemalloc.Snapshot.load(str(tmp_path / names[1]))
+        after = tracemalloc.Snapshot.load(str(tmp_path / names[0]))
+        assert isinstance(after.compare_to(before, "lineno"), list)
+
+    def test_report(self, profiling):
+        with memory_phase("allocate"):
+            kept = bytearray(1 << 20)
+        report = memory_report()
+        assert report.startswith("Memory report (MiB):")
+        assert "allocate" in report
+        assert "Largest live allocation sites:" in report
+        assert "Peak RSS:" in report
+        assert len(kept) == 1 << 20
+
+    def test_peak_rss(self):
+        rss = peak_rss()
+        assert rss is None or rss > 1 << 20
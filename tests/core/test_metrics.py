@@ -0,0 +1,140 @@
+# test_metrics.py
+
+import json
+import threading
+
+import pytest
+
+from pymodule.core.metrics import MetricsRegistry, MetricsExporter, timed, time_block
+from pymodule.core.benchmark import metrics_overhead_benchmark
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+class TestMetrics:
+    def test_counter(self, registry):
+        counter = registry.counter("events_total", "Events")
+        counter.inc()
+        counter.inc(2.5)
+        assert registry.counter("events_total") is counter
+        assert counter.value == 3.5
+        with pytest.raises(ValueError):
+            counter.inc(-1)
+
+    def test_counter_from_many_threads(self, registry):
+        counter = registry.counter("events_total")
+
+        def work():
+            for _ in range(10000):
+                counter.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert counter.value == 80000
+
+    def test_short_lived_threads_do_not_grow_cells(self, registry):
+        counter = registry.counter("events_total")
+        histogram = registry.histogram("latency_seconds")
+
+        def work():
+            counter.inc()
+            histogram.observe(0.2)
+
+        for _ in range(1000):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        assert len(counter._cells._cells) == 0 and len(histogram._cells._cells) == 0
+        assert counter.value == 1000
+        assert histogram.snapshot()["count"] == 1000
+        registry.reset()
+        assert counter.value == 0 and histogram.snapshot()["count"] == 0
+
+    def test_gauge(self, registry):
+        gauge = registry.gauge("queue_depth")
+        gauge.set(5)
+        gauge.inc(2)
+        gauge.dec()
+        assert gauge.value == 6
+
+    def test_histogram_buckets(self, registry):
+        histogram = registry.histogram("latency_seconds", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        data = histogram.snapshot()
+        assert data["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+        assert data["count"] == 4
+        assert data["sum"] == pytest.approx(2.65)
+
+    def test_invalid_metrics(self, registry):
+        with pytest.raises(ValueError):
+            registry.counter("bad name")
+        with pytest.raises(ValueError):
+            registry.histogram("unsorted", buckets=(1.0, 0.5))
+        registry.counter("events_total")
+        with pytest.raises(ValueError):
+            registry.gauge("events_total")
+
+    def test_timed_and_time_block(self, registry):
+        @timed("work_seconds", registry=registry)
+        def work(x):
+            return x * 2
+
+        assert work(21) == 42
+        assert work.__name__ == "work"
+        with time_block("work_seconds", registry=registry):
+            pass
+        with pytest.raises(RuntimeError):
+            with time_block("failing_seconds", registry=registry):
+                raise RuntimeError("boom")
+        assert registry.histogram("work_seconds").snapshot()["count"] == 2
+        assert registry.histogram("failing_seconds").snapshot()["count"] == 1
+
+    def test_reset(self, registry):
+        registry.counter("events_total").inc(3)
+        registry.histogram("latency_seconds").observe(0.2)
+        registry.reset()
+        assert registry.counter("events_total").value == 0
+        assert registry.histogram("latency_seconds").snapshot()["count"] == 0
+
+class TestMetricsExport:
+    def test_prometheus_format(self, registry):
+        registry.counter("events_total", "Events seen").inc(3)
+        registry.histogram("latency_seconds", buckets=(0.5,)).observe(0.25)
+        text = registry.to_prometheus()
+        assert "# HELP pymodule_events_total Events seen\n# TYPE pymodule_events_total counter\npymodule_events_total 3.0\n" in text
+        assert 'pymodule_latency_seconds_bucket{le="0.5"} 1\n' in text
+        assert 'pymodule_latency_seconds_bucket{le="+Inf"} 1\n' in text
+        assert "pymodule_latency_seconds_sum 0.25\npymodule_latency_seconds_count 1\n" in text
+
+    def test_write_by_suffix(self, registry, tmp_path):
+        registry.gauge("temperature").set(21.5)
+        registry.write(str(tmp_path / "metrics.json"))
+        registry.write(str(tmp_path / "metrics.prom"))
+        data = json.loads((tmp_path / "metrics.json").read_text())
+        assert data["metrics"]["temperature"] == {"type": "gauge", "help": "", "value": 21.5}
+        assert "pymodule_temperature 21.5" in (tmp_path / "metrics.prom").read_text()
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["metrics.json", "metrics.prom"]
+
+    def test_exporter_writes_periodically_and_on_stop(self, registry, tmp_path):
+        path = tmp_path / "metrics.prom"
+        counter = registry.counter("events_total")
+        exporter = MetricsExporter(str(path), interval=0.01, registry=registry).start()
+        counter.inc()
+        threading.Event().wait(0.1)
+        assert path.exists()
+        counter.inc()
+        exporter.stop()
+        assert "pymodule_events_total 2.0" in path.read_text()
+        exporter.stop()     # second stop is a no-op
+
+class TestMetricsOverhead:
+    def test_overhead_is_small(self):
+        results = metrics_overhead_benchmark(2000)
+        assert set(results) == {"counter.inc", "gauge.set", "histogram.observe", "@timed call"}
+        # generous bound, the benchmark log shows the real numbers
+        assert all(overhead < 50000.0 for overhead in results.values())
@@ -0,0 +1,64 @@
+# test_startup_report.py
+
+import pytest
+
+from pymodule.core import startup_report
+from pymodule.core.startup_report import parse_importtime, parse_phases, group_imports, format_report, \
+    startup_phase, startup_report_requested, PhaseTiming
+
+IMPORTTIME = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _json
+import time:       300 |        420 |   json
+import time:      1000 |       1000 |       pymodule.extensions.cmodulea.cmodulea
+import time:       200 |       1200 |     pymodule.extensions.cmodulea
+import time:       500 |       1700 |   pymodule.core.config
+import time:       100 |       1800 | pymodule
+unrelated stderr line
+pymodule startup phase: parse_args | 250
+pymodule startup phase: run_app | 4000
+""".splitlines()
+
+class TestStartupReport:
+    def test_parse_importtime(self):
+        imports = parse_importtime(IMPORTTIME)
+        assert len(imports) == 6
+        assert imports[0] == ("_json", 120, 120, 2)
+        assert imports[-1] == ("pymodule", 100, 1800, 0)
+
+    def test_parse_phases(self):
+        assert parse_phases(IMPORTTIME) == [PhaseTiming("parse_args", 250), PhaseTiming("run_app", 4000)]
+
+    def test_group_imports(self):
+        groups = dict(group_imports(parse_importtime(IMPORTTIME)))
+        assert groups == {"_json": 120, "json": 300, "pymodule.extensions.cmodulea": 1200, "pymodule.core": 500, "pymodule": 100}
+
+    def test_format_report(self):
+        report = format_report(parse_importtime(IMPORTTIME), parse_phases(IMPORTTIME), total_us=10000)
+        lines = report.splitlines()
+        assert lines[0] == "Startup report: 10.00 ms total"
+        # ranked: run_app 4000 > other 3730 > imports 2220 > parse_args 250
+        assert "phase run_app" in lines[2] and "other" in lines[3] and "imports (6 modules)" in lines[4]
+        assert "pymodule.extensions.cmodulea" in report
+
+    def test_phase_recording(self, monkeypatch):
+        monkeypatch.setattr(startup_report, "_phases", None)
+        with startup_phase("ignored"):
+            pass
+        assert startup_report._phases is None
+        startup_report.enable_phase_recording()
+        with startup_phase("recorded"):
+            pass
+        assert [phase.name for phase in startup_report._phases] == ["recorded"]
+
+    @pytest.mark.parametrize("argv, env, expected", [
+        (["--startup-report"], {}, True),
+        ([], {"PYMODULE_STARTUP_REPORT": "1"}, True),
+        ([], {"PYMODULE_STARTUP_REPORT": "0"}, False),
+        (["--startup-report"], {"PYMODULE_STARTUP_REPORT_CHILD": "1"}, False),
+    ])
+    def test_requested(self, monkeypatch, argv, env, expected):
+        for name in ("PYMODULE_STARTUP_REPORT", "PYMODULE_STARTUP_REPORT_CHILD"):
+            monkeypatch.delenv(name, raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        assert startup_report_requested(argv) is expected
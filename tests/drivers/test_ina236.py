@@ -1,9 +1,59 @@
 # test_utilities.py
 
 import unittest
+import pytest
 
 from pymodule import drivers
+from pymodule.drivers import ina236
 
 class TestDrivers(unittest.TestCase):
     def test_hello_from_ina236(self):
-        self.assertEqual(drivers.hello_from_ina236(),None)
\ No newline at end of file
+        self.assertEqual(drivers.hello_from_ina236(),None)
+
+class TestINA236:
+    @pytest.fixture
+    def bus(self):
+        bus = ina236.SimulatedI2CBus()
+        bus.add_device(0x40)
+        return bus
+
+    def test_check_id(self, bus):
+        assert ina236.INA236(bus, 0x40).check_id()
+
+    def test_missing_device(self, bus):
+        with pytest.raises(OSError):
+            ina236.INA236(bus, 0x41).read_bus_voltage()
+
+    def test_calibration(self, bus):
+        device = ina236.INA236(bus, 0x40, shunt_ohms=0.01, max_expected_amps=1.0)
+        calibration = device.calibrate()
+        assert calibration == int(0.00512 / ((1.0 / 32768) * 0.01))
+        assert bus.devices[0x40].registers[ina236.REG_CALIBRATION] == calibration
+
+    @pytest.mark.parametrize("adc_range", [0, 1])
+    def test_read_sample(self, bus, adc_range):
+        device = ina236.INA236(bus, 0x40, shunt_ohms=0.01, max_expected_amps=2.0, adc_range=adc_range)
+        device.configure(averages=4)
+        device.calibrate()
+        bus.devices[0x40].set_measurement(shunt_voltage=0.005, bus_voltage=12.0)
+        sample = device.read_sample()
+        assert sample.shunt_voltage == pytest.approx(0.005, rel=1e-3)
+        assert sample.bus_voltage == pytest.approx(12.0, rel=1e-3)
+        assert sample.current == pytest.approx(0.5, rel=1e-2)
+        assert sample.power == pytest.approx(6.0, rel=1e-2)
+
+    def test_negative_current(self, bus):
+        device = ina236.INA236(bus, 0x40)
+        device.calibrate()
+        bus.devices[0x40].set_measurement(shunt_voltage=-0.002, bus_voltage=3.3)
+        assert device.read_current() == pytest.approx(-0.2, rel=1e-2)
+
+    def test_reset(self, bus):
+        device = ina236.INA236(bus, 0x40)
+        device.configure(averages=16)
+        device.reset()
+        assert device.read_register(ina236.REG_CONFIGURATION) == ina236.CONFIG_DEFAULT
+
+    def test_invalid_configuration(self, bus):
+        with pytest.raises(ValueError):
+            ina236.INA236(bus, 0x40).configure(averages=3)
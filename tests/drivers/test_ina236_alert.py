@@ -0,0 +1,80 @@
+# test_ina236_alert.py
+
+import asyncio
+import threading
+import time
+import pytest
+
+from pymodule.drivers import INA236, SimulatedI2CBus, AsyncI2CBus
+from pymodule.drivers.ina236_alert import AlertDrivenAcquisition, SimulatedAlertPin, GPIO_V2_LINE_REQUEST, GPIO_V2_LINE_EVENT, \
+    GPIO_V2_GET_LINE_IOCTL
+
+@pytest.fixture
+def setup():
+    bus = SimulatedI2CBus()
+    bus.add_device(0x40)
+    device = INA236(bus, 0x40)
+    device.calibrate()
+    pin = SimulatedAlertPin(bus, 0x40)
+    acquisition = AlertDrivenAcquisition(device, pin)
+    acquisition.enable()
+    yield bus, pin, acquisition
+    pin.close()
+
+def convert_later(pin, values, interval=0.005):
+    def run():
+        for shunt in values:
+            time.sleep(interval)
+            pin.convert(shunt, 5000)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+class TestAlertDrivenAcquisition:
+    def test_ioctl_layout(self):
+        assert GPIO_V2_LINE_REQUEST.size == 592
+        assert GPIO_V2_LINE_EVENT.size == 48
+        assert GPIO_V2_GET_LINE_IOCTL == 0xC250B407
+
+    def test_idle_rail_costs_no_bus_traffic(self, setup):
+        bus, _, acquisition = setup
+        before = bus.transactions
+        with pytest.raises(TimeoutError):
+            acquisition.wait_and_read(timeout=0.05)
+        assert bus.transactions == before
+
+    def test_reads_only_completed_conversions(self, setup):
+        bus, pin, acquisition = setup
+        before = bus.transactions
+        thread = convert_later(pin, [100, 200, 300])
+        samples = list(acquisition.samples(count=3, timeout=2.0))
+        thread.join()
+        assert [s.shunt for s in samples] == [100, 200, 300]
+        # one Mask/Enable read plus four measurement registers per conversion
+        assert bus.transactions - before == 3 * 5
+
+    def test_disabled_alert_does_not_fire(self, setup):
+        _, pin, acquisition = setup
+        acquisition.disable()
+        pin.convert(100, 5000)
+        with pytest.raises(TimeoutError):
+            acquisition.wait_and_read(timeout=0.02)
+
+    def test_spurious_edge(self, setup):
+        _, pin, acquisition = setup
+        pin.trigger()
+        assert acquisition.wait_and_read(timeout=1.0) is None     # woken up, but no conversion
+        assert acquisition.spurious == 1
+
+    def test_async_stream(self, setup):
+        bus, pin, acquisition = setup
+
+        async def scenario():
+            async_bus = AsyncI2CBus(bus)
+            thread = convert_later(pin, [7, 8, 9, 10])
+            samples = [s async for s in acquisition.stream(count=4, bus=async_bus)]
+            thread.join()
+            async_bus.close()
+            return samples
+
+        assert [s.shunt for s in asyncio.run(scenario())] == [7, 8, 9, 10]
@@ -0,0 +1,83 @@
+# test_ina236_async.py
+
+import asyncio
+import time
+import pytest
+
+from pymodule.drivers import SimulatedI2CBus, AsyncINA236Poller
+
+LATENCY = 0.01
+READS_PER_SAMPLE = 4
+
+def make_poller(buses: int, devices_per_bus: int, latency: float = LATENCY) -> AsyncINA236Poller:
+    poller = AsyncINA236Poller()
+    for b in range(buses):
+        bus = SimulatedI2CBus(latency=latency)
+        poller.add_bus(f"bus{b}", bus)
+        for d in range(devices_per_bus):
+            bus.add_device(0x40 + d).set_measurement(shunt_voltage=0.001 * (d + 1), bus_voltage=5.0 + b)
+            poller.add_device(f"rail{b}.{d}", f"bus{b}", 0x40 + d)
+    return poller
+
+class TestAsyncINA236Poller:
+    def test_snapshot_values(self):
+        async def scenario():
+            async with make_poller(2, 2, latency=0.0) as poller:
+                await poller.setup_all()
+                return await poller.snapshot()
+
+        snapshot = asyncio.run(scenario())
+        assert set(snapshot) == {"rail0.0", "rail0.1", "rail1.0", "rail1.1"}
+        assert snapshot["rail1.1"].bus_voltage == pytest.approx(6.0, rel=1e-3)
+        assert snapshot["rail0.1"].shunt_voltage == pytest.approx(0.002, rel=1e-3)
+
+    def test_buses_read_concurrently(self):
+        buses, per_bus = 3, 2
+
+        async def scenario():
+            async with make_poller(buses, per_bus) as poller:
+                start = time.perf_counter()
+                await poller.snapshot()
+                return time.perf_counter() - start
+
+        elapsed = asyncio.run(scenario())
+        sequential = buses * per_bus * READS_PER_SAMPLE * LATENCY
+        per_bus_time = per_bus * READS_PER_SAMPLE * LATENCY
+        assert elapsed >= per_bus_time * 0.9
+        assert elapsed < sequential * 0.75
+
+    def test_same_bus_is_serialized(self):
+        async def scenario():
+            async with make_poller(1, 3) as poller:
+                start = time.perf_counter()
+                await poller.snapshot()
+                return time.perf_counter() - start
+
+        assert asyncio.run(scenario()) >= 3 * READS_PER_SAMPLE * LATENCY * 0.9
+
+    def test_snapshot_return_exceptions(self):
+        async def scenario():
+            async with make_poller(1, 1, latency=0.0) as poller:
+                poller.add_device("ghost", "bus0", 0x4F)
+                return await poller.snapshot(return_exceptions=True)
+
+        snapshot = asyncio.run(scenario())
+        assert isinstance(snapshot["ghost"], OSError)
+        assert snapshot["rail0.0"].bus_voltage == pytest.approx(5.0, rel=1e-3)
+
+    def test_poll(self):
+        async def scenario():
+            async with make_poller(1, 1, latency=0.0) as poller:
+                return [snapshot async for snapshot in poller.poll(0.001, count=3)]
+
+        assert len(asyncio.run(scenario())) == 3
+
+    def test_duplicate_and_unknown(self):
+        poller = make_poller(1, 1, latency=0.0)
+        with pytest.raises(ValueError):
+            poller.add_bus("bus0", SimulatedI2CBus())
+        with pytest.raises(ValueError):
+            poller.add_device("rail0.0", "bus0", 0x40)
+        with pytest.raises(ValueError):
+            poller.add_device("other", "nobus", 0x40)
+        poller.close()
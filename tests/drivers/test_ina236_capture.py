@@ -0,0 +1,127 @@
+# test_ina236_capture.py
+
+import os
+import struct
+
+import pytest
+
+from pymodule.drivers import INA236, SimulatedI2CBus, NativeSampler
+from pymodule.drivers.ina236 import INA236RawSample
+from pymodule.drivers.ina236_capture import CaptureWriter, CaptureReader, CaptureReplay, device_metadata, \
+    FILE_HEADER, CAPTURE_MAGIC, RECORD
+
+def raw(i: int) -> INA236RawSample:
+    return INA236RawSample(1_000_000 * i, i % 300 - 150, 7500 + i % 7, i % 100 - 50, i % 1000)
+
+@pytest.fixture
+def capture_path(tmp_path):
+    path = str(tmp_path / "session.cap")
+    device = INA236(SimulatedI2CBus(), 0x41, shunt_ohms=0.02, max_expected_amps=2.0)
+    with CaptureWriter(path, device_metadata(device, rail="vcore"), chunk_records=64) as writer:
+        for i in range(1000):
+            writer.write(raw(i))
+    return path
+
+class TestCapture:
+    def test_roundtrip(self, capture_path):
+        with CaptureReader(capture_path) as reader:
+            assert len(reader) == 1000
+            assert len(reader.chunks) == 16
+            assert reader.metadata["rail"] == "vcore"
+            assert reader.metadata["address"] == 0x41
+            assert list(reader.records()) == [raw(i) for i in range(1000)]
+
+    @pytest.mark.parametrize("start, end", [(0, 10), (63, 65), (100, 900), (990, 2000), (500, 500)])
+    def test_time_range(self, capture_path, start, end):
+        with CaptureReader(capture_path) as reader:
+            records = list(reader.records(start * 1_000_000, end * 1_000_000))
+        assert records == [raw(i) for i in range(start, min(end, 1000))]
+
+    def test_samples_use_header_calibration(self, capture_path):
+        with CaptureReader(capture_path) as reader:
+            sample = next(reader.samples(5_000_000))
+            assert sample.current == pytest.approx(raw(5).current * reader.metadata["current_lsb"])
+            assert sample.bus_voltage == pytest.approx(raw(5).bus * 1.6e-3)
+
+    def test_append_and_truncated_tail(self, capture_path):
+        with CaptureWriter(capture_path, append=True, chunk_records=64) as writer:
+            with pytest.raises(ValueError):
+                writer.write(raw(10))
+            for i in range(1000, 1010):
+                writer.write(raw(i))
+        with open(capture_path, "ab") as f:
+            f.write(b"CHNK" + b"\x00" * 10)     # torn chunk header
+        with CaptureReader(capture_path) as reader:
+            assert len(reader) == 1010
+            assert reader.end_ns == raw(1009).timestamp_ns
+
+    def test_append_after_records_cut_from_chunk(self, tmp_path):
+        path = str(tmp_path / "cut.cap")
+        with CaptureWriter(path, chunk_records=10) as writer:
+            for i in range(10):
+                writer.write(raw(i))
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 3 * RECORD.size - 5)     # three records and a torn one gone
+        with CaptureWriter(path, append=True, chunk_records=10) as writer:
+            assert writer.last_ns == raw(5).timestamp_ns
+            for i in range(100, 105):
+                writer.write(raw(i))
+        with CaptureReader(path) as reader:
+            assert [chunk.records for chunk in reader.chunks] == [6, 5]
+            assert list(reader.records()) == [raw(i) for i in [*range(6), *range(100, 105)]]
+        with CaptureWriter(path, append=True) as writer:
+            writer.write(raw(200))
+        with CaptureReader(path) as reader:
+            assert len(reader) == 12
+
+    def test_native_batches(self, tmp_path):
+        path = str(tmp_path / "native.cap")
+        sampler = NativeSampler(batch_size=100, shunt=321)
+        with CaptureWriter(path, chunk_records=40) as writer:
+            for _ in range(3):
+                writer.write_batch(sampler.read_batch())
+        with CaptureReader(path) as reader:
+            assert len(reader) == 300
+            assert all(r.shunt == 321 for r in reader.records())
+
+    def test_rejects_unordered_timestamps(self, tmp_path):
+        with CaptureWriter(str(tmp_path / "order.cap")) as writer:
+            writer.write(raw(10))
+            with pytest.raises(ValueError):
+                writer.write_batch(b"".join(RECORD.pack(*raw(i)) for i in (11, 13, 12, 14)))     # ends in order
+            with pytest.raises(ValueError):
+                writer.write(raw(9))
+            with pytest.raises(struct.error):
+                writer.write(INA236RawSample(20_000_000, 1 << 20, 0, 0, 0))   # does not pack
+            assert writer.last_ns == raw(10).timestamp_ns
+            writer.write_batch(b"".join(RECORD.pack(*raw(i)) for i in (10, 11, 12)))
+            assert writer.last_ns == raw(12).timestamp_ns
+
+    def test_rejects_foreign_and_newer_files(self, tmp_path):
+        foreign = tmp_path / "foreign.cap"
+        foreign.write_bytes(b"not a capture at all")
+        with pytest.raises(ValueError):
+            CaptureReader(str(foreign))
+        newer = tmp_path / "newer.cap"
+        newer.write_bytes(FILE_HEADER.pack(CAPTURE_MAGIC, 99, 16, 2) + b"{}")
+        with pytest.raises(ValueError):
+            CaptureReader(str(newer))
+
+    def test_replay(self, capture_path):
+        bus = SimulatedI2CBus()
+        with CaptureReader(capture_path) as reader:
+            replay = CaptureReplay(reader, bus, speed=0)
+            device = INA236(bus, 0x41, shunt_ohms=0.02, max_expected_amps=2.0)
+            seen = []
+            count = replay.run(100_000_000, 110_000_000, on_sample=lambda _: seen.append(device.read_raw()))
+        assert count == 10
+        assert [s[1:] for s in seen] == [raw(i)[1:] for i in range(100, 110)]
+
+    def test_replay_speed(self, capture_path):
+        import time
+        with CaptureReader(capture_path) as reader:
+            replay = CaptureReplay(reader, SimulatedI2CBus(), speed=10.0)
+            start = time.perf_counter()
+            replay.run(0, 200_000_000)
+            elapsed = time.perf_counter() - start
+        assert 0.015 <= elapsed < 0.2
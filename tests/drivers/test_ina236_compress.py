@@ -0,0 +1,108 @@
+# test_ina236_compress.py
+
+import os
+import random
+import pytest
+
+from pymodule.drivers.ina236 import INA236RawSample
+from pymodule.drivers import ina236_compress
+from pymodule.drivers.ina236_capture import CaptureWriter
+from pymodule.drivers.ina236_compress import CompressedCaptureWriter, CompressedCaptureReader, compress_capture, \
+    encode_varints, decode_varints, FOOTER
+
+def steady_rail(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    records = []
+    timestamp = 10_000_000_000
+    for _ in range(count):
+        timestamp += 1_000_000 + rng.randint(-2000, 2000)
+        shunt = 2000 + rng.randint(-3, 3)
+        records.append(INA236RawSample(timestamp, shunt, 7500 + rng.randint(-1, 1), shunt * 2, 1500 + rng.randint(-2, 2)))
+    return records
+
+@pytest.fixture
+def records():
+    return steady_rail(5000)
+
+@pytest.fixture
+def compressed(tmp_path, records):
+    path = str(tmp_path / "rail.cz")
+    with CompressedCaptureWriter(path, {"rail": "vcore"}, block_records=512, tiers=(64, 1024)) as writer:
+        for record in records:
+            writer.write(record)
+    return path
+
+class TestVarint:
+    @pytest.mark.parametrize("values", [[0], [1, -1, 63, -64, 64, -65], [2**40, -2**40, 32767, -32768]])
+    def test_roundtrip(self, values):
+        out = bytearray()
+        encode_varints(values, out)
+        decoded, end = decode_varints(out, 0, len(values))
+        assert decoded == values and end == len(out)
+
+    def test_small_values_take_one_byte(self):
+        out = bytearray()
+        encode_varints([0, 1, -1, 63, -64], out)
+        assert len(out) == 5
+
+class TestCompressedCapture:
+    def test_roundtrip_and_ratio(self, compressed, records):
+        with CompressedCaptureReader(compressed) as reader:
+            assert len(reader) == len(records)
+            assert reader.metadata["rail"] == "vcore"
+            assert list(reader.records()) == records
+        assert os.path.getsize(compressed) < len(records) * 16 / 2
+
+    def test_range_decodes_only_overlapping_blocks(self, compressed, records, monkeypatch):
+        decoded_blocks = []
+        original = ina236_compress.decode_block
+        monkeypatch.setattr(ina236_compress, "decode_block", lambda *args: decoded_blocks.append(args) or original(*args))
+        start, end = records[600].timestamp_ns, records[700].timestamp_ns
+        with CompressedCaptureReader(compressed) as reader:
+            assert list(reader.records(start, end)) == records[600:700]
+        assert len(decoded_blocks) == 1
+
+    def test_tiers(self, compressed, records):
+        with CompressedCaptureReader(compressed) as reader:
+            assert reader.tiers == [64, 1024]
+            coarse = list(reader.tier(1024))
+            assert len(coarse) == -(-len(records) // 1024)
+            assert sum(entry.samples for entry in coarse) == len(records)
+            first = records[:1024]
+            assert coarse[0].shunt.min == min(r.shunt for r in first)
+            assert coarse[0].shunt.max == max(r.shunt for r in first)
+            assert coarse[0].power.mean == pytest.approx(sum(r.power for r in first) / 1024)
+            window = list(reader.tier(64, records[640].timestamp_ns, records[1280].timestamp_ns))
+            assert [entry.first_ns for entry in window] == [records[i].timestamp_ns for i in range(640, 1280, 64)]
+            with pytest.raises(ValueError):
+                list(reader.tier(3))
+
+    def test_without_footer(self, compressed, records):
+        with open(compressed, "r+b") as f:
+            f.truncate(os.path.getsize(compressed) - FOOTER.size)
+        with CompressedCaptureReader(compressed) as reader:
+            assert list(reader.records()) == records
+
+    def test_compress_capture(self, tmp_path, records):
+        plain = str(tmp_path / "plain.cap")
+        with CaptureWriter(plain, {"address": 0x44}) as writer:
+            for record in records:
+                writer.write(record)
+        records_count, size = compress_capture(plain, str(tmp_path / "plain.cz"))
+        assert records_count == len(records)
+        assert size < os.path.getsize(plain) / 2
+        with CompressedCaptureReader(str(tmp_path / "plain.cz")) as reader:
+            assert reader.metadata["address"] == 0x44
+            assert list(reader.records()) == records
+
+    def test_rejects_empty_file(self, tmp_path):
+        path = tmp_path / "empty.icz"
+        path.write_bytes(b"")
+        with pytest.raises(ValueError, match="empty compressed capture"):
+            CompressedCaptureReader(str(path))
+
+    def test_rejects_decreasing_timestamps(self, tmp_path):
+        with CompressedCaptureWriter(str(tmp_path / "bad.cz")) as writer:
+            writer.write(INA236RawSample(10, 0, 0, 0, 0))
+            with pytest.raises(ValueError):
+                writer.write(INA236RawSample(5, 0, 0, 0, 0))
@@ -0,0 +1,83 @@
+# test_ina236_native.py
+
+import errno
+import threading
+import time
+import pytest
+
+from pymodule.drivers import INA236, SimulatedI2CBus, NativeSampler, decode_records
+from pymodule.drivers.ina236_native import RECORD_SIZE
+from pymodule.extensions.ina236sampler import ina236sampler
+
+class TestNativeSampler:
+    def test_record_layout(self):
+        assert RECORD_SIZE == 16
+
+    def test_read_batch(self):
+        sampler = NativeSampler(batch_size=100, shunt=1000, bus=6250, calibration=4096)
+        samples = decode_records(sampler.read_batch())
+        assert len(samples) == 100
+        assert all(s.shunt == 1000 and s.bus == 6250 and s.current == 2000 for s in samples)
+        assert all(a.timestamp_ns <= b.timestamp_ns for a, b in zip(samples, samples[1:]))
+
+    def test_matches_python_simulation(self):
+        bus = SimulatedI2CBus()
+        bus.add_device(0x40).registers[0x05] = 3000
+        bus.devices[0x40].set_raw(-1234, 4000)
+        expected = INA236(bus, 0x40).read_raw()
+        native = decode_records(NativeSampler(batch_size=1, shunt=-1234, bus=4000, calibration=3000).read_batch())[0]
+        assert native[1:] == expected[1:]
+
+    def test_ripple(self):
+        samples = decode_records(NativeSampler(batch_size=40, shunt=0, ripple=5).read_batch())
+        assert min(s.shunt for s in samples) == -5
+        assert max(s.shunt for s in samples) == 5
+
+    def test_buffer_too_small(self):
+        with pytest.raises(ValueError):
+            ina236sampler.read_simulated(bytearray(RECORD_SIZE), 2)
+
+    def test_releases_gil(self):
+        latency_ns = 2_000_000
+        count = 10
+        threads = [threading.Thread(target=ina236sampler.read_simulated,
+                                    args=(bytearray(count * RECORD_SIZE), count), kwargs={"latency_ns": latency_ns})
+                   for _ in range(4)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+        one_run = count * 4 * latency_ns / 1e9
+        assert elapsed < 2 * one_run
+
+    def test_paced_stream(self):
+        with NativeSampler(batch_size=20, period_ns=100_000) as sampler:
+            received = []
+            for batch in sampler.batches():
+                received.extend(decode_records(batch))
+                if len(received) >= 60:
+                    sampler.stop()
+        assert len(received) >= 60
+        span = received[59].timestamp_ns - received[0].timestamp_ns
+        assert span >= 59 * 100_000 * 0.9
+
+    def test_rejects_simulated_bus_device(self):
+        with pytest.raises(ValueError):
+            NativeSampler(device=INA236(SimulatedI2CBus()))
+
+    def test_bus_error_mid_batch(self):
+        with pytest.raises(OSError) as error:
+            ina236sampler.read_simulated(bytearray(10 * RECORD_SIZE), 10, fail_after=4)
+        assert error.value.errno == errno.EIO and error.value.records == 4
+
+    def test_bus_error_stops_batches(self):
+        sampler = NativeSampler(batch_size=10, fail_after=4)
+        received = []
+        with pytest.raises(OSError) as error:
+            with sampler:
+                for batch in sampler.batches():
+                    received.append(len(decode_records(batch)))
+        assert error.value.errno == errno.EIO
+        assert received == [4]
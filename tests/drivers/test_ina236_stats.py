@@ -0,0 +1,102 @@
+# test_ina236_stats.py
+
+import math
+import random
+import statistics
+import pytest
+
+from pymodule.drivers.ina236 import INA236Sample
+from pymodule.drivers.ina236_stats import RunningStats, EnergyIntegrator, RailStatistics, TumblingWindowAggregator, \
+    SlidingWindowAggregator, tumbling_windows
+
+def make_samples(count: int, period: float = 0.01, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    samples = []
+    for i in range(count):
+        voltage = 12.0 + rng.uniform(-0.1, 0.1)
+        current = 0.5 + rng.uniform(-0.2, 0.2)
+        samples.append(INA236Sample(i * period, voltage, current * 0.01, current, voltage * current))
+    return samples
+
+class TestRunningStats:
+    def test_matches_reference(self):
+        values = [random.Random(3).gauss(1e6, 1.0) for _ in range(1000)]
+        stats = RunningStats()
+        for v in values:
+            stats.add(v)
+        assert stats.count == len(values)
+        assert stats.mean == pytest.approx(statistics.fmean(values), rel=1e-12)
+        assert stats.variance == pytest.approx(statistics.pvariance(values), rel=1e-6)
+        assert stats.rms == pytest.approx(math.sqrt(statistics.fmean(v * v for v in values)), rel=1e-12)
+        assert (stats.min, stats.max) == (min(values), max(values))
+
+    def test_batch_equals_single(self):
+        values = [float(i % 17) for i in range(500)]
+        single, batched = RunningStats(), RunningStats()
+        for v in values:
+            single.add(v)
+        batched.add_batch(values[:123])
+        batched.add_batch(values[123:])
+        assert batched.count == single.count
+        assert batched.mean == pytest.approx(single.mean)
+        assert batched.variance == pytest.approx(single.variance)
+
+    def test_empty_summary(self):
+        assert math.isnan(RunningStats().summary().mean)
+
+class TestEnergy:
+    def test_constant_power(self):
+        integrator = EnergyIntegrator()
+        for i in range(1001):
+            integrator.add(i * 0.001, 2.0)
+        assert integrator.energy == pytest.approx(2.0, rel=1e-12)
+
+    def test_ramp(self):
+        integrator = EnergyIntegrator()
+        for i in range(11):
+            integrator.add(float(i), float(i))
+        assert integrator.energy == pytest.approx(50.0)
+
+    def test_rail_statistics(self):
+        samples = make_samples(200)
+        rail = RailStatistics()
+        rail.add_batch(samples)
+        summary = rail.summary()
+        assert summary.samples == 200
+        assert summary.current.mean == pytest.approx(statistics.fmean(s.current for s in samples))
+        expected = sum((a.power + b.power) / 2 * (b.timestamp - a.timestamp) for a, b in zip(samples, samples[1:]))
+        assert summary.energy == pytest.approx(expected)
+
+class TestWindows:
+    def test_tumbling_counts_and_energy(self):
+        samples = [INA236Sample(i * 0.1, 5.0, 0.001, 0.2, 1.0) for i in range(100)]
+        summaries = list(tumbling_windows(samples, 1.0))
+        assert len(summaries) == 10
+        assert all(s.samples == 10 for s in summaries)
+        assert sum(s.energy for s in summaries) == pytest.approx(9.9)
+        assert summaries[1].energy == pytest.approx(1.0)
+
+    def test_tumbling_gap(self):
+        aggregator = TumblingWindowAggregator(1.0)
+        assert aggregator.add(INA236Sample(0.0, 5.0, 0.0, 0.0, 1.0)) is None
+        completed = aggregator.add(INA236Sample(3.5, 5.0, 0.0, 0.0, 1.0))
+        assert completed is not None and completed.samples == 1
+        assert completed.energy == pytest.approx(1.0)
+        assert aggregator.window_start == 3.0
+        assert aggregator.flush().energy == pytest.approx(2.5)
+
+    def test_tumbling_invalid_duration(self):
+        with pytest.raises(ValueError):
+            TumblingWindowAggregator(0)
+
+    def test_sliding_matches_brute_force(self):
+        samples = make_samples(300)
+        window = SlidingWindowAggregator(0.25)
+        for i, sample in enumerate(samples):
+            summary = window.add(sample)
+            inside = [s for s in samples[:i + 1] if s.timestamp > sample.timestamp - 0.25]
+            assert summary.samples == len(inside) == len(window)
+            assert summary.start == inside[0].timestamp
+            assert summary.power.max == max(s.power for s in inside)
+            assert summary.power.min == min(s.power for s in inside)
+            assert summary.current.mean == pytest.approx(statistics.fmean(s.current for s in inside))
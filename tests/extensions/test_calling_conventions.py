@@ -0,0 +1,37 @@
+# test_calling_conventions.py
+
+import pytest
+
+from pymodule.core.benchmark import call_overhead_benchmark, python_fibonacci
+from pymodule.extensions.cmodulea import cmodulea
+from pymodule.extensions.cmoduleb import cmoduleb
+from pymodule.extensions.worker import cython_fibonacci
+
+FASTCALL_FUNCTIONS = [cmodulea.fibonacci, cmodulea.c_benchmark, cmoduleb.fibonacci, cmoduleb.capi_benchmark]
+
+class TestCallingConventions:
+    @pytest.mark.parametrize("n", [0, 1, 2, 10, 90])
+    def test_results_match(self, n):
+        expected = python_fibonacci(n)
+        assert cmodulea.fibonacci(n) == cmodulea.fibonacci_varargs(n) == cmoduleb.fibonacci(n) == expected
+
+    def test_cython_fibonacci_wraps_like_c_int(self):
+        assert cython_fibonacci(40) == python_fibonacci(40)
+        expected = python_fibonacci(300) % 2**32
+        assert cython_fibonacci(300) == (expected - 2**32 if expected >= 2**31 else expected)
+
+    @pytest.mark.parametrize("func", FASTCALL_FUNCTIONS)
+    def test_fastcall_argument_errors(self, func):
+        with pytest.raises(TypeError, match="exactly one argument"):
+            func()
+        with pytest.raises(TypeError, match="exactly one argument"):
+            func(1, 2)
+        with pytest.raises(TypeError):
+            func("10")
+        with pytest.raises(OverflowError):
+            func(2**40)
+
+    def test_call_overhead_benchmark(self):
+        results = call_overhead_benchmark(1000)
+        assert set(results) == {"Python", "Cython", "C METH_FASTCALL", "C METH_VARARGS", "C through C API"}
+        assert all(value >= 0.0 for value in results.values())
@@ -0,0 +1,23 @@
+# test_capi.py
+
+from pymodule.core.benchmark import python_fibonacci
+from pymodule.extensions.cmodulea import cmodulea
+from pymodule.extensions.cmoduleb import cmoduleb
+from pymodule.extensions.worker import capi_fibonacci, capi_benchmark
+
+class TestCAPI:
+    def test_capsule_is_exported(self):
+        assert type(cmodulea._C_API).__name__ == "PyCapsule"
+        assert "pymodule.extensions.cmodulea.cmodulea._C_API" in repr(cmodulea._C_API)
+
+    def test_cmoduleb_calls_cmodulea(self):
+        assert [cmoduleb.fibonacci(n) for n in range(10)] == [0, 1, 1, 2, 3, 5, 8, 13, 21, 34]
+        assert cmoduleb.fibonacci(300) == python_fibonacci(300) % 2**64
+
+    def test_worker_calls_cmodulea(self):
+        assert capi_fibonacci(90) == python_fibonacci(90)
+        assert capi_fibonacci(300) == python_fibonacci(300) % 2**64
+
+    def test_benchmarks(self):
+        assert cmoduleb.capi_benchmark(100) >= 0.0
+        assert capi_benchmark(100) >= 0.0
@@ -0,0 +1,120 @@
+# test_kernels.py
+
+import math
+import random
+from array import array
+from itertools import accumulate
+
+import pytest
+
+from pymodule.extensions.worker import array_sum, array_dot, array_scale, array_add, array_prefix_sum, array_min_max, \
+    array_sum_exact, array_sum_kahan, array_sum_pairwise, array_fill_float
+
+TYPECODES = ["i", "q", "f", "d"]     # int32, int64, float32, float64
+
+def make_array(typecode, size=1000, seed=1):
+    rng = random.Random(seed)
+    if typecode in "iq":
+        return array(typecode, (rng.randint(-1000, 1000) for _ in range(size)))
+    return array(typecode, (rng.uniform(-1000.0, 1000.0) for _ in range(size)))
+
+def approx(typecode, expected):
+    # float32 values round on every store
+    return pytest.approx(expected, rel=1e-4 if typecode == "f" else 1e-9)
+
+@pytest.mark.parametrize("typecode", TYPECODES)
+class TestKernels:
+    def test_sum(self, typecode):
+        values = make_array(typecode)
+        assert array_sum(values) == approx(typecode, sum(values))
+        assert array_sum(array(typecode)) == 0
+
+    def test_dot(self, typecode):
+        a, b = make_array(typecode, seed=1), make_array(typecode, seed=2)
+        assert array_dot(a, b) == approx(typecode, sum(x * y for x, y in zip(a, b)))
+
+    def test_scale(self, typecode):
+        values = make_array(typecode)
+        expected = array(typecode, (value * 3 for value in values))
+        array_scale(values, 3)
+        assert list(values) == list(expected)
+
+    def test_add(self, typecode):
+        a, b = make_array(typecode, seed=1), make_array(typecode, seed=2)
+        out = array(typecode, bytes(len(a) * a.itemsize))
+        array_add(a, b, out)
+        assert list(out) == list(array(typecode, (x + y for x, y in zip(a, b))))
+        array_add(a, b, a)     # in place
+        assert list(a) == list(out)
+
+    def test_prefix_sum(self, typecode):
+        values = make_array(typecode)
+        out = array(typecode, bytes(len(values) * values.itemsize))
+        array_prefix_sum(values, out)
+        assert list(out) == approx(typecode, list(accumulate(values)))
+
+    def test_min_max(self, typecode):
+        values = make_array(typecode)
+        assert array_min_max(values) == (min(values), max(values))
+        assert array_min_max(array(typecode, [5])) == (5, 5)
+        with pytest.raises(ValueError):
+            array_min_max(array(typecode))
+
+    def test_length_mismatch(self, typecode):
+        with pytest.raises(ValueError):
+            array_dot(make_array(typecode, 10), make_array(typecode, 11))
+        with pytest.raises(ValueError):
+            array_add(make_array(typecode, 10), make_array(typecode, 10), make_array(typecode, 9))
+
+class TestKernelBuffers:
+    def test_read_only_buffer(self):
+        values = memoryview(array("q", [1, 2, 3]).tobytes()).cast("q")
+        assert values.readonly
+        assert array_sum(values) == 6
+
+    def test_int64_sum_wraps_around(self):
+        assert array_sum(array("q", [2**63 - 1, 1])) == -2**63
+
+    @pytest.mark.parametrize("values", [array("h", [1, 2]), [1, 2], memoryview(array("d", [1.0, 2.0, 3.0]))[::2]])
+    def test_unsupported_buffers(self, values):
+        with pytest.raises(TypeError):
+            array_sum(values)
+
+    def test_mixed_types_rejected(self):
+        with pytest.raises(ValueError, match="dtype mismatch"):
+            array_dot(array("d", [1.0]), array("f", [1.0]))
+
+class TestSumKernels:
+    @pytest.mark.parametrize("typecode", ["i", "q"])
+    def test_exact_integer_sum(self, typecode):
+        values = make_array(typecode)
+        assert array_sum_exact(values) == sum(values)
+
+    def test_exact_sum_does_not_wrap(self):
+        big = array("q", [2**63 - 1] * 5 + [-2**63] * 2)
+        assert array_sum_exact(big) == sum(big)
+
+    @pytest.mark.parametrize("kernel", [array_sum_kahan, array_sum_pairwise])
+    def test_float_sums(self, kernel):
+        values = make_array("d", 100000)
+        assert kernel(values) == pytest.approx(math.fsum(values), rel=1e-12)
+        assert kernel(array("d")) == 0.0
+        assert kernel(array("f", [0.5, 0.25])) == 0.75
+
+    def test_kahan_survives_cancellation(self):
+        values = array("d", [0.1] * 10000 + [1e16, 1.0, -1e16])
+        assert array_sum_kahan(values) == pytest.approx(math.fsum(values), abs=1e-9)
+
+    def test_kahan_is_exact_where_simple_sum_is_not(self):
+        values = array("d", [0.1] * 10)
+        assert array_sum(values) != 1.0
+        assert array_sum_kahan(values) == 1.0
+
+    def test_fill_float(self):
+        out = array("d", [0.0] * 4)
+        assert array_fill_float(out, [1, 2.5, 3]) == 3
+        assert list(out) == [1.0, 2.5, 3.0, 0.0]
+        with pytest.raises(ValueError):
+            array_fill_float(out, [1.0] * 5)
+        with pytest.raises(TypeError):
+            array_fill_float(out, ["1"])
@@ -0,0 +1,53 @@
+# test_module_init.py
+
+import importlib.util
+import threading
+
+import pytest
+
+from pymodule.core.benchmark import scaling_benchmark, subinterpreters_api
+from pymodule.extensions.cmodulea import cmodulea
+from pymodule.extensions.cmoduleb import cmoduleb
+
+class TestModuleInit:
+    def test_multi_phase_modules_import(self):
+        assert cmodulea.fibonacci(10) == 55
+        assert cmoduleb.fibonacci(10) == 55
+        assert type(cmodulea._C_API).__name__ == "PyCapsule"  # pylint: disable=protected-access
+
+    def test_module_can_be_loaded_again_from_its_file(self):
+        # multi-phase init creates a fresh module object per load
+        spec = importlib.util.spec_from_file_location("cmodulea", cmodulea.__file__)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        assert module is not cmodulea
+        assert module.fibonacci(20) == cmodulea.fibonacci(20)
+
+    def test_c_benchmark_releases_the_gil(self):
+        worker = threading.Thread(target=cmodulea.c_benchmark, args=(3000000,))
+        spins = 0
+        worker.start()
+        while worker.is_alive():
+            spins += 1
+        worker.join()
+        assert spins > 10000
+
+class TestScalingBenchmark:
+    def test_threads(self):
+        results = scaling_benchmark(1000, max_workers=3)
+        assert list(results) == [1, 2, 3]
+        assert results[1] == 1.0
+        assert all(speedup > 0.0 for speedup in results.values())
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            scaling_benchmark(1000, mode="fibers")
+
+    @pytest.mark.skipif(subinterpreters_api() is not None, reason="subinterpreters are available")
+    def test_subinterpreters_unavailable(self):
+        with pytest.raises(RuntimeError):
+            scaling_benchmark(1000, mode="subinterpreters")
+
+    @pytest.mark.skipif(subinterpreters_api() is None, reason="subinterpreters are not available")
+    def test_subinterpreters(self):
+        assert list(scaling_benchmark(1000, max_workers=2, mode="subinterpreters")) == [1, 2]
@@ -0,0 +1,159 @@
+# test_scheduler.py
+
+import threading
+import time
+import types
+from array import array
+
+import pytest
+
+from pymodule.core.benchmark import scheduler_benchmark
+from pymodule.extensions.worker import BatchScheduler, TASK_KERNELS, task_fibonacci, task_collatz
+from pymodule.extensions.worker import worker as worker_module
+
+def fibonacci(n):
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a % (1 << 64)
+
+def collatz(n):
+    steps = 0
+    while n > 1:
+        n = n // 2 if n % 2 == 0 else 3 * n + 1
+        steps += 1
+    return steps
+
+class TestTasks:
+    def test_single_jobs(self):
+        assert [task_fibonacci(n) for n in (0, 1, 10, 100)] == [fibonacci(n) for n in (0, 1, 10, 100)]
+        assert [task_collatz(n) for n in (1, 6, 27)] == [0, 8, 111]
+
+    def test_kernels(self):
+        assert TASK_KERNELS == ("fibonacci", "collatz")
+
+class TestBatchScheduler:
+    def test_results_in_order(self):
+        with BatchScheduler("fibonacci", workers=3, chunk_size=7) as scheduler:
+            result = scheduler.submit(range(200)).result()
+        assert isinstance(result, array) and result.typecode == "Q"
+        assert list(result) == [fibonacci(n) for n in range(200)]
+
+    def test_collatz_and_buffer_input(self):
+        items = array("q", range(1, 1001))
+        with BatchScheduler("collatz", workers=2) as scheduler:
+            assert list(scheduler.map(items)) == [collatz(n) for n in items]
+
+    def test_many_batches(self):
+        with BatchScheduler(workers=2, chunk_size=16) as scheduler:
+            futures = [scheduler.submit([n] * 50) for n in range(40)]
+            assert [list(future.result()) for future in futures] == [[fibonacci(n)] * 50 for n in range(40)]
+            assert scheduler.pending == 0
+
+    def test_empty_batch(self):
+        with BatchScheduler(workers=1) as scheduler:
+            assert list(scheduler.map([])) == []
+
+    def test_concurrent_submitters(self):
+        results = {}
+        with BatchScheduler(workers=2, max_pending=100, chunk_size=10) as scheduler:
+            def submit(offset):
+                results[offset] = list(scheduler.map(range(offset, offset + 60)))
+            threads = [threading.Thread(target=submit, args=(offset,)) for offset in range(0, 300, 60)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert results == {offset: [fibonacci(n) for n in range(offset, offset + 60)] for offset in range(0, 300, 60)}
+
+    def test_backpressure_timeout(self):
+        with BatchScheduler(workers=1, max_pending=10, chunk_size=1) as scheduler:
+            busy = scheduler.submit([1 << 26] * 10)     # fills the limit for a while
+            with pytest.raises(TimeoutError):
+                scheduler.submit([1] * 5, timeout=0.01)
+            assert 0 < scheduler.pending <= 10
+            busy.result()
+            assert list(scheduler.submit([1] * 5, timeout=1.0).result()) == [1] * 5
+
+    def test_oversized_batch_accepted_when_idle(self):
+        with BatchScheduler(workers=1, max_pending=10) as scheduler:
+            assert len(scheduler.map(range(100))) == 100
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            BatchScheduler("unknown")
+        with pytest.raises(ValueError):
+            BatchScheduler(max_pending=0)
+        with BatchScheduler(workers=1) as scheduler, pytest.raises(OverflowError):
+            scheduler.map([1 << 70])
+
+    def test_submit_after_shutdown(self):
+        scheduler = BatchScheduler(workers=1)
+        scheduler.shutdown()
+        scheduler.shutdown()
+        with pytest.raises(RuntimeError):
+            scheduler.submit([1])
+
+    def test_shutdown_wakes_blocked_submit(self):
+        scheduler = BatchScheduler(workers=1, max_pending=10, chunk_size=1)
+        busy = scheduler.submit([1 << 26] * 10)         # fills the limit for a while
+        errors = []
+
+        def submit():
+            try:
+                scheduler.submit([1] * 5, timeout=30)
+            except RuntimeError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=submit)
+        thread.start()
+        thread.join(0.1)                                # let it block on the full scheduler
+        scheduler.shutdown(wait=False)
+        thread.join(5)
+        assert not thread.is_alive() and len(errors) == 1
+        busy.result()
+        scheduler.shutdown()
+
+    def test_shutdown_during_submits(self, monkeypatch):
+        class SlowCondition(threading.Condition):
+            def __exit__(self, *args):
+                result = super().__exit__(*args)
+                if threading.current_thread().name == "submitter":
+                    time.sleep(0.001)       # lets shutdown run right after submit released the lock
+                return result
+
+        # only the scheduler gets the slow condition
+        monkeypatch.setattr(worker_module, "threading", types.SimpleNamespace(Condition=SlowCondition, Thread=threading.Thread))
+        for _ in range(10):
+            scheduler = BatchScheduler(workers=2, chunk_size=10)
+            futures = []
+            started = threading.Event()
+
+            def submit():
+                try:
+                    while True:
+                        futures.append(scheduler.submit(range(100)))
+                        started.set()
+                except RuntimeError:
+                    pass
+
+            thread = threading.Thread(target=submit, name="submitter")
+            thread.start()
+            started.wait(5)
+            scheduler.shutdown(wait=False)
+            thread.join(5)
+            assert not thread.is_alive()
+            for future in futures:
+                assert len(future.result(timeout=5)) == 100
+
+    def test_fibonacci_argument_range(self):
+        with BatchScheduler(workers=1) as scheduler, pytest.raises(OverflowError):
+            scheduler.map([1, 1 << 31])
+        with pytest.raises(OverflowError):
+            task_fibonacci(1 << 31)
+        assert task_fibonacci(-5) == 0
+
+    def test_benchmark(self):
+        results = scheduler_benchmark(2000, workers=2)
+        assert set(results) == {"ThreadPoolExecutor", "BatchScheduler 1000/batch", "BatchScheduler 1 batch"}
+        assert all(rate > 0 for rate in results.values())
@@ -0,0 +1,122 @@
+# test_build.py
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+# build.py sits in the project root, outside the package
+_spec = importlib.util.spec_from_file_location("build", Path(__file__).resolve().parents[1] / "build.py")
+build = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(build)
+
+def write(path, text=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+class TestFindExtensionSources:
+    def test_skips_generated_c(self, tmp_path):
+        pyx = write(tmp_path / "ext" / "ext.pyx")
+        write(tmp_path / "ext" / "ext.c")                   # Cython output of ext.pyx
+        helper = write(tmp_path / "ext" / "helper.c")
+        nested = write(tmp_path / "ext" / "sub" / "nested.c")
+        write(tmp_path / "ext" / "notes.h")
+        assert build.find_extension_sources(tmp_path / "ext") == [pyx, helper, nested]
+
+    def test_empty_directory(self, tmp_path):
+        assert build.find_extension_sources(tmp_path) == []
+
+class TestScanDependencies:
+    def test_c_includes(self, tmp_path):
+        source = write(tmp_path / "ext" / "ext.c", '#include <stdio.h>\n#include "local.h"\n  #  include "shared.h"\n')
+        local = write(tmp_path / "ext" / "local.h", '#include "nested.h"\n')
+        shared = write(tmp_path / "include" / "shared.h")
+        nested = write(tmp_path / "include" / "nested.h")
+        write(tmp_path / "include" / "unused.h")
+        found = build.scan_dependencies([source], [tmp_path / "include"], [])
+        assert found == {local, shared, nested}
+
+    def test_cython_includes_and_cimports(self, tmp_path):
+        root = tmp_path / "src"
+        pyx = write(root / "pkg" / "ext" / "ext.pyx",
+                    'from libc.stdint cimport int64_t\n'
+                    'from pkg.kernels cimport kernel\n'
+                    'cimport api\n'
+                    'include "inline.pxi"\n'
+                    'cdef extern from "capi.h":\n    pass\n')
+        own = write(root / "pkg" / "ext" / "ext.pxd")
+        kernels = write(root / "pkg" / "kernels.pxd", 'cdef extern from "kernels.h":\n    pass\n')
+        api = write(tmp_path / "include" / "api.pxd")
+        inline = write(root / "pkg" / "ext" / "inline.pxi")
+        capi = write(tmp_path / "include" / "capi.h")
+        kernels_h = write(root / "pkg" / "kernels.h")
+        found = build.scan_dependencies([pyx], [tmp_path / "include"], [root])
+        assert found == {own, kernels, api, inline, capi, kernels_h}
+
+    def test_sources_and_cycles(self, tmp_path):
+        first = write(tmp_path / "first.c", '#include "a.h"\n#include "second.c"\n')
+        second = write(tmp_path / "second.c", '#include "a.h"\n')
+        header = write(tmp_path / "a.h", '#include "a.h"\n')
+        assert build.scan_dependencies([first, second], [], []) == {header}
+
+class TestRebuildReason:
+    @pytest.fixture
+    def output(self, tmp_path):
+        return write(tmp_path / "ext.so", "built")
+
+    def entry(self, files, settings="s1"):
+        return {"settings": settings, "files": files}
+
+    def test_up_to_date(self, output):
+        assert build.rebuild_reason(self.entry({"a.c": "1"}), {"a.c": "1"}, "s1", output) is None
+
+    def test_not_built_before(self, output):
+        assert build.rebuild_reason(None, {"a.c": "1"}, "s1", output) == "not built before"
+
+    def test_missing_output(self, tmp_path):
+        assert build.rebuild_reason(self.entry({"a.c": "1"}), {"a.c": "1"}, "s1", tmp_path / "ext.so") == \
+            "build output is missing"
+
+    def test_settings_changed(self, output):
+        assert build.rebuild_reason(self.entry({"a.c": "1"}), {"a.c": "1"}, "s2", output) == "build settings changed"
+
+    def test_file_changes(self, output):
+        entry = self.entry({"a.c": "1", "b.h": "2", "old.h": "3"})
+        files = {"a.c": "1", "b.h": "changed", "new.h": "4"}
+        assert build.rebuild_reason(entry, files, "s1", output) == "changed b.h; new new.h; removed old.h"
+
+    def test_cache_round_trip(self, tmp_path, output):
+        files = {path.as_posix(): build.hash_file(path) for path in (output,)}
+        build.save_build_cache({"ext": self.entry(files)}, tmp_path / "build")
+        entry = build.load_build_cache(tmp_path / "build")["ext"]
+        assert build.rebuild_reason(entry, files, "s1", output) is None
+        output.write_text("rebuilt", encoding="utf-8")
+        files = {path.as_posix(): build.hash_file(path) for path in (output,)}
+        assert build.rebuild_reason(entry, files, "s1", output).startswith("changed ")
+
+    def test_unreadable_cache(self, tmp_path):
+        write(tmp_path / build.BUILD_CACHE, "{not json")
+        assert build.load_build_cache(tmp_path) == {}
+        assert build.load_build_cache(tmp_path / "missing") == {}
+
+class TestParseProfile:
+    @pytest.mark.parametrize("profile, components", [
+        ("portable", ["portable"]),
+        ("native+lto+pgo", ["native", "lto", "pgo"]),
+        (" native + lto ", ["native", "lto"]),
+    ])
+    def test_valid(self, profile, components):
+        assert build.parse_profile(profile) == components
+
+    @pytest.mark.parametrize("profile", ["", "+", "fast", "native+fast"])
+    def test_invalid(self, profile):
+        with pytest.raises(ValueError, match="Unknown build profile"):
+            build.parse_profile(profile)
+
+    def test_build_jobs(self, monkeypatch):
+        monkeypatch.setenv("BUILD_JOBS", "3")
+        assert build.build_jobs({"build_jobs": 5}) == 3
+        monkeypatch.delenv("BUILD_JOBS")
+        assert build.build_jobs({"build_jobs": 5}) == 5
+        assert build.build_jobs({}) >= 1
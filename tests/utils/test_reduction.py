@@ -0,0 +1,76 @@
+# test_reduction.py
+
+import math
+import random
+from array import array
+from decimal import Decimal
+
+import pytest
+
+from pymodule.utils import sum_values
+from pymodule.utils.reduction import SIMPLE, KAHAN, PAIRWISE
+
+def random_floats(size, seed=0):
+    rng = random.Random(seed)
+    return [rng.uniform(-1.0, 1.0) * 10.0 ** rng.randint(-8, 8) for _ in range(size)]
+
+class TestSumValuesBuffers:
+    @pytest.mark.parametrize("typecode", ["b", "B", "h", "H", "i", "I", "l", "L", "q", "Q"])
+    def test_integer_buffers_are_exact(self, typecode):
+        info = array(typecode)
+        limit = 2 ** (8 * info.itemsize - (0 if typecode.isupper() else 1)) - 1
+        values = array(typecode, [limit] * 1000)
+        assert sum_values(values) == sum(values)
+
+    @pytest.mark.parametrize("method", [SIMPLE, KAHAN, PAIRWISE])
+    def test_float_buffers(self, method):
+        values = random_floats(10000)
+        assert sum_values(array("d", values), method) == pytest.approx(math.fsum(values), rel=1e-9)
+
+    def test_kahan_buffer_is_exact(self):
+        assert sum_values(array("d", [0.1] * 10), KAHAN) == 1.0
+
+    def test_multi_dimensional_and_strided_buffers(self):
+        grid = memoryview(array("i", range(12)).tobytes()).cast("i", (3, 4))
+        assert sum_values(grid) == 66
+        assert sum_values(memoryview(array("d", range(10)))[::2]) == 20.0
+
+    def test_bytes_and_empty_buffers(self):
+        assert sum_values(bytes([1, 2, 3])) == 6
+        assert sum_values(array("d")) == 0.0
+        assert sum_values(array("q")) == 0
+
+class TestSumValuesIterables:
+    def test_iterator_of_ints_is_exact(self):
+        assert sum_values(iter(range(100000)), chunk_size=4096) == sum(range(100000))
+        assert sum_values(iter([2**100, 1])) == 2**100 + 1
+
+    @pytest.mark.parametrize("method", [KAHAN, PAIRWISE])
+    def test_iterator_of_floats(self, method):
+        values = random_floats(50000)
+        assert sum_values(iter(values), method, chunk_size=4096) == pytest.approx(math.fsum(values), rel=1e-12)
+
+    def test_simple_method_matches_builtin_sum(self):
+        values = random_floats(10000)
+        assert sum_values(iter(values), SIMPLE, chunk_size=1000) == pytest.approx(sum(values), rel=1e-12)
+
+    def test_list_and_mixed_values(self):
+        assert sum_values([0.1] * 10, KAHAN) == 1.0
+        assert sum_values([1, 2.5, 3]) == 6.5
+        assert sum_values(iter([1, 2, 0.5] * 10), chunk_size=7) == 35.0
+
+    def test_other_numbers_use_builtin_sum(self):
+        assert sum_values([Decimal("0.1")] * 3) == Decimal("0.3")
+        assert sum_values(iter([0.5, Decimal("0.1")]), chunk_size=1) == pytest.approx(0.6)
+
+class TestSumValuesErrors:
+    @pytest.mark.parametrize("values", ["abc", 5, None])
+    def test_not_summable(self, values):
+        with pytest.raises(TypeError):
+            sum_values(values)
+
+    def test_bad_arguments(self):
+        with pytest.raises(ValueError):
+            sum_values([1.0], method="fast")
+        with pytest.raises(ValueError):
+            sum_values([1.0], chunk_size=0)